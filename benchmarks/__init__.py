@@ -0,0 +1,10 @@
+"""
+성능 벤치마크 (오프라인 실행)
+
+- micro: Agent 핫패스(쿼리 정규화, 캐시, 랭킹, 상품 가격 파싱) 마이크로 벤치마크
+- load: 가짜 쇼핑몰/LLM 백엔드로 FastAPI 앱을 프로세스 안에서 구동하는 부하 생성기
+- imports: API/Agent/프론트엔드 엔트리 포인트의 임포트 시간과 가장 느린 패키지
+- replay/compare: 기록된 실제 트래픽 재생과 두 코드 버전의 지연 시간 분포 비교
+
+결과는 JSON 기준값(benchmarks/baselines)과 비교해 허용 범위를 넘게 느려지면 실패합니다.
+"""
@@ -0,0 +1,141 @@
+"""
+벤치마크 실행기
+
+    python -m benchmarks micro
+    python -m benchmarks load --concurrency 32 --requests 2000
+    python -m benchmarks imports
+    python -m benchmarks replay traffic.jsonl --speed 10 --output run-new.json
+    python -m benchmarks compare run-old.json run-new.json
+    python -m benchmarks micro --update-baseline
+
+기준값 파일이 있으면 결과를 비교하고, 허용 범위(--tolerance)를 넘는 회귀가 있으면
+종료 코드 1로 끝납니다. 기준값은 측정하는 머신에서 --update-baseline으로 갱신합니다.
+"""
+import argparse
+import asyncio
+import json
+import sys
+from dataclasses import fields
+
+from benchmarks.imports import run_imports
+from benchmarks.load import LoadConfig, run_load
+from benchmarks.micro import run_micro
+from benchmarks.replay import (
+    ReplayConfig, diff_runs, format_diff, load_log, load_run, run_replay, save_run
+)
+from benchmarks.stats import baseline_path, compare, format_table, load_baseline, save_baseline
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="PriceFinder 성능 벤치마크")
+    subparsers = parser.add_subparsers(dest="suite", required=True)
+
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--baseline", help="기준값 JSON 경로 (기본: benchmarks/baselines/<suite>.json)")
+    common.add_argument("--update-baseline", action="store_true", help="결과를 기준값으로 저장")
+    common.add_argument("--tolerance", type=float, default=0.3, help="허용 회귀 비율 (기본 0.3 = 30%%)")
+    common.add_argument("--output", help="결과 JSON 저장 경로")
+
+    micro = subparsers.add_parser("micro", parents=[common], help="Agent 핫패스 마이크로 벤치마크")
+    micro.add_argument("--repeat", type=int, default=30)
+    micro.add_argument("--only", default="", help="이름에 이 문자열이 포함된 벤치마크만 실행")
+
+    imports = subparsers.add_parser("imports", parents=[common], help="엔트리 포인트 임포트 시간 예산 확인")
+    imports.add_argument("--repeat", type=int, default=3, help="측정 반복 횟수 (최솟값 사용)")
+    imports.add_argument("--top", type=int, default=10, help="엔트리별로 보고할 느린 패키지 수")
+
+    load = subparsers.add_parser("load", parents=[common], help="프로세스 내 API 부하 테스트")
+    for field in fields(LoadConfig):
+        load.add_argument(f"--{field.name.replace('_', '-')}", type=type(field.default), default=field.default)
+
+    replay = subparsers.add_parser("replay", help="기록된 트래픽을 가짜 백엔드로 재생")
+    replay.add_argument("logs", nargs="+", help="TrafficRecorder 로그 (워커별 파일 여러 개 가능)")
+    for field in fields(ReplayConfig):
+        replay.add_argument(f"--{field.name.replace('_', '-')}", type=type(field.default), default=field.default)
+    replay.add_argument("--output", help="재생 결과 JSON 저장 경로 (compare 입력)")
+
+    compare_runs = subparsers.add_parser("compare", help="두 재생 결과의 지연 시간 분포 비교")
+    compare_runs.add_argument("base", help="기준 코드 버전의 재생 결과")
+    compare_runs.add_argument("new", help="비교할 코드 버전의 재생 결과")
+    compare_runs.add_argument("--tolerance", type=float, default=0.3, help="허용 회귀 비율 (기본 0.3 = 30%%)")
+    return parser.parse_args(argv)
+
+
+def replay_main(args: argparse.Namespace) -> int:
+    replay_config = ReplayConfig(**{field.name: getattr(args, field.name) for field in fields(ReplayConfig)})
+    records = load_log(args.logs)
+    results, samples = asyncio.run(run_replay(records, replay_config))
+    print(format_table(results))
+    if args.output:
+        save_run(args.output, dict(replay_config.to_dict(), logs=args.logs), results, samples)
+        print(f"\n재생 결과 저장: {args.output}")
+    return 0
+
+
+def compare_main(args: argparse.Namespace) -> int:
+    base, new = load_run(args.base), load_run(args.new)
+    if base["config"] != new["config"]:
+        print(f"경고: 재생 설정이 다릅니다.\n  기준: {base['config']}\n  비교: {new['config']}\n")
+    print(format_diff(diff_runs(base, new)))
+
+    regressions = compare(new["results"], base["results"], args.tolerance)
+    if regressions:
+        print(f"\n성능 회귀 ({args.tolerance:.0%} 초과):")
+        for line in regressions:
+            print(f"  {line}")
+        return 1
+    print(f"\n회귀 없음 (허용 범위 {args.tolerance:.0%})")
+    return 0
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    if args.suite == "replay":
+        return replay_main(args)
+    if args.suite == "compare":
+        return compare_main(args)
+    if args.suite == "micro":
+        config = {"repeat": args.repeat, "only": args.only}
+        results = run_micro(args.repeat, args.only)
+    elif args.suite == "imports":
+        config = {"repeat": args.repeat}
+        results, slowest = run_imports(args.repeat, args.top)
+        for entry, packages in slowest.items():
+            print(f"[{entry}] 가장 느린 패키지: " + ", ".join(f"{name} {ms}ms" for name, ms in packages))
+        print()
+    else:
+        load_config = LoadConfig(**{field.name: getattr(args, field.name) for field in fields(LoadConfig)})
+        config = load_config.to_dict()
+        results = asyncio.run(run_load(load_config))
+
+    print(format_table(results))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"config": config, "results": results}, f, ensure_ascii=False, indent=2)
+
+    path = args.baseline or baseline_path(args.suite)
+    if args.update_baseline:
+        save_baseline(path, config, results)
+        print(f"\n기준값 저장: {path}")
+        return 0
+
+    baseline = load_baseline(path)
+    if baseline is None:
+        print(f"\n기준값이 없습니다: {path} (--update-baseline으로 생성)")
+        return 0
+    if baseline["config"] != config:
+        print(f"\n설정이 기준값과 달라 비교하지 않습니다: {baseline['config']}")
+        return 0
+
+    regressions = compare(results, baseline["results"], args.tolerance)
+    if regressions:
+        print(f"\n성능 회귀 ({args.tolerance:.0%} 초과):")
+        for line in regressions:
+            print(f"  {line}")
+        return 1
+    print(f"\n기준값 대비 회귀 없음 (허용 범위 {args.tolerance:.0%})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,88 @@
+"""
+벤치마크용 가짜 쇼핑몰/LLM 백엔드
+
+네트워크 없이 지연 시간만 흉내 내며, 같은 시드와 쿼리에는 항상 같은 상품을 돌려줍니다.
+"""
+import asyncio
+import random
+import zlib
+from typing import Any, Dict, List
+
+from src.agent.query_normalizer import NormalizedQuery
+
+STORE_NAMES = ("coupang", "11st", "gmarket", "ssg")
+
+BASE_QUERIES = (
+    "아이폰 15 최저가",
+    "갤럭시 S24 울트라",
+    "게이밍 노트북 추천",
+    "무선 이어폰 비교",
+    "애플워치 할인",
+    "맥북 에어 M3",
+    "다이슨 청소기",
+    "닌텐도 스위치",
+    "LG 그램 16",
+    "에어팟 프로 2세대",
+    "로봇청소기 가성비",
+    "4K 모니터 27인치",
+)
+
+_VARIANTS = ("", "자급제", "128GB", "256GB", "정품", "해외구매", "리퍼", "케이스 포함", "블랙", "화이트")
+
+
+def make_offers(query_text: str, store: str, count: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """쿼리에 대한 결정적 가짜 상품 목록 (중복 상품과 다른 모델이 섞여 있음)"""
+    rng = random.Random(zlib.crc32(f"{seed}:{store}:{query_text}".encode()))
+    base_price = rng.randint(50, 2000) * 1000
+    offers = []
+    for i in range(count):
+        variant = rng.choice(_VARIANTS)
+        # 일부는 다른 모델(쿼리 토큰 일부만 포함)로 만들어 랭킹 경로를 모두 거치게 함
+        tokens = query_text.split()
+        if tokens and rng.random() < 0.2:
+            tokens = tokens[:1] + ["미니"]
+        offers.append({
+            "id": f"{store}-{i}",
+            "name": " ".join(tokens + [variant]).strip(),
+            "price": int(base_price * rng.uniform(0.8, 1.3)) // 10 * 10,
+            "store": store,
+            "url": f"https://{store}.example.com/p/{i}",
+            "image_url": f"https://{store}.example.com/img/{i}.jpg",
+            "rating": round(rng.uniform(3.0, 5.0), 1),
+        })
+    return offers
+
+
+class FakeStore:
+    """지연 시간을 흉내 내는 쇼핑몰 백엔드"""
+
+    def __init__(self, name: str, latency: float = 0.02, jitter: float = 0.5, products: int = 30, seed: int = 0):
+        self.name = name
+        self.latency = latency
+        self.jitter = jitter
+        self.products = products
+        self.seed = seed
+        self._rng = random.Random(seed)
+
+    async def search(self, query: NormalizedQuery) -> List[Dict[str, Any]]:
+        if self.latency > 0:
+            await asyncio.sleep(self.latency * self._rng.lognormvariate(0, self.jitter))
+        return make_offers(query.text, self.name, self.products, self.seed)
+
+
+class FakeLLM:
+    """지연 시간을 흉내 내는 LLM 백엔드"""
+
+    def __init__(self, latency: float = 0.05, jitter: float = 0.3, seed: int = 0):
+        self.latency = latency
+        self.jitter = jitter
+        self._rng = random.Random(seed)
+
+    async def generate(self, message: str, history: List[Dict[str, str]]) -> str:
+        if self.latency > 0:
+            await asyncio.sleep(self.latency * self._rng.lognormvariate(0, self.jitter))
+        return f"'{message}' 관련 상품을 찾아볼게요. (이전 대화 {len(history)}개)"
+
+
+def make_stores(latency: float = 0.02, products: int = 30, seed: int = 0) -> List[FakeStore]:
+    return [FakeStore(name, latency, products=products, seed=seed + i) for i, name in enumerate(STORE_NAMES)]
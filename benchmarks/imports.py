@@ -0,0 +1,76 @@
+"""
+엔트리 포인트 임포트 시간 측정
+
+각 엔트리 포인트를 새 인터프리터에서 `python -X importtime`으로 임포트해 전체 시간과
+최상위 패키지별 시간(자기 시간 합계)을 구합니다. 워커 기동과 오토스케일링 반응
+시간은 대부분 이 임포트 시간에 좌우됩니다.
+"""
+import os
+import subprocess
+import sys
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+ENTRY_POINTS = {
+    "api": "src.api.main",
+    "agent": "src.agent.core",
+    "frontend": "frontend.app",
+}
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def parse_importtime(stderr: str, module: str) -> List[Tuple[str, int, int]]:
+    """-X importtime 출력에서 module 임포트 트리만 (모듈, 자기 시간 us, 누적 시간 us) 목록으로 변환
+
+    출력은 후위 순회 순서이므로 module 줄 바로 앞의 들여쓰기된 줄들이 그 하위 임포트입니다.
+    인터프리터 시작 시(site 등) 임포트된 모듈은 제외됩니다.
+    """
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, raw_name = line[len("import time:"):].split("|")
+        name = raw_name.strip()
+        if raw_name.startswith("  "):
+            modules.append((name, int(self_us), int(cumulative_us)))
+        elif name == module:
+            modules.append((name, int(self_us), int(cumulative_us)))
+            return modules
+        else:
+            modules = []
+    raise ValueError(f"임포트 기록에서 {module}을(를) 찾을 수 없습니다.")
+
+
+def measure_entry(module: str) -> List[Tuple[str, int, int]]:
+    env = dict(os.environ, PYTHONPATH=PROJECT_ROOT)
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=PROJECT_ROOT, env=env, capture_output=True, text=True, check=True,
+    )
+    return parse_importtime(completed.stderr, module)
+
+
+def slowest_packages(modules: List[Tuple[str, int, int]], top: int) -> List[Tuple[str, float]]:
+    """최상위 패키지별 자기 시간 합계(ms) 상위 top개"""
+    totals: Dict[str, int] = defaultdict(int)
+    for name, self_us, _ in modules:
+        totals[name.split(".")[0]] += self_us
+    ranked = sorted(totals.items(), key=lambda item: item[1], reverse=True)[:top]
+    return [(package, round(us / 1000, 1)) for package, us in ranked]
+
+
+def run_imports(repeat: int = 3, top: int = 10) -> Tuple[Dict[str, Dict[str, float]], Dict[str, list]]:
+    """엔트리 포인트별 임포트 시간(반복 중 최솟값)과 가장 느린 패키지 목록"""
+    results = {}
+    slowest = {}
+    for entry, module in ENTRY_POINTS.items():
+        best = None
+        for _ in range(repeat):
+            modules = measure_entry(module)
+            total = modules[-1][2]
+            if best is None or total < best[0]:
+                best = (total, modules)
+        results[entry] = {"import_ms": round(best[0] / 1000, 1)}
+        slowest[entry] = slowest_packages(best[1], top)
+    return results, slowest
@@ -0,0 +1,119 @@
+"""
+프로세스 내 부하 생성기
+
+가짜 쇼핑몰/LLM 백엔드를 연결한 FastAPI 앱을 httpx ASGITransport로 직접 호출합니다.
+네트워크·서버 프로세스 없이 라우팅, 미들웨어, Agent 파이프라인 전체를 거칩니다.
+"""
+import asyncio
+import random
+import time
+import uuid
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from dataclasses import asdict, dataclass
+from typing import Any, AsyncIterator, Dict, List, Tuple
+
+import httpx
+
+from benchmarks.fakes import BASE_QUERIES, FakeLLM, make_stores
+from benchmarks.stats import summarize
+from src.api import main
+
+
+@dataclass
+class LoadConfig:
+    """부하 시나리오 설정"""
+    concurrency: int = 16
+    requests: int = 1000
+    store_latency: float = 0.02
+    llm_latency: float = 0.05
+    products: int = 30
+    # 캐시에 없는(처음 보는) 검색 쿼리 비율
+    unique_ratio: float = 0.3
+    # 요청 종류별 비중
+    search_weight: int = 6
+    chat_weight: int = 3
+    history_weight: int = 1
+    seed: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def build_plan(config: LoadConfig) -> List[Tuple[str, str, Dict[str, Any]]]:
+    """(종류, 경로, 요청 인자) 목록을 시드에 따라 결정적으로 생성"""
+    rng = random.Random(config.seed)
+    sessions = [uuid.UUID(int=rng.getrandbits(128)).hex for _ in range(max(1, config.concurrency * 4))]
+    kinds = ["search"] * config.search_weight + ["chat"] * config.chat_weight + ["history"] * config.history_weight
+    plan = []
+    for i in range(config.requests):
+        kind = rng.choice(kinds)
+        query = rng.choice(BASE_QUERIES)
+        if rng.random() < config.unique_ratio:
+            query = f"{query} {i}"
+        session_id = rng.choice(sessions)
+        if kind == "search":
+            plan.append((kind, "/search", {"method": "GET", "params": {"query": query}}))
+        elif kind == "chat":
+            plan.append((kind, "/chat", {"method": "POST", "json": {"message": query, "session_id": session_id}}))
+        else:
+            plan.append((kind, f"/chat/history/{session_id}", {"method": "GET"}))
+    return plan
+
+
+@asynccontextmanager
+async def fake_app_client(
+    store_latency: float, llm_latency: float, products: int, seed: int
+) -> AsyncIterator[httpx.AsyncClient]:
+    """가짜 백엔드를 연결하고 lifespan을 실행한 앱의 httpx 클라이언트 (종료 시 원래 백엔드 복원)"""
+    agent = main.agent
+    original = (agent.stores, agent.llm)
+    agent.stores = make_stores(store_latency, products, seed)
+    agent.llm = FakeLLM(llm_latency, seed=seed)
+    agent.search_cache.clear()
+    try:
+        async with main.app.router.lifespan_context(main.app):
+            transport = httpx.ASGITransport(app=main.app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+                yield client
+    finally:
+        agent.stores, agent.llm = original
+        agent.search_cache.clear()
+
+
+async def run_load(config: LoadConfig) -> Dict[str, Dict[str, float]]:
+    """부하 실행 후 요청 종류별(및 전체) 지연 시간 통계 반환"""
+    plan = build_plan(config)
+    latencies: Dict[str, List[float]] = defaultdict(list)
+    errors: Dict[str, int] = defaultdict(int)
+    queue: "asyncio.Queue[Tuple[str, str, Dict[str, Any]]]" = asyncio.Queue()
+    for item in plan:
+        queue.put_nowait(item)
+
+    async def worker(client: httpx.AsyncClient) -> None:
+        while not queue.empty():
+            kind, path, kwargs = queue.get_nowait()
+            start = time.perf_counter()
+            try:
+                response = await client.request(url=path, **kwargs)
+                ok = response.status_code < 400
+            except Exception:
+                ok = False
+            latencies[kind].append(time.perf_counter() - start)
+            if not ok:
+                errors[kind] += 1
+
+    async with fake_app_client(config.store_latency, config.llm_latency, config.products, config.seed) as client:
+        start = time.perf_counter()
+        await asyncio.gather(*(worker(client) for _ in range(config.concurrency)))
+        elapsed = time.perf_counter() - start
+
+    latencies["all"] = [value for samples in latencies.values() for value in samples]
+    results = {}
+    for kind, samples in sorted(latencies.items()):
+        stats = summarize(samples, "ms", 1e3)
+        stats["requests"] = len(samples)
+        stats["errors"] = errors[kind] if kind != "all" else sum(errors.values())
+        stats["throughput_rps"] = round(len(samples) / elapsed, 1)
+        results[kind] = stats
+    return results
@@ -0,0 +1,122 @@
+"""
+Agent 핫패스 마이크로 벤치마크
+"""
+import time
+from typing import Callable, Dict, List
+
+from benchmarks.fakes import BASE_QUERIES, STORE_NAMES, make_offers
+from benchmarks.stats import summarize
+from frontend.components.product_card import parse_price
+from src.agent.cache import TTLCache
+from src.agent.pipeline import dedup_and_rank
+from src.agent.query_normalizer import normalize_query
+
+# 한 번 반복(repeat)에 최소 이 시간만큼 호출하도록 호출 횟수를 조정
+MIN_REPEAT_SECONDS = 0.005
+
+
+def _normalize_uncached() -> Callable[[], object]:
+    queries = [f"{query} {i}" for i in range(50) for query in BASE_QUERIES]
+    state = {"i": 0}
+    uncached = normalize_query.__wrapped__
+
+    def run():
+        state["i"] = (state["i"] + 1) % len(queries)
+        return uncached(queries[state["i"]])
+    return run
+
+
+def _normalize_cached() -> Callable[[], object]:
+    for query in BASE_QUERIES:
+        normalize_query(query)
+    state = {"i": 0}
+
+    def run():
+        state["i"] = (state["i"] + 1) % len(BASE_QUERIES)
+        return normalize_query(BASE_QUERIES[state["i"]])
+    return run
+
+
+def _cache_get_hit() -> Callable[[], object]:
+    cache = TTLCache(maxsize=1024, ttl=60.0)
+    for i in range(1024):
+        cache.set(i, i)
+    state = {"i": 0}
+
+    def run():
+        state["i"] = (state["i"] + 1) % 1024
+        return cache.get(state["i"])
+    return run
+
+
+def _cache_set_evict() -> Callable[[], object]:
+    cache = TTLCache(maxsize=1024, ttl=60.0)
+    state = {"i": 0}
+
+    def run():
+        # 최대 크기의 4배 키를 순환하므로 대부분 LRU 제거가 일어남
+        state["i"] = (state["i"] + 1) % 4096
+        cache.set(state["i"], state["i"])
+    return run
+
+
+def _rank(query: str, per_store: int) -> Callable[[], object]:
+    normalized = normalize_query(query)
+    offers = [offer for store in STORE_NAMES for offer in make_offers(normalized.text, store, per_store)]
+    return lambda: dedup_and_rank(offers, normalized.text, normalized.intents, 50)
+
+
+def _parse_prices() -> Callable[[], object]:
+    # ProductCard가 받는 가격 표기 형태 혼합
+    prices = []
+    for offer in make_offers("아이폰 15", "coupang", 100):
+        price = offer["price"]
+        prices.extend([price, f"{price:,}원", str(price), None, "가격 문의"])
+
+    def run():
+        return sorted((parse_price(price) or 0 for price in prices))
+    return run
+
+
+BENCHMARKS: Dict[str, Callable[[], Callable[[], object]]] = {
+    "normalize_query.uncached": _normalize_uncached,
+    "normalize_query.cached": _normalize_cached,
+    "ttl_cache.get_hit": _cache_get_hit,
+    "ttl_cache.set_evict": _cache_set_evict,
+    "dedup_and_rank.120_offers": lambda: _rank("아이폰 15 128GB", 30),
+    "dedup_and_rank.1200_offers_cheapest": lambda: _rank("아이폰 15 최저가", 300),
+    "product_card.parse_prices_500": _parse_prices,
+}
+
+
+def measure(fn: Callable[[], object], repeat: int) -> List[float]:
+    """호출 1회당 시간(초) 샘플 repeat개"""
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        if time.perf_counter() - start >= MIN_REPEAT_SECONDS:
+            break
+        number *= 2
+
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        samples.append((time.perf_counter() - start) / number)
+    return samples
+
+
+def run_micro(repeat: int = 30, only: str = "") -> Dict[str, Dict[str, float]]:
+    """마이크로 벤치마크 실행 (only: 이름에 포함된 문자열로 필터)"""
+    results = {}
+    for name, setup in BENCHMARKS.items():
+        if only and only not in name:
+            continue
+        samples = measure(setup(), repeat)
+        stats = summarize(samples, "us", 1e6)
+        stats["ops_per_sec"] = round(1 / sorted(samples)[len(samples) // 2], 1)
+        results[name] = stats
+    return results
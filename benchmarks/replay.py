@@ -0,0 +1,182 @@
+"""
+기록된 트래픽 재생 및 실행 결과 비교
+
+TrafficRecorder 로그(src/telemetry/recording.py)를 가짜 쇼핑몰/LLM 백엔드를 연결한 앱에
+프로세스 안에서 재생합니다. 요청은 원래 도착 간격을 speed 배로 압축한 시각에 완료를
+기다리지 않고(open-loop) 보내므로, 실제 트래픽의 쿼리 구성과 도착 분포가 유지됩니다.
+
+두 코드 버전에서 같은 로그를 재생해 저장한 결과를 compare로 비교합니다.
+"""
+import asyncio
+import json
+import time
+from collections import defaultdict
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from benchmarks.load import fake_app_client
+from benchmarks.stats import summarize
+
+Request = Tuple[str, str, Dict[str, Any]]
+
+
+@dataclass
+class ReplayConfig:
+    """재생 설정"""
+    speed: float = 1.0
+    store_latency: float = 0.02
+    llm_latency: float = 0.05
+    products: int = 30
+    seed: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def load_log(paths: Sequence[str]) -> List[Dict[str, Any]]:
+    """기록 로그(여러 워커 파일 가능)를 읽어 도착 시각순으로 병합 (t는 가장 이른 요청 기준 초)"""
+    records = []
+    for path in paths:
+        start = 0.0
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                if "v" in record:
+                    # 헤더 (같은 파일에 여러 번 기록을 시작했으면 여러 개일 수 있음)
+                    start = record["start"]
+                    continue
+                records.append(dict(record, t=start + record["t"]))
+    records.sort(key=lambda record: record["t"])
+    if records:
+        first = records[0]["t"]
+        for record in records:
+            record["t"] -= first
+    return records
+
+
+def build_request(record: Dict[str, Any]) -> Optional[Request]:
+    """기록 한 줄을 재생할 요청으로 변환 (재현할 수 없는 요청은 None)"""
+    method, route = record["m"], record["r"]
+    session_id = f"replay-{record['s']}" if record.get("s") else "replay-anonymous"
+    query = record.get("q")
+
+    path = route.replace("{session_id}", session_id)
+    if route == "unmatched" or "{" in path:
+        return None
+    if method == "GET":
+        return method, path, {"params": {"query": query}} if query else {}
+    if method == "POST" and route == "/chat":
+        return method, path, {"json": {"message": query or "안녕하세요", "session_id": session_id}}
+    if method == "POST" and route == "/search/jobs":
+        return method, path, {"json": {"query": query or "", "session_id": session_id}}
+    return None
+
+
+async def run_replay(
+    records: List[Dict[str, Any]], config: ReplayConfig
+) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, List[float]]]:
+    """로그 재생 후 (라우트별 지연 시간 통계, 라우트별 지연 시간 샘플(ms)) 반환"""
+    latencies: Dict[str, List[float]] = defaultdict(list)
+    errors: Dict[str, int] = defaultdict(int)
+    launch_lag: List[float] = []
+    skipped = 0
+
+    async def fire(client, name: str, request: Request) -> None:
+        method, path, kwargs = request
+        start = time.perf_counter()
+        try:
+            response = await client.request(method, path, **kwargs)
+            ok = response.status_code < 400
+        except Exception:
+            ok = False
+        latencies[name].append((time.perf_counter() - start) * 1000)
+        if not ok:
+            errors[name] += 1
+
+    async with fake_app_client(config.store_latency, config.llm_latency, config.products, config.seed) as client:
+        tasks = []
+        start = time.perf_counter()
+        for record in records:
+            request = build_request(record)
+            if request is None:
+                skipped += 1
+                continue
+            delay = record["t"] / config.speed - (time.perf_counter() - start)
+            if delay > 0:
+                await asyncio.sleep(delay)
+            launch_lag.append(max(0.0, -delay))
+            name = f"{record['m']} {record['r']}"
+            tasks.append(asyncio.create_task(fire(client, name, request)))
+        await asyncio.gather(*tasks)
+
+    latencies["all"] = [value for samples in latencies.values() for value in samples]
+    results = {}
+    for name, samples in sorted(latencies.items()):
+        stats = summarize(samples, "ms", 1.0)
+        stats["requests"] = len(samples)
+        stats["errors"] = errors[name] if name != "all" else sum(errors.values())
+        results[name] = stats
+    results["all"]["skipped"] = skipped
+    # 스케줄러가 예정 시각보다 늦게 보낸 정도 (크면 speed를 낮춰야 도착 분포가 유지됨)
+    results["all"]["max_launch_lag_ms"] = round(max(launch_lag, default=0.0) * 1000, 3)
+    return results, dict(latencies)
+
+
+def ks_statistic(a: Sequence[float], b: Sequence[float]) -> float:
+    """두 표본 분포의 Kolmogorov-Smirnov 거리 (0: 같음, 1: 완전히 다름)"""
+    if not a or not b:
+        return 0.0
+    a, b = sorted(a), sorted(b)
+    i = j = 0
+    distance = 0.0
+    while i < len(a) and j < len(b):
+        value = min(a[i], b[j])
+        while i < len(a) and a[i] <= value:
+            i += 1
+        while j < len(b) and b[j] <= value:
+            j += 1
+        distance = max(distance, abs(i / len(a) - j / len(b)))
+    return round(distance, 4)
+
+
+def diff_runs(base: Dict[str, Any], new: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """두 재생 결과의 라우트별 백분위수 변화와 분포 거리"""
+    rows = []
+    for name in sorted(set(base["results"]) & set(new["results"])):
+        row: Dict[str, Any] = {"route": name}
+        for metric in ("p50_ms", "p95_ms", "p99_ms"):
+            before, after = base["results"][name].get(metric), new["results"][name].get(metric)
+            row[metric] = (before, after)
+            row[f"{metric}_change"] = round((after - before) / before * 100, 1) if before else None
+        row["ks"] = ks_statistic(base["samples"].get(name, []), new["samples"].get(name, []))
+        rows.append(row)
+    return rows
+
+
+def format_diff(rows: List[Dict[str, Any]]) -> str:
+    width = max([len(row["route"]) for row in rows] + [5])
+    lines = [f"{'route':<{width}}  " + "  ".join(f"{m:>24}" for m in ("p50_ms", "p95_ms", "p99_ms")) + "      ks"]
+    for row in rows:
+        cells = []
+        for metric in ("p50_ms", "p95_ms", "p99_ms"):
+            before, after = row[metric]
+            change = row[f"{metric}_change"]
+            change_text = f"{change:+.1f}%" if change is not None else "n/a"
+            cells.append(f"{before}→{after} ({change_text})".rjust(24))
+        lines.append(f"{row['route']:<{width}}  " + "  ".join(cells) + f"  {row['ks']:>6}")
+    return "\n".join(lines)
+
+
+def save_run(path: str, config: Dict[str, Any], results: Dict[str, Any], samples: Dict[str, List[float]]) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(
+            {"config": config, "results": results, "samples": {k: [round(v, 3) for v in s] for k, s in samples.items()}},
+            f, ensure_ascii=False,
+        )
+
+
+def load_run(path: str) -> Dict[str, Any]:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
@@ -0,0 +1,84 @@
+"""
+벤치마크 통계 및 기준값 비교
+"""
+import json
+import math
+import os
+from typing import Any, Dict, List, Optional, Sequence
+
+BASELINE_DIR = os.path.join(os.path.dirname(__file__), "baselines")
+
+# 기준값과 비교하는 지표 (마이크로 벤치마크의 꼬리 지연과 p99는 변동이 커서 보고만 함)
+GATED_METRICS = ("p50_us", "ops_per_sec", "p50_ms", "p95_ms", "throughput_rps", "import_ms")
+HIGHER_IS_BETTER = {"ops_per_sec", "throughput_rps"}
+
+
+def percentile(samples: Sequence[float], q: float) -> float:
+    """nearest-rank 백분위수 (q: 0~100)"""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(q / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def summarize(samples: Sequence[float], unit: str, scale: float) -> Dict[str, float]:
+    """초 단위 샘플의 p50/p95/p99 (unit 이름, scale 배율로 변환)"""
+    return {
+        f"p{q}_{unit}": round(percentile(samples, q) * scale, 3)
+        for q in (50, 95, 99)
+    }
+
+
+def compare(
+    results: Dict[str, Dict[str, Any]],
+    baseline: Dict[str, Dict[str, Any]],
+    tolerance: float,
+) -> List[str]:
+    """기준값 대비 허용 범위를 넘은 회귀 목록 (기준값에 없는 항목은 건너뜀)"""
+    regressions = []
+    for name, metrics in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        for metric in GATED_METRICS:
+            if metric not in metrics or not base.get(metric):
+                continue
+            value, expected = metrics[metric], base[metric]
+            if metric in HIGHER_IS_BETTER:
+                regressed = value < expected * (1 - tolerance)
+            else:
+                regressed = value > expected * (1 + tolerance)
+            if regressed:
+                change = (value - expected) / expected * 100
+                regressions.append(f"{name}.{metric}: {expected} → {value} ({change:+.1f}%)")
+    return regressions
+
+
+def baseline_path(suite: str) -> str:
+    return os.path.join(BASELINE_DIR, f"{suite}.json")
+
+
+def load_baseline(path: str) -> Optional[Dict[str, Any]]:
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def save_baseline(path: str, config: Dict[str, Any], results: Dict[str, Dict[str, Any]]) -> None:
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"config": config, "results": results}, f, ensure_ascii=False, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def format_table(results: Dict[str, Dict[str, Any]]) -> str:
+    """결과를 고정폭 표로 출력"""
+    columns = sorted({metric for metrics in results.values() for metric in metrics})
+    width = max([len(name) for name in results] + [10])
+    lines = [f"{'name':<{width}}  " + "  ".join(f"{c:>14}" for c in columns)]
+    for name, metrics in results.items():
+        lines.append(f"{name:<{width}}  " + "  ".join(f"{metrics.get(c, ''):>14}" for c in columns))
+    return "\n".join(lines)
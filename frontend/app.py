@@ -19,12 +19,12 @@ st.set_page_config(
     initial_sidebar_state="collapsed"
 )
 
-# 상대 경로로 임포트
-from frontend.pages.chat_page import ChatPage
-from frontend.utils.session_manager import SessionManager
-
 def main():
     """메인 앱 실행"""
+    # 페이지 모듈은 set_page_config 이후에 임포트 (첫 실행에서만 로드되고 이후 재실행은 캐시 사용)
+    from frontend.pages.chat_page import ChatPage
+    from frontend.utils.session_manager import SessionManager
+    
     # 세션 관리자 초기화
     session_manager = SessionManager()
     session_manager.initialize_session()
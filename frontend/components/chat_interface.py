@@ -1,11 +1,13 @@
 """
 채팅 인터페이스 컴포넌트
 """
+import uuid
 import streamlit as st
 from typing import List, Dict, Any
 from frontend.config.settings import UIMessages
 from frontend.utils.session_manager import SessionManager
-from frontend.utils.api_client import sync_send_message
+from frontend.utils.api_client import sync_run_search_job, sync_send_message
+from src.agent.query_normalizer import is_search_query
 
 class ChatInterface:
     """채팅 인터페이스 클래스"""
@@ -27,7 +29,8 @@ class ChatInterface:
         if prompt := st.chat_input(self.ui_messages.CHAT_INPUT_PLACEHOLDER):
             # 사용자 메시지 추가
             self.session_manager.add_message("user", prompt)
-            self.session_manager.add_search_history(prompt)
+            if is_search_query(prompt):
+                self.session_manager.add_search_history(prompt)
             
             # 사용자 메시지 표시
             with st.chat_message("user"):
@@ -37,28 +40,55 @@ class ChatInterface:
             self._handle_bot_response(prompt)
     
     def _handle_bot_response(self, user_message: str) -> None:
-        """봇 응답 처리"""
+        """봇 응답 처리
+        
+        상품 검색 요청은 서버의 검색 작업(Job)으로 실행하고 진행률과 중간 결과를
+        폴링해 표시합니다. 인사 등 일반 대화이거나 작업 API를 쓸 수 없으면
+        채팅 API로 처리합니다.
+        """
         with st.chat_message("assistant"):
-            # 로딩 메시지 표시
-            with st.spinner(self.ui_messages.LOADING_MESSAGE):
-                try:
-                    # API 호출
-                    response = sync_send_message(
+            progress_bar = st.progress(0.0, text=self.ui_messages.LOADING_MESSAGE)
+            
+            def on_progress(job: Dict[str, Any]) -> None:
+                partial_count = len(job.get("partial_products") or [])
+                text = self.ui_messages.LOADING_MESSAGE
+                if partial_count:
+                    text = f"{text} (지금까지 {partial_count}개 상품 확인)"
+                progress_bar.progress(min(float(job.get("progress", 0.0)), 1.0), text=text)
+            
+            # 이번 턴의 모든 API 호출을 하나의 서버 트레이스로 묶음
+            trace_id = uuid.uuid4().hex
+            st.session_state.last_trace_id = trace_id
+            
+            try:
+                result = None
+                if is_search_query(user_message):
+                    result = sync_run_search_job(
                         user_message, 
-                        st.session_state.session_id
+                        st.session_state.session_id,
+                        on_progress=on_progress,
+                        trace_id=trace_id
                     )
-                    
-                    if "error" in response:
-                        bot_message = self.ui_messages.ERROR_MESSAGE
-                    else:
-                        bot_message = response.get("response", "응답을 받지 못했습니다.")
-                    
-                except Exception as e:
-                    bot_message = f"{self.ui_messages.ERROR_MESSAGE}\n상세 오류: {str(e)}"
                 
-                # 봇 메시지 표시 및 저장
-                st.markdown(bot_message)
-                self.session_manager.add_message("assistant", bot_message)
+                if result is None or "error" in result:
+                    # 일반 대화 또는 작업 API 실패 시 채팅 API 사용
+                    result = sync_send_message(user_message, st.session_state.session_id, trace_id)
+                
+                if "error" in result:
+                    bot_message = self.ui_messages.ERROR_MESSAGE
+                else:
+                    bot_message = result.get("message") or result.get("response", "응답을 받지 못했습니다.")
+                    if "products" in result:
+                        self.session_manager.set_current_products(result["products"])
+                
+            except Exception as e:
+                bot_message = f"{self.ui_messages.ERROR_MESSAGE}\n상세 오류: {str(e)}"
+            
+            progress_bar.empty()
+            
+            # 봇 메시지 표시 및 저장
+            st.markdown(bot_message)
+            self.session_manager.add_message("assistant", bot_message)
     
     def render_sidebar_history(self) -> None:
         """사이드바에 검색 기록 표시"""
@@ -2,13 +2,26 @@
 상품 카드 컴포넌트
 """
 import streamlit as st
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
+from frontend.config.settings import AppConfig
+from frontend.utils.api_client import sync_add_watch, thumbnail_url
+
+def parse_price(price: Any) -> Optional[float]:
+    """가격 표기("1,350,000원", 1350000)를 숫자로 변환"""
+    if price is None or price == "":
+        return None
+    if isinstance(price, (int, float)):
+        return float(price)
+    try:
+        return float(str(price).replace(',', '').replace('원', '').strip())
+    except ValueError:
+        return None
 
 class ProductCard:
     """상품 카드 클래스"""
     
     def __init__(self):
-        pass
+        self.config = AppConfig()
     
     def render_single_product(self, product: Dict[str, Any]) -> None:
         """단일 상품 카드 렌더링"""
@@ -16,11 +29,12 @@ class ProductCard:
             col1, col2, col3 = st.columns([1, 2, 1])
             
             with col1:
-                # 상품 이미지 (placeholder)
+                # 상품 이미지 (API 서버 썸네일 프록시 경유, 없으면 로컬 placeholder)
+                size = self.config.THUMBNAIL_SIZE
                 if product.get("image_url"):
-                    st.image(product["image_url"], width=100)
+                    st.image(thumbnail_url(product["image_url"], size), width=size)
                 else:
-                    st.image("https://via.placeholder.com/100x100?text=No+Image", width=100)
+                    st.image(self.config.PLACEHOLDER_IMAGE, width=size)
             
             with col2:
                 # 상품 정보
@@ -39,8 +53,26 @@ class ProductCard:
                 if product.get("url"):
                     st.link_button("🛒 구매하기", product["url"])
                 
-                if st.button("❤️ 찜하기", key=f"like_{product.get('id', 'unknown')}"):
-                    st.success("찜 목록에 추가되었습니다!")
+                product_key = product.get('id', 'unknown')
+                target_price = st.number_input(
+                    "목표가 (선택)",
+                    min_value=0,
+                    step=1000,
+                    value=None,
+                    key=f"target_{product_key}"
+                )
+                
+                if st.button("❤️ 찜하기", key=f"like_{product_key}"):
+                    result = sync_add_watch(
+                        st.session_state.session_id,
+                        product,
+                        price=parse_price(product.get("price")),
+                        target_price=float(target_price) if target_price else None
+                    )
+                    if "error" in result:
+                        st.error(f"찜 등록에 실패했습니다: {result['error']}")
+                    else:
+                        st.success("찜 목록에 추가되었습니다!")
     
     def render_product_grid(self, products: List[Dict[str, Any]]) -> None:
         """상품 그리드 렌더링"""
@@ -74,7 +106,7 @@ class ProductCard:
         # 가격순 정렬
         sorted_products = sorted(
             products, 
-            key=lambda x: float(x.get('price', '0').replace(',', '').replace('원', '')) if x.get('price') else 0
+            key=lambda x: parse_price(x.get('price')) or 0
         )
         
         # 테이블 데이터 준비
@@ -104,8 +136,8 @@ class ProductCard:
         
         with col2:
             prices = [
-                float(p.get('price', '0').replace(',', '').replace('원', '')) 
-                for p in products if p.get('price')
+                price for price in (parse_price(p.get('price')) for p in products)
+                if price is not None
             ]
             if prices:
                 avg_price = sum(prices) / len(prices)
@@ -1,9 +1,12 @@
 """
 앱 설정 및 상수 정의
 """
+import os
 from dataclasses import dataclass
 from typing import Dict, Any
 
+ASSETS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "assets")
+
 @dataclass
 class AppConfig:
     """앱 기본 설정"""
@@ -20,6 +23,14 @@ class AppConfig:
     # API 설정
     API_BASE_URL: str = "http://localhost:8000"
     
+    # 검색 작업 폴링 설정
+    SEARCH_JOB_POLL_INTERVAL: float = 0.5
+    SEARCH_JOB_TIMEOUT: float = 120.0
+    
+    # 상품 이미지 설정
+    THUMBNAIL_SIZE: int = 100
+    PLACEHOLDER_IMAGE: str = os.path.join(ASSETS_DIR, "no_image.png")
+    
     # 채팅 설정
     MAX_MESSAGES: int = 100
     DEFAULT_WELCOME_MESSAGE: str = "안녕하세요! 최저가 쇼핑 도우미입니다. 어떤 상품을 찾고 계신가요?"
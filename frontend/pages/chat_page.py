@@ -5,6 +5,7 @@ import streamlit as st
 from frontend.components.chat_interface import ChatInterface
 from frontend.components.product_card import ProductCard
 from frontend.utils.session_manager import SessionManager
+from frontend.utils.api_client import sync_get_watch_alerts
 
 class ChatPage:
     """채팅 페이지 클래스"""
@@ -54,11 +55,23 @@ class ChatPage:
             with col1:
                 st.write(f"**세션 ID:** {st.session_state.get('session_id', 'N/A')[:8]}...")
                 st.write(f"**메시지 수:** {len(self.session_manager.get_messages())}")
+                if st.session_state.get('last_trace_id'):
+                    st.write(f"**마지막 추적 ID:** `{st.session_state.last_trace_id}`")
             
             with col2:
                 st.write(f"**검색 기록:** {len(self.session_manager.get_search_history())}개")
                 st.write(f"**현재 상품:** {len(self.session_manager.get_current_products())}개")
     
+    def render_watch_alerts(self) -> None:
+        """찜 상품 목표가 도달 알림 표시"""
+        result = sync_get_watch_alerts(st.session_state.get('session_id', ''))
+        
+        for alert in result.get("alerts", []):
+            st.toast(
+                f"🔔 {alert['name'] or alert['item_id']} 가격이 "
+                f"{alert['price']:,.0f}원으로 목표가({alert['target_price']:,.0f}원)에 도달했습니다!"
+            )
+    
     def render_products_section(self) -> None:
         """상품 섹션 렌더링"""
         current_products = self.session_manager.get_current_products()
@@ -83,6 +96,9 @@ class ChatPage:
         # 헤더
         self.render_header()
         
+        # 찜 상품 알림
+        self.render_watch_alerts()
+        
         # 빠른 액션
         self.render_quick_actions()
         
@@ -1,18 +1,35 @@
 """
 API 클라이언트 유틸리티
 """
-import httpx
 import asyncio
-from typing import Dict, Any, Optional
+import time
+import uuid
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple, Callable
+from urllib.parse import urlencode
 from frontend.config.settings import AppConfig
 
+TRACE_HEADER = "X-Trace-Id"
+
+# 검증된 GET 응답 캐시 (요청 키 → (ETag, 응답 데이터))
+# 동기 래퍼가 호출마다 APIClient를 새로 만들기 때문에 모듈 단위로 공유
+_RESPONSE_CACHE_SIZE = 64
+_response_cache: "OrderedDict[str, Tuple[str, Dict[str, Any]]]" = OrderedDict()
+
+def _cache_key(url: str, params: Optional[Dict[str, Any]]) -> str:
+    if not params:
+        return url
+    return f"{url}?{urlencode(sorted(params.items()))}"
+
 class APIClient:
     """API 클라이언트 클래스"""
     
-    def __init__(self):
+    def __init__(self, trace_id: Optional[str] = None):
         self.config = AppConfig()
         self.base_url = self.config.API_BASE_URL
         self.timeout = 30.0
+        # 서버 트레이스와 연결하기 위한 추적 ID (한 번의 채팅 턴 동안 같은 값 사용)
+        self.trace_id = trace_id or uuid.uuid4().hex
     
     async def _make_request(
         self, 
@@ -21,14 +38,35 @@ class APIClient:
         data: Optional[Dict[str, Any]] = None
     ) -> Dict[str, Any]:
         """HTTP 요청 실행"""
+        # httpx는 첫 요청 시점에 임포트 (앱 첫 화면 렌더링을 늦추지 않도록)
+        import httpx
+        
         url = f"{self.base_url}{endpoint}"
         
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
+            async with httpx.AsyncClient(
+                timeout=self.timeout, 
+                headers={TRACE_HEADER: self.trace_id}
+            ) as client:
                 if method.upper() == "GET":
-                    response = await client.get(url, params=data)
+                    # 이전에 받은 응답이 있으면 조건부 요청으로 재검증
+                    cache_key = _cache_key(url, data)
+                    cached = _response_cache.get(cache_key)
+                    headers = {"If-None-Match": cached[0]} if cached else {}
+                    response = await client.get(url, params=data, headers=headers)
+                    
+                    if cached and response.status_code == 304:
+                        _response_cache.move_to_end(cache_key)
+                        return cached[1]
+                    
+                    response.raise_for_status()
+                    result = response.json()
+                    self._store_response(cache_key, response.headers.get("ETag"), result)
+                    return result
                 elif method.upper() == "POST":
                     response = await client.post(url, json=data)
+                elif method.upper() == "DELETE":
+                    response = await client.delete(url)
                 else:
                     raise ValueError(f"지원하지 않는 HTTP 메서드: {method}")
                 
@@ -42,6 +80,16 @@ class APIClient:
         except Exception as e:
             return {"error": f"연결 오류: {str(e)}"}
     
+    @staticmethod
+    def _store_response(cache_key: str, etag: Any, result: Dict[str, Any]) -> None:
+        """ETag가 있는 응답을 캐시에 저장"""
+        if not isinstance(etag, str):
+            return
+        _response_cache[cache_key] = (etag, result)
+        _response_cache.move_to_end(cache_key)
+        while len(_response_cache) > _RESPONSE_CACHE_SIZE:
+            _response_cache.popitem(last=False)
+    
     async def health_check(self) -> Dict[str, Any]:
         """서버 상태 확인"""
         return await self._make_request("GET", "/health")
@@ -57,7 +105,81 @@ class APIClient:
     async def search_products(self, query: str) -> Dict[str, Any]:
         """상품 검색"""
         data = {"query": query}
-        return await self._make_request("POST", "/search", data)
+        return await self._make_request("GET", "/search", data)
+    
+    async def submit_search_job(self, query: str, session_id: str) -> Dict[str, Any]:
+        """검색 작업 등록"""
+        data = {"query": query, "session_id": session_id}
+        return await self._make_request("POST", "/search/jobs", data)
+    
+    async def get_search_job(self, job_id: str) -> Dict[str, Any]:
+        """검색 작업 상태 조회"""
+        return await self._make_request("GET", f"/search/jobs/{job_id}")
+    
+    async def cancel_search_job(self, job_id: str) -> Dict[str, Any]:
+        """검색 작업 취소"""
+        return await self._make_request("DELETE", f"/search/jobs/{job_id}")
+    
+    async def run_search_job(
+        self, 
+        query: str, 
+        session_id: str,
+        on_progress: Optional[Callable[[Dict[str, Any]], None]] = None
+    ) -> Dict[str, Any]:
+        """검색 작업 등록 후 완료될 때까지 폴링"""
+        submitted = await self.submit_search_job(query, session_id)
+        if "error" in submitted:
+            return submitted
+        
+        job_id = submitted["job_id"]
+        deadline = time.monotonic() + self.config.SEARCH_JOB_TIMEOUT
+        while time.monotonic() < deadline:
+            await asyncio.sleep(self.config.SEARCH_JOB_POLL_INTERVAL)
+            job = await self.get_search_job(job_id)
+            if "error" in job and "status" not in job:
+                return job
+            
+            if on_progress:
+                on_progress(job)
+            
+            if job["status"] == "completed":
+                return job["result"]
+            if job["status"] in ("failed", "cancelled"):
+                return {"error": job.get("error") or f"검색 작업이 {job['status']} 상태로 종료되었습니다."}
+        
+        await self.cancel_search_job(job_id)
+        return {"error": "요청 시간이 초과되었습니다."}
+    
+    async def get_chat_history(self, session_id: str) -> Dict[str, Any]:
+        """세션 대화 기록 조회"""
+        return await self._make_request("GET", f"/chat/history/{session_id}")
+    
+    async def add_watch(
+        self, 
+        session_id: str, 
+        product: Dict[str, Any], 
+        price: Optional[float] = None,
+        target_price: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """상품 찜 등록"""
+        data = {
+            "session_id": session_id,
+            "store": product.get("store", "unknown"),
+            "product_id": str(product.get("id", "unknown")),
+            "name": product.get("name", ""),
+            "price": price,
+            "target_price": target_price
+        }
+        return await self._make_request("POST", "/watch", data)
+    
+    async def get_watch_alerts(self, session_id: str) -> Dict[str, Any]:
+        """목표가 도달 알림 조회"""
+        return await self._make_request("GET", f"/watch/{session_id}/alerts")
+
+def thumbnail_url(image_url: str, size: int = 100) -> str:
+    """API 서버 썸네일 프록시 URL 생성"""
+    query = urlencode({"url": image_url, "size": size})
+    return f"{AppConfig.API_BASE_URL}/images/thumbnail?{query}"
 
 # 동기 래퍼 함수들 (Streamlit에서 사용)
 def sync_health_check() -> Dict[str, Any]:
@@ -65,12 +187,42 @@ def sync_health_check() -> Dict[str, Any]:
     client = APIClient()
     return asyncio.run(client.health_check())
 
-def sync_send_message(message: str, session_id: str) -> Dict[str, Any]:
+def sync_send_message(message: str, session_id: str, trace_id: Optional[str] = None) -> Dict[str, Any]:
     """동기 메시지 전송"""
-    client = APIClient()
+    client = APIClient(trace_id)
     return asyncio.run(client.send_message(message, session_id))
 
 def sync_search_products(query: str) -> Dict[str, Any]:
     """동기 상품 검색"""
     client = APIClient()
-    return asyncio.run(client.search_products(query)) 
\ No newline at end of file
+    return asyncio.run(client.search_products(query))
+
+def sync_add_watch(
+    session_id: str,
+    product: Dict[str, Any],
+    price: Optional[float] = None,
+    target_price: Optional[float] = None
+) -> Dict[str, Any]:
+    """동기 찜 등록"""
+    client = APIClient()
+    return asyncio.run(client.add_watch(session_id, product, price, target_price))
+
+def sync_get_watch_alerts(session_id: str) -> Dict[str, Any]:
+    """동기 목표가 알림 조회"""
+    client = APIClient()
+    return asyncio.run(client.get_watch_alerts(session_id))
+
+def sync_get_chat_history(session_id: str) -> Dict[str, Any]:
+    """동기 대화 기록 조회"""
+    client = APIClient()
+    return asyncio.run(client.get_chat_history(session_id))
+
+def sync_run_search_job(
+    query: str, 
+    session_id: str,
+    on_progress: Optional[Callable[[Dict[str, Any]], None]] = None,
+    trace_id: Optional[str] = None
+) -> Dict[str, Any]:
+    """동기 검색 작업 실행 (진행 상황은 on_progress로 전달)"""
+    client = APIClient(trace_id)
+    return asyncio.run(client.run_search_job(query, session_id, on_progress))
@@ -4,6 +4,7 @@ Streamlit 세션 상태 관리
 import streamlit as st
 from typing import List, Dict, Any
 from frontend.config.settings import AppConfig
+from src.agent.query_normalizer import normalize_query
 
 class SessionManager:
     """세션 상태 관리 클래스"""
@@ -49,8 +50,10 @@ class SessionManager:
         return st.session_state.messages
     
     def add_search_history(self, query: str) -> None:
-        """검색 기록 추가"""
-        if query not in st.session_state.search_history:
+        """검색 기록 추가 (표기만 다른 동일 쿼리는 중복 저장하지 않음)"""
+        key = normalize_query(query).key
+        history_keys = {normalize_query(q).key for q in st.session_state.search_history}
+        if key not in history_keys:
             st.session_state.search_history.append(query)
             # 최근 10개만 유지
             if len(st.session_state.search_history) > 10:
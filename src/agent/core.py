@@ -1,21 +1,267 @@
-from typing import Dict, Any
+import asyncio
+import heapq
+import time
+from concurrent.futures import Executor
+from typing import Dict, Any, List, Callable, Optional
+from src.agent.cache import TTLCache
+from src.agent.pipeline import LLMBackend, StoreBackend, offer_price, timed_dedup_and_rank
+from src.agent.query_normalizer import NormalizedQuery, normalize_query
+from src.telemetry.metrics import STAGE_DURATION, record_cache, stage
+from src.telemetry.tracing import record_span
+
+# 진행 상황 콜백: (단계 이름, 진행률 0~1, 중간 결과 상품 목록)
+ProgressCallback = Callable[[str, float, List[Dict[str, Any]]], None]
+
+class _SharedSearch:
+    """동일 쿼리 동시 요청이 함께 기다리는 검색 태스크"""
+    
+    def __init__(self):
+        self.task: Optional[asyncio.Task] = None
+        self.waiters = 0
+        self.listeners: List[ProgressCallback] = []
+    
+    def progress(self, stage_name: str, value: float, partial: List[Dict[str, Any]]) -> None:
+        for listener in list(self.listeners):
+            listener(stage_name, value, partial)
 
 class PriceFinderAgent:
     """최저가 쇼핑 Agent 기본 클래스"""
     
-    def __init__(self):
+    MAX_HISTORY = 100
+    MAX_RESULTS = 50
+    PARTIAL_RESULTS = 20
+    STORE_TIMEOUT = 10.0
+    SEARCH_CACHE_TTL = 60.0
+    WARMUP_QUERIES = ("아이폰 15 최저가", "게이밍 노트북 추천", "무선 이어폰 비교", "애플워치 할인")
+    # 최근 실제 조회 결과가 없는 쇼핑몰의 상태 확인용 쿼리 (ping()이 없는 백엔드)
+    STORE_PROBE_QUERY = "아이폰"
+    
+    def __init__(self, stores: Optional[List[StoreBackend]] = None, llm: Optional[LLMBackend] = None):
         self.session_state = {}
+        self.stores = list(stores or [])
+        self.llm = llm
+        self.search_cache = TTLCache(maxsize=1024, ttl=self.SEARCH_CACHE_TTL)
+        self._inflight: Dict[Any, _SharedSearch] = {}
+        # 쇼핑몰별 최근 조회 결과 {이름: {"ok", "error", "checked_at"(monotonic)}}
+        self.store_status: Dict[str, Dict[str, Any]] = {}
+    
+    def warmup(self) -> None:
+        """자주 쓰는 쿼리로 정규화 캐시 예열 및 LLM 백엔드 준비 (블로킹)"""
+        self.warmup_cache()
+        self.warmup_llm()
+    
+    def warmup_cache(self) -> None:
+        """자주 쓰는 쿼리로 정규화 캐시 예열 (블로킹)"""
+        for query in self.WARMUP_QUERIES:
+            normalize_query(query)
+    
+    def warmup_llm(self) -> None:
+        """LLM 백엔드의 무거운 임포트와 초기화를 미리 수행 (블로킹)"""
+        warmup_llm = getattr(self.llm, "warmup", None)
+        if warmup_llm is not None:
+            warmup_llm()
     
     async def process_message(self, message: str, session_id: str) -> Dict[str, Any]:
         """메시지 처리 기본 메서드"""
+        history = self.session_state.setdefault(session_id, {"messages": []})["messages"]
+        with stage("llm"):
+            if self.llm is None:
+                response = f"메시지 '{message}' 처리 중... (구현 예정)"
+            else:
+                response = await self.llm.generate(message, list(history))
+        
+        history.append({"role": "user", "content": message})
+        history.append({"role": "assistant", "content": response})
+        # 최근 메시지만 유지
+        del history[:-self.MAX_HISTORY]
+        
         return {
-            "response": f"메시지 '{message}' 처리 중... (구현 예정)",
+            "response": response,
             "session_id": session_id
         }
     
-    async def search_products(self, query: str) -> Dict[str, Any]:
-        """상품 검색 기본 메서드"""
+    def get_history(self, session_id: str) -> List[Dict[str, str]]:
+        """세션 대화 기록 반환"""
+        return self.session_state.get(session_id, {}).get("messages", [])
+    
+    async def search_products(
+        self, 
+        query: str, 
+        progress: Optional[ProgressCallback] = None,
+        executor: Optional[Executor] = None
+    ) -> Dict[str, Any]:
+        """상품 검색 (쇼핑몰 조회 → 중복 제거/랭킹)
+        
+        executor가 주어지면 CPU 단계(중복 제거/랭킹)를 해당 executor에서 실행합니다.
+        """
+        with stage("normalize"):
+            normalized = normalize_query(query)
+        products = await self._search_normalized(normalized, progress, executor)
+        
+        if products:
+            message = f"'{query}' 검색 결과 {len(products)}개 상품을 찾았습니다."
+        else:
+            message = f"'{query}' 검색 결과가 없습니다."
+        
         return {
-            "products": [],
-            "message": f"'{query}' 상품 검색 기능 구현 예정"
-        } 
\ No newline at end of file
+            "products": products,
+            "query": normalized.text,
+            "intents": sorted(normalized.intents),
+            "message": message
+        }
+    
+    async def _search_normalized(
+        self, 
+        normalized: NormalizedQuery, 
+        progress: Optional[ProgressCallback],
+        executor: Optional[Executor]
+    ) -> List[Dict[str, Any]]:
+        """정규화된 쿼리 검색 (캐시 및 동일 쿼리 동시 요청 병합)
+        
+        검색은 별도 태스크에서 실행하고 요청들은 이를 함께 기다립니다. 한 요청이
+        취소되어도 다른 요청의 검색은 계속되며, 기다리는 요청이 모두 취소된 경우에만
+        검색을 중단합니다.
+        """
+        key = (normalized.key, normalized.intents)
+        with stage("cache"):
+            cached = self.search_cache.get(key)
+        record_cache("search", cached is not None)
+        if cached is not None:
+            return cached
+        
+        shared = self._inflight.get(key)
+        if shared is None:
+            shared = self._inflight[key] = _SharedSearch()
+            shared.task = asyncio.create_task(
+                self._run_search(key, shared, normalized, executor), name="search"
+            )
+        
+        shared.waiters += 1
+        if progress:
+            shared.listeners.append(progress)
+        try:
+            return await asyncio.shield(shared.task)
+        finally:
+            shared.waiters -= 1
+            if progress:
+                shared.listeners.remove(progress)
+            if shared.waiters == 0 and not shared.task.done():
+                # 결과를 기다리는 요청이 없으면 검색 중단 (이후 같은 쿼리는 새로 검색)
+                self._inflight.pop(key, None)
+                shared.task.cancel()
+    
+    async def _run_search(
+        self,
+        key: Any,
+        shared: _SharedSearch,
+        normalized: NormalizedQuery,
+        executor: Optional[Executor]
+    ) -> List[Dict[str, Any]]:
+        try:
+            offers = await self._fan_out(normalized, shared.progress)
+            shared.progress("rank", 0.9, [])
+            products = await self._dedup_and_rank(offers, normalized, executor)
+            self.search_cache.set(key, products)
+            return products
+        finally:
+            if self._inflight.get(key) is shared:
+                del self._inflight[key]
+    
+    async def _fan_out(
+        self, 
+        normalized: NormalizedQuery, 
+        progress: Optional[ProgressCallback]
+    ) -> List[Dict[str, Any]]:
+        """I/O 단계: 모든 쇼핑몰 동시 조회"""
+        offers: List[Dict[str, Any]] = []
+        if not self.stores:
+            return offers
+        
+        tasks = [
+            asyncio.create_task(self._search_store(store, normalized), name=f"store:{store.name}")
+            for store in self.stores
+        ]
+        try:
+            for done, task in enumerate(asyncio.as_completed(tasks), 1):
+                offers.extend(await task)
+                if progress:
+                    partial = heapq.nsmallest(self.PARTIAL_RESULTS, offers, key=offer_price)
+                    progress("stores", 0.8 * done / len(tasks), partial)
+        finally:
+            for task in tasks:
+                task.cancel()
+        return offers
+    
+    async def _search_store(self, store: StoreBackend, normalized: NormalizedQuery) -> List[Dict[str, Any]]:
+        """단일 쇼핑몰 조회 (실패/시간 초과 시 빈 결과)"""
+        try:
+            with stage("store", store.name):
+                offers = await asyncio.wait_for(store.search(normalized), timeout=self.STORE_TIMEOUT)
+        except Exception as e:
+            self._record_store_status(store, e)
+            return []
+        self._record_store_status(store, None)
+        return offers
+    
+    def _record_store_status(self, store: StoreBackend, error: Optional[BaseException]) -> None:
+        status: Dict[str, Any] = {"ok": error is None, "checked_at": time.monotonic()}
+        if error is not None:
+            status["error"] = repr(error)
+        self.store_status[store.name] = status
+    
+    async def probe_stores(self, max_age: float = 0.0) -> None:
+        """최근 max_age초 안에 조회 결과가 없는 쇼핑몰의 연결 상태 확인
+        
+        백엔드에 ping()이 있으면 사용하고, 없으면 가벼운 검색 쿼리를 보냅니다.
+        """
+        now = time.monotonic()
+        stale = [
+            store for store in self.stores
+            if now - self.store_status.get(store.name, {}).get("checked_at", float("-inf")) >= max_age
+        ]
+        await asyncio.gather(*(self._probe_store(store) for store in stale))
+    
+    async def _probe_store(self, store: StoreBackend) -> None:
+        ping = getattr(store, "ping", None)
+        try:
+            probe = ping() if ping is not None else store.search(normalize_query(self.STORE_PROBE_QUERY))
+            await asyncio.wait_for(probe, timeout=self.STORE_TIMEOUT)
+        except Exception as e:
+            self._record_store_status(store, e)
+            return
+        self._record_store_status(store, None)
+    
+    async def monitor_stores(self, stop: asyncio.Event, interval: float = 30.0) -> None:
+        """중지 신호가 올 때까지 주기적으로 쇼핑몰 상태 갱신 (실제 조회가 있으면 생략)"""
+        while not stop.is_set():
+            await self.probe_stores(max_age=interval)
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=interval)
+            except asyncio.TimeoutError:
+                pass
+    
+    async def _dedup_and_rank(
+        self, 
+        offers: List[Dict[str, Any]], 
+        normalized: NormalizedQuery,
+        executor: Optional[Executor]
+    ) -> List[Dict[str, Any]]:
+        """CPU 단계: 중복 제거 및 랭킹"""
+        args = (offers, normalized.text, normalized.intents, self.MAX_RESULTS)
+        if executor is None or not offers:
+            products, dedup_seconds, rank_seconds = timed_dedup_and_rank(*args)
+        else:
+            loop = asyncio.get_running_loop()
+            products, dedup_seconds, rank_seconds = await loop.run_in_executor(
+                executor, timed_dedup_and_rank, *args
+            )
+        
+        STAGE_DURATION.observe(dedup_seconds, "dedup", "")
+        STAGE_DURATION.observe(rank_seconds, "rank", "")
+        record_span("agent.dedup", dedup_seconds, ended_ago=rank_seconds)
+        record_span("agent.rank", rank_seconds)
+        return products
+    
+    async def fetch_prices(self, store: str, product_ids: List[str]) -> Dict[str, float]:
+        """쇼핑몰별 현재 가격 일괄 조회 기본 메서드"""
+        return {}
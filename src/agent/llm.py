@@ -0,0 +1,78 @@
+"""
+LangChain/LangGraph 기반 LLM 백엔드
+
+langchain, langgraph, langchain-google-genai는 임포트에만 수백 ms가 걸리므로 모듈
+최상위에서 임포트하지 않습니다. 서버의 백그라운드 예열이나 첫 응답 생성 시점에
+임포트하며, 컴파일된 Agent 그래프는 모델별로 프로세스당 한 번만 만듭니다.
+"""
+import asyncio
+import importlib.util
+import os
+import threading
+from typing import Any, Dict, List, Optional
+
+DEFAULT_MODEL = "gemini-1.5-flash"
+
+SYSTEM_PROMPT = (
+    "당신은 최저가 쇼핑 도우미입니다. 사용자가 찾는 상품을 파악하고, "
+    "여러 쇼핑몰의 가격을 비교해 구매 결정을 도와주세요."
+)
+
+# 백엔드에 필요한 패키지 (설치 여부만 확인하고 임포트는 미룸)
+REQUIRED_PACKAGES = ("langchain_google_genai", "langgraph")
+
+_graphs: Dict[str, Any] = {}
+_graph_lock = threading.Lock()
+
+
+def _build_agent_graph(model: str) -> Any:
+    from langchain_google_genai import ChatGoogleGenerativeAI
+    from langgraph.prebuilt import create_react_agent
+
+    llm = ChatGoogleGenerativeAI(model=model)
+    return create_react_agent(llm, tools=[], prompt=SYSTEM_PROMPT)
+
+
+def get_agent_graph(model: str = DEFAULT_MODEL) -> Any:
+    """컴파일된 Agent 그래프 (프로세스당 한 번 생성, 스레드 안전)"""
+    graph = _graphs.get(model)
+    if graph is None:
+        with _graph_lock:
+            graph = _graphs.get(model)
+            if graph is None:
+                graph = _graphs[model] = _build_agent_graph(model)
+    return graph
+
+
+class GeminiLLM:
+    """Gemini 모델을 사용하는 LLMBackend"""
+
+    def __init__(self, model: Optional[str] = None):
+        self.model = model or os.getenv("LLM_MODEL", DEFAULT_MODEL)
+
+    def warmup(self) -> None:
+        """무거운 임포트와 그래프 생성을 미리 수행 (블로킹, 스레드에서 호출)"""
+        get_agent_graph(self.model)
+
+    async def generate(self, message: str, history: List[Dict[str, str]]) -> str:
+        graph = _graphs.get(self.model)
+        if graph is None:
+            # 예열 전 첫 요청: 임포트가 이벤트 루프를 막지 않도록 스레드에서 생성
+            graph = await asyncio.to_thread(get_agent_graph, self.model)
+
+        messages = [(turn["role"], turn["content"]) for turn in history]
+        messages.append(("user", message))
+        result = await graph.ainvoke({"messages": messages})
+        return result["messages"][-1].content
+
+
+def llm_packages_available() -> bool:
+    """LLM 백엔드 패키지가 설치되어 있는지 확인 (모듈을 실행하지 않으므로 빠름)"""
+    return all(importlib.util.find_spec(name) is not None for name in REQUIRED_PACKAGES)
+
+
+def default_llm() -> Optional[GeminiLLM]:
+    """GOOGLE_API_KEY가 설정되어 있고 LLM 패키지가 설치되어 있으면 Gemini 백엔드, 아니면 None"""
+    if not os.getenv("GOOGLE_API_KEY") or not llm_packages_available():
+        return None
+    return GeminiLLM()
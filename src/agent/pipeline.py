@@ -0,0 +1,101 @@
+"""
+상품 검색 파이프라인 단계
+
+쇼핑몰 조회(I/O)와 중복 제거·랭킹(CPU) 단계를 분리해 두어, CPU 단계는
+프로세스 풀에서 실행할 수 있습니다. 프로세스 풀로 넘기는 함수는 피클링이
+가능하도록 모듈 최상위 함수로 정의합니다.
+"""
+import time
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Protocol, Tuple
+
+from src.agent.query_normalizer import NormalizedQuery, normalize_query
+
+
+class StoreBackend(Protocol):
+    """쇼핑몰 검색 백엔드"""
+    name: str
+
+    async def search(self, query: NormalizedQuery) -> List[Dict[str, Any]]:
+        """상품 목록 반환 (각 상품: id, name, price, store, url, image_url, rating)"""
+        ...
+
+
+class LLMBackend(Protocol):
+    """대화 응답 생성 백엔드"""
+
+    async def generate(self, message: str, history: List[Dict[str, str]]) -> str:
+        """이전 대화(history)를 참고해 사용자 메시지에 대한 응답 생성"""
+        ...
+
+
+def offer_price(offer: Dict[str, Any]) -> float:
+    """상품 가격 (가격이 없으면 가장 뒤로 정렬되도록 무한대)"""
+    price = offer.get("price")
+    return float(price) if isinstance(price, (int, float)) else float("inf")
+
+
+def dedup_offers(offers: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """같은 쇼핑몰의 같은 상품은 최저가 하나만 남김"""
+    best: Dict[tuple, Dict[str, Any]] = {}
+    for offer in offers:
+        key = (offer.get("store"), normalize_query(offer.get("name", "")).key)
+        current = best.get(key)
+        if current is None or offer_price(offer) < offer_price(current):
+            best[key] = offer
+    return list(best.values())
+
+
+def rank_offers(
+    offers: List[Dict[str, Any]],
+    query_text: str,
+    intents: FrozenSet[str],
+) -> List[Dict[str, Any]]:
+    """쿼리 관련도와 가격으로 정렬 (최저가 의도가 있으면 관련 상품 중 가격 우선)"""
+    query_tokens = set(query_text.split())
+
+    def relevance(offer: Dict[str, Any]) -> float:
+        if not query_tokens:
+            return 0.0
+        name_tokens = set(normalize_query(offer.get("name", "")).text.split())
+        return len(query_tokens & name_tokens) / len(query_tokens)
+
+    scored = [(relevance(offer), offer) for offer in offers]
+    if "cheapest" in intents:
+        # 관련도가 최고 관련도의 절반 미만인 상품(다른 모델 등)은 뒤로 보냄
+        top = max((score for score, _ in scored), default=0.0)
+        scored.sort(key=lambda item: (item[0] < top / 2, offer_price(item[1])))
+    else:
+        scored.sort(key=lambda item: (-item[0], offer_price(item[1]), -float(item[1].get("rating") or 0)))
+    return [offer for _, offer in scored]
+
+
+def dedup_and_rank(
+    offers: List[Dict[str, Any]],
+    query_text: str,
+    intents: FrozenSet[str],
+    limit: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """CPU 단계: 중복 제거 후 랭킹"""
+    ranked = rank_offers(dedup_offers(offers), query_text, intents)
+    return ranked[:limit] if limit else ranked
+
+
+def timed_dedup_and_rank(
+    offers: List[Dict[str, Any]],
+    query_text: str,
+    intents: FrozenSet[str],
+    limit: Optional[int] = None,
+) -> Tuple[List[Dict[str, Any]], float, float]:
+    """dedup_and_rank와 같지만 (결과, 중복 제거 시간, 랭킹 시간)을 반환
+
+    프로세스 풀에서 실행되면 자식 프로세스의 메트릭은 수집되지 않으므로,
+    단계별 처리 시간을 결과와 함께 돌려주어 부모 프로세스에서 기록합니다.
+    """
+    start = time.perf_counter()
+    deduped = dedup_offers(offers)
+    dedup_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    ranked = rank_offers(deduped, query_text, intents)
+    rank_seconds = time.perf_counter() - start
+    return (ranked[:limit] if limit else ranked), dedup_seconds, rank_seconds
@@ -0,0 +1,232 @@
+"""
+검색 쿼리 정규화
+
+"아이폰 15", "아이폰15", "iPhone 15", "아이폰 15 최저가"처럼 표기만 다른 쿼리를
+하나의 캐시/코얼레싱 키로 모으기 위한 모듈입니다. 모든 요청마다 실행되므로
+정규식은 모듈 로드 시 한 번만 컴파일하고, 결과는 LRU 캐시에 보관합니다.
+"""
+import re
+import unicodedata
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, FrozenSet, List, Tuple
+
+# 한글 브랜드/제품명 → 영문 표기 (앞에 한글이 붙은 경우는 제외: 파인애플)
+BRAND_ALIASES: Dict[str, str] = {
+    "아이폰": "iphone",
+    "아이패드": "ipad",
+    "맥북": "macbook",
+    "아이맥": "imac",
+    "에어팟": "airpods",
+    "애플워치": "apple watch",
+    "애플": "apple",
+    "갤럭시탭": "galaxy tab",
+    "갤럭시북": "galaxy book",
+    "갤럭시버즈": "galaxy buds",
+    "갤럭시": "galaxy",
+    "삼성": "samsung",
+    "엘지": "lg",
+    "소니": "sony",
+    "다이슨": "dyson",
+    "닌텐도": "nintendo",
+    "플레이스테이션": "playstation",
+    "플스": "playstation",
+    "샤오미": "xiaomi",
+    "레노버": "lenovo",
+    "에이수스": "asus",
+}
+
+# 모델 등급 표기 (뒤에 한글이 이어지면 다른 단어이므로 매칭하지 않음: 프로젝터, 에어컨)
+MODIFIER_ALIASES: Dict[str, str] = {
+    "프로": "pro",
+    "맥스": "max",
+    "울트라": "ultra",
+    "플러스": "plus",
+    "미니": "mini",
+    "에어": "air",
+    "라이트": "lite",
+    "폴드": "fold",
+    "플립": "flip",
+}
+
+# 단위 표기 → 정규 단위
+UNIT_ALIASES: Dict[str, str] = {
+    "gb": "gb",
+    "기가": "gb",
+    "기가바이트": "gb",
+    "tb": "tb",
+    "테라": "tb",
+    "테라바이트": "tb",
+    "mb": "mb",
+    "메가": "mb",
+    "인치": "inch",
+    "inch": "inch",
+    '"': "inch",
+    "mm": "mm",
+    "cm": "cm",
+    "ml": "ml",
+    "l": "l",
+    "리터": "l",
+    "kg": "kg",
+    "g": "g",
+    "w": "w",
+    "와트": "w",
+    "hz": "hz",
+    "mah": "mah",
+}
+
+# 의도 단어 → 구조화된 플래그
+INTENT_WORDS: Dict[str, str] = {
+    "최저가": "cheapest",
+    "최저": "cheapest",
+    "최저가격": "cheapest",
+    "가장싼": "cheapest",
+    "제일싼": "cheapest",
+    "저렴한": "cheapest",
+    "cheapest": "cheapest",
+    "lowest price": "cheapest",
+    "추천": "recommend",
+    "recommend": "recommend",
+    "비교": "compare",
+    "compare": "compare",
+    "vs": "compare",
+    "할인": "discount",
+    "세일": "discount",
+    "특가": "discount",
+    "sale": "discount",
+    "리뷰": "review",
+    "후기": "review",
+    "review": "review",
+}
+
+# 한글 의도 단어 뒤에 붙어도 같은 의도로 보는 조사/어미
+INTENT_SUFFIXES: Tuple[str, ...] = ("해주세요", "해줘", "해", "으로", "로", "를", "을", "순")
+
+# 브랜드 바로 뒤에 붙여 쓰는 액세서리 표기 ("아이폰케이스" → "iphone 케이스")
+ACCESSORY_WORDS: Tuple[str, ...] = ("케이스", "충전기", "케이블", "필름", "커버", "거치대", "스트랩")
+
+# 상품 검색 요청으로 볼 수 있는 표현 (일반 대화와 구분할 때 사용)
+SEARCH_REQUEST_WORDS: Tuple[str, ...] = (
+    "가격", "얼마", "찾아", "검색", "구매", "사고 싶", "살까", "파는 곳", "price",
+)
+
+# 의미 없는 요청 표현 (토큰 단위로 제거)
+FILLER_WORDS: FrozenSet[str] = frozenset({
+    "가격", "찾아줘", "찾아주세요", "알려줘", "알려주세요", "검색", "검색해줘",
+    "해줘", "해주세요", "좀", "제품", "상품", "price",
+})
+
+
+def _alternation(words) -> str:
+    """긴 단어가 먼저 매칭되도록 정렬한 정규식 alternation"""
+    return "|".join(re.escape(w) for w in sorted(words, key=len, reverse=True))
+
+
+_WHITESPACE_RE = re.compile(r"\s+")
+_PUNCT_RE = re.compile(r"[^\w\s\"./+-]")
+_MODIFIERS = _alternation(MODIFIER_ALIASES)
+# 브랜드 뒤에 한글이 이어지면 등급/브랜드/액세서리 표기일 때만 매칭 ("맥북에어", "아이폰케이스"; "애플망고"는 제외)
+_BRAND_RE = re.compile(
+    f"(?<![가-힣])(?:{_alternation(BRAND_ALIASES)})"
+    f"(?=$|[^가-힣]|{_MODIFIERS}|{_alternation(BRAND_ALIASES)}|{_alternation(ACCESSORY_WORDS)})"
+)
+# 등급 표기는 연속될 수 있음 ("프로맥스")
+_MODIFIER_RE = re.compile(f"(?:{_MODIFIERS})(?=(?:{_MODIFIERS})*(?![가-힣]))")
+# 한글 ↔ 영문/숫자 경계에 공백 삽입 ("iphone15케이스" → "iphone15 케이스")
+_HANGUL_BOUNDARY_RE = re.compile(r"(?<=[가-힣])(?=[a-z0-9])|(?<=[a-z0-9])(?=[가-힣])")
+# 브랜드/등급 단어와 숫자 사이 공백 삽입 ("iphone15" → "iphone 15")
+_WORD_NUMBER_RE = re.compile(
+    f"\\b({_alternation(set(BRAND_ALIASES.values()) | set(MODIFIER_ALIASES.values()))})(?=\\d)"
+)
+# 숫자 뒤에 붙은 영문 등급 표기 분리 ("15pro" → "15 pro", "15promax" → "15 pro max")
+_LATIN_MODIFIERS = _alternation(MODIFIER_ALIASES.values())
+_NUMBER_MODIFIER_RE = re.compile(f"(?<=\\d)((?:{_LATIN_MODIFIERS})+)\\b")
+_LATIN_MODIFIER_RE = re.compile(_LATIN_MODIFIERS)
+_UNIT_RE = re.compile(
+    f"(\\d+(?:\\.\\d+)?)\\s*({_alternation(UNIT_ALIASES)})(?![a-z가-힣])"
+)
+_UNIT_TOKEN_RE = re.compile(f"^\\d+(?:\\.\\d+)?(?:{_alternation(set(UNIT_ALIASES.values()))})$")
+_BRAND_TOKENS = frozenset(token for name in BRAND_ALIASES.values() for token in name.split())
+# 하이픈으로 나뉜 모델 번호 결합 ("sm-s921n" → "sms921n", "wh-1000xm5" → "wh1000xm5")
+_MODEL_HYPHEN_RE = re.compile(r"\b([a-z]+\d*)-(?=[a-z]*\d)")
+# 한글 의도 단어는 다른 단어의 일부가 아닐 때만 매칭 ("비교적", "비싼" 제외)
+# 뒤에 붙는 조사/요청 어미는 함께 제거 ("추천해줘", "최저가로")
+_INTENT_RE = re.compile(
+    f"(?<![가-힣])(?P<ko>{_alternation(w for w in INTENT_WORDS if not w.isascii())})"
+    f"(?:{_alternation(INTENT_SUFFIXES)})?(?![가-힣])"
+    f"|\\b(?P<en>{_alternation(w for w in INTENT_WORDS if w.isascii())})\\b"
+)
+
+
+@dataclass(frozen=True)
+class NormalizedQuery:
+    """정규화된 검색 쿼리"""
+    original: str
+    text: str
+    intents: FrozenSet[str]
+
+    @property
+    def key(self) -> str:
+        """캐시 및 요청 병합(coalescing) 키"""
+        return self.text
+
+
+def _normalize_units(match: "re.Match") -> str:
+    number, unit = match.group(1), match.group(2)
+    if "." in number:
+        number = number.rstrip("0").rstrip(".")
+    return f"{number}{UNIT_ALIASES[unit]}"
+
+
+def _extract_intents(text: str) -> Tuple[str, FrozenSet[str]]:
+    intents = set()
+
+    def _strip(match: "re.Match") -> str:
+        intents.add(INTENT_WORDS[match.group("ko") or match.group("en")])
+        return " "
+
+    return _INTENT_RE.sub(_strip, text), frozenset(intents)
+
+
+@lru_cache(maxsize=4096)
+def normalize_query(query: str) -> NormalizedQuery:
+    """검색 쿼리를 정규화된 표기와 의도 플래그로 변환"""
+    text = unicodedata.normalize("NFKC", query).casefold()
+    text = _PUNCT_RE.sub(" ", text)
+
+    text = _BRAND_RE.sub(lambda m: f" {BRAND_ALIASES[m.group(0)]} ", text)
+    text = _MODIFIER_RE.sub(lambda m: f" {MODIFIER_ALIASES[m.group(0)]} ", text)
+    text = _HANGUL_BOUNDARY_RE.sub(" ", text)
+    text = _WORD_NUMBER_RE.sub(r"\1 ", text)
+    text = _NUMBER_MODIFIER_RE.sub(lambda m: " " + " ".join(_LATIN_MODIFIER_RE.findall(m.group(1))), text)
+    text = _MODEL_HYPHEN_RE.sub(r"\1", text)
+    text = _UNIT_RE.sub(_normalize_units, text)
+
+    text, intents = _extract_intents(text)
+
+    tokens: List[str] = [
+        token for token in _WHITESPACE_RE.split(text)
+        if token and token not in FILLER_WORDS and token.strip("./+-")
+    ]
+    normalized = " ".join(tokens)
+
+    # 의도 단어만으로 이루어진 쿼리는 원문을 키로 유지
+    if not normalized:
+        normalized = _WHITESPACE_RE.sub(" ", unicodedata.normalize("NFKC", query).casefold()).strip()
+
+    return NormalizedQuery(original=query, text=normalized, intents=intents)
+
+
+def is_search_query(query: str) -> bool:
+    """일반 대화가 아닌 상품 검색 요청으로 보이는지 확인
+
+    의도 단어, 브랜드, 용량/크기 단위, 검색 요청 표현 중 하나라도 있으면 검색으로 봅니다.
+    """
+    normalized = normalize_query(query)
+    if normalized.intents:
+        return True
+    tokens = normalized.text.split()
+    if any(token in _BRAND_TOKENS or _UNIT_TOKEN_RE.match(token) for token in tokens):
+        return True
+    text = unicodedata.normalize("NFKC", query).casefold()
+    return any(word in text for word in SEARCH_REQUEST_WORDS)
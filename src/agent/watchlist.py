@@ -0,0 +1,348 @@
+"""
+찜 목록 가격 감시 엔진
+
+찜한 상품을 다음 확인 시각 기준 힙으로 스케줄링하고, 확인 시점이 된 상품들을
+쇼핑몰별로 묶어 한 번에 재조회합니다. 확인 주기는 가격 변동성과 찜한 사용자 수에
+따라 조정되며, 가격이 잘 변하지 않는 상품은 점점 드물게 확인합니다.
+"""
+import asyncio
+import heapq
+import itertools
+import math
+import time
+from collections import defaultdict, deque
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Deque, Dict, List, Optional, Set, Tuple
+
+# 쇼핑몰 이름과 상품 ID 목록을 받아 {상품 ID: 현재 가격}을 반환하는 비동기 함수
+PriceFetcher = Callable[[str, List[str]], Awaitable[Dict[str, float]]]
+AlertListener = Callable[["PriceAlert"], None]
+
+
+@dataclass
+class WatchConfig:
+    """감시 엔진 설정"""
+    MIN_INTERVAL: float = 5 * 60
+    BASE_INTERVAL: float = 60 * 60
+    MAX_INTERVAL: float = 24 * 60 * 60
+    # 가격 변동이 없을 때 주기를 늘리는 배율
+    BACKOFF_FACTOR: float = 1.5
+    # 변동성(평균 가격 변화율) 가중치
+    VOLATILITY_WEIGHT: float = 50.0
+    VOLATILITY_SMOOTHING: float = 0.3
+    # 쇼핑몰 1회 조회당 최대 상품 수
+    STORE_BATCH_SIZE: int = 100
+    # 쇼핑몰별 동시 조회 수
+    STORE_CONCURRENCY: int = 4
+    # 한 번의 실행에서 처리할 최대 상품 수
+    MAX_DUE_PER_RUN: int = 5000
+    MAX_ALERTS_PER_WATCHER: int = 100
+
+
+@dataclass
+class WatchedItem:
+    """감시 중인 상품"""
+    item_id: str
+    store: str
+    product_id: str
+    name: str
+    last_price: Optional[float]
+    watchers: Dict[str, Optional[float]] = field(default_factory=dict)
+    interval: float = 0.0
+    next_due: float = 0.0
+    volatility: float = 0.0
+    checks: int = 0
+
+
+@dataclass
+class PriceAlert:
+    """목표가 도달 알림"""
+    watcher_id: str
+    item_id: str
+    name: str
+    store: str
+    target_price: float
+    previous_price: Optional[float]
+    price: float
+    created_at: float
+
+    def to_dict(self) -> Dict:
+        return {
+            "watcher_id": self.watcher_id,
+            "item_id": self.item_id,
+            "name": self.name,
+            "store": self.store,
+            "target_price": self.target_price,
+            "previous_price": self.previous_price,
+            "price": self.price,
+            "created_at": self.created_at,
+        }
+
+
+def make_item_id(store: str, product_id: str) -> str:
+    """쇼핑몰과 상품 ID로 감시 항목 ID 생성"""
+    return f"{store}:{product_id}"
+
+
+class WatchEngine:
+    """찜 상품 가격 감시 엔진"""
+
+    def __init__(
+        self,
+        fetcher: PriceFetcher,
+        config: Optional[WatchConfig] = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.fetcher = fetcher
+        self.config = config or WatchConfig()
+        self.clock = clock
+        self.items: Dict[str, WatchedItem] = {}
+        # 사용자별 찜 항목 ID (찜 목록 조회 시 전체 항목을 훑지 않도록)
+        self._watcher_items: Dict[str, Set[str]] = defaultdict(set)
+        self._heap: List[Tuple[float, int, str]] = []
+        self._seq = itertools.count()
+        self._alerts: Dict[str, Deque[PriceAlert]] = defaultdict(
+            lambda: deque(maxlen=self.config.MAX_ALERTS_PER_WATCHER)
+        )
+        self._listeners: List[AlertListener] = []
+        # run_forever가 실행 중인 이벤트 루프에서 생성 (루프마다 새로 만듦)
+        self._wakeup: Optional[asyncio.Event] = None
+        self.store_calls = 0
+
+    def add_listener(self, listener: AlertListener) -> None:
+        """알림 발생 시 호출할 콜백 등록"""
+        self._listeners.append(listener)
+
+    def add_watch(
+        self,
+        watcher_id: str,
+        store: str,
+        product_id: str,
+        name: str = "",
+        price: Optional[float] = None,
+        target_price: Optional[float] = None,
+    ) -> WatchedItem:
+        """상품 찜 등록 (이미 감시 중인 상품이면 사용자만 추가)
+
+        알려진 가격이 이미 목표가 이하이면 등록 시점에 바로 알림을 발생시킵니다.
+        """
+        item_id = make_item_id(store, product_id)
+        item = self.items.get(item_id)
+        if item is None:
+            item = WatchedItem(
+                item_id=item_id,
+                store=store,
+                product_id=product_id,
+                name=name,
+                last_price=price,
+            )
+            self.items[item_id] = item
+            self._set_target(item, watcher_id, target_price)
+            # 현재 가격을 모르면 바로 조회
+            self._schedule(item, self._compute_interval(item) if price is not None else 0.0)
+            return item
+
+        self._set_target(item, watcher_id, target_price)
+        # 사용자가 늘어 주기가 짧아진 경우에만 앞당김
+        interval = self._compute_interval(item)
+        if self.clock() + interval < item.next_due:
+            self._schedule(item, interval)
+        return item
+
+    def _set_target(self, item: WatchedItem, watcher_id: str, target_price: Optional[float]) -> None:
+        # 이후 확인에서는 목표가를 새로 넘어설 때만 알림이 발생하므로 이미 도달한 경우는 여기서 알림
+        changed = watcher_id not in item.watchers or item.watchers[watcher_id] != target_price
+        item.watchers[watcher_id] = target_price
+        self._watcher_items[watcher_id].add(item.item_id)
+        price = item.last_price
+        if changed and target_price is not None and price is not None and price <= target_price:
+            self._emit_alert(item, watcher_id, target_price, None, price)
+
+    def remove_watch(self, watcher_id: str, item_id: str) -> bool:
+        """찜 해제 (마지막 사용자가 해제하면 감시 중단)"""
+        item = self.items.get(item_id)
+        if item is None or watcher_id not in item.watchers:
+            return False
+
+        del item.watchers[watcher_id]
+        watched = self._watcher_items[watcher_id]
+        watched.discard(item_id)
+        if not watched:
+            del self._watcher_items[watcher_id]
+        if not item.watchers:
+            # 힙의 항목은 꺼낼 때 무시됨 (lazy deletion)
+            del self.items[item_id]
+        return True
+
+    def get_watches(self, watcher_id: str) -> List[Dict]:
+        """사용자의 찜 목록 반환 (항목 ID순)"""
+        return [
+            {
+                "item_id": item.item_id,
+                "store": item.store,
+                "product_id": item.product_id,
+                "name": item.name,
+                "price": item.last_price,
+                "target_price": item.watchers[watcher_id],
+                "next_check_at": item.next_due,
+            }
+            for item in (self.items[item_id] for item_id in sorted(self._watcher_items.get(watcher_id, ())))
+        ]
+
+    def drain_alerts(self, watcher_id: str) -> List[PriceAlert]:
+        """사용자에게 쌓인 알림을 꺼내서 반환"""
+        alerts = self._alerts.pop(watcher_id, None)
+        return list(alerts) if alerts else []
+
+    def next_due(self) -> Optional[float]:
+        """가장 빠른 다음 확인 시각"""
+        while self._heap:
+            due, _, item_id = self._heap[0]
+            item = self.items.get(item_id)
+            if item is not None and item.next_due == due:
+                return due
+            heapq.heappop(self._heap)
+        return None
+
+    async def run_due(self) -> List[PriceAlert]:
+        """확인 시각이 된 상품들을 쇼핑몰별로 묶어 재조회"""
+        now = self.clock()
+        by_store: Dict[str, List[WatchedItem]] = defaultdict(list)
+        popped = 0
+
+        while self._heap and self._heap[0][0] <= now and popped < self.config.MAX_DUE_PER_RUN:
+            due, _, item_id = heapq.heappop(self._heap)
+            item = self.items.get(item_id)
+            if item is None or item.next_due != due:
+                continue
+            by_store[item.store].append(item)
+            popped += 1
+
+        batches = []
+        for store, items in by_store.items():
+            size = self.config.STORE_BATCH_SIZE
+            for start in range(0, len(items), size):
+                batches.append((store, items[start:start + size]))
+
+        # 실행 중인 루프에서 만들어야 하므로 실행마다 생성 (run_due는 한 번에 하나만 실행됨)
+        limits = {store: asyncio.Semaphore(self.config.STORE_CONCURRENCY) for store in by_store}
+
+        async def check(store: str, items: List[WatchedItem]) -> List[PriceAlert]:
+            async with limits[store]:
+                return await self._check_batch(store, items)
+
+        results = await asyncio.gather(*(check(store, items) for store, items in batches))
+        return [alert for alerts in results for alert in alerts]
+
+    async def run_forever(self, stop: asyncio.Event) -> None:
+        """중지 신호가 올 때까지 다음 확인 시각에 맞춰 반복 실행"""
+        self._wakeup = asyncio.Event()
+        while not stop.is_set():
+            await self.run_due()
+
+            due = self.next_due()
+            timeout = self.config.MAX_INTERVAL if due is None else max(due - self.clock(), 0.0)
+            self._wakeup.clear()
+            stop_task = asyncio.ensure_future(stop.wait())
+            wakeup_task = asyncio.ensure_future(self._wakeup.wait())
+            try:
+                await asyncio.wait(
+                    {stop_task, wakeup_task},
+                    timeout=timeout,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+            finally:
+                stop_task.cancel()
+                wakeup_task.cancel()
+
+    async def _check_batch(self, store: str, items: List[WatchedItem]) -> List[PriceAlert]:
+        self.store_calls += 1
+        try:
+            prices = await self.fetcher(store, [item.product_id for item in items])
+        except Exception:
+            # 조회 실패 시 가격 변화가 없는 것으로 보고 주기를 늘려 재시도
+            prices = {}
+
+        alerts: List[PriceAlert] = []
+        for item in items:
+            if item.item_id not in self.items:
+                continue
+            alerts.extend(self._apply_price(item, prices.get(item.product_id)))
+        return alerts
+
+    def _apply_price(self, item: WatchedItem, price: Optional[float]) -> List[PriceAlert]:
+        previous = item.last_price
+        item.checks += 1
+        changed = price is not None and previous is not None and price != previous
+
+        if previous is None:
+            interval = self._compute_interval(item)
+        elif changed:
+            change = abs(price - previous) / previous if previous else 1.0
+            alpha = self.config.VOLATILITY_SMOOTHING
+            item.volatility = alpha * change + (1 - alpha) * item.volatility
+            interval = self._compute_interval(item)
+        else:
+            item.volatility *= 1 - self.config.VOLATILITY_SMOOTHING
+            interval = min(
+                max(item.interval, self.config.MIN_INTERVAL) * self.config.BACKOFF_FACTOR,
+                self.config.MAX_INTERVAL,
+            )
+
+        alerts: List[PriceAlert] = []
+        if price is not None:
+            alerts = self._crossed_targets(item, previous, price)
+            item.last_price = price
+
+        self._schedule(item, interval)
+        return alerts
+
+    def _crossed_targets(
+        self, item: WatchedItem, previous: Optional[float], price: float
+    ) -> List[PriceAlert]:
+        alerts = []
+        for watcher_id, target in item.watchers.items():
+            if target is None or price > target:
+                continue
+            if previous is not None and previous <= target:
+                continue
+            alerts.append(self._emit_alert(item, watcher_id, target, previous, price))
+        return alerts
+
+    def _emit_alert(
+        self,
+        item: WatchedItem,
+        watcher_id: str,
+        target: float,
+        previous: Optional[float],
+        price: float,
+    ) -> PriceAlert:
+        alert = PriceAlert(
+            watcher_id=watcher_id,
+            item_id=item.item_id,
+            name=item.name,
+            store=item.store,
+            target_price=target,
+            previous_price=previous,
+            price=price,
+            created_at=self.clock(),
+        )
+        self._alerts[watcher_id].append(alert)
+        for listener in self._listeners:
+            listener(alert)
+        return alert
+
+    def _compute_interval(self, item: WatchedItem) -> float:
+        """변동성이 크고 찜한 사용자가 많을수록 짧은 주기"""
+        watchers = max(len(item.watchers), 1)
+        interval = self.config.BASE_INTERVAL / (
+            (1 + self.config.VOLATILITY_WEIGHT * item.volatility) * math.sqrt(watchers)
+        )
+        return min(max(interval, self.config.MIN_INTERVAL), self.config.MAX_INTERVAL)
+
+    def _schedule(self, item: WatchedItem, interval: float) -> None:
+        item.interval = interval
+        item.next_due = self.clock() + interval
+        heapq.heappush(self._heap, (item.next_due, next(self._seq), item.item_id))
+        if self._wakeup is not None:
+            self._wakeup.set()
@@ -0,0 +1,71 @@
+"""
+디버그 라우트 (트레이스·프로파일 조회)
+
+X-Debug-Token 헤더가 DEBUG_TOKEN 환경 변수와 일치해야 접근할 수 있으며, 토큰이
+설정되지 않은 서버에서는 디버그 기능(라우트, X-Profile, X-Trace-Sampled)을 쓸 수 없습니다.
+"""
+import hmac
+import os
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException
+from fastapi.responses import PlainTextResponse
+
+from src.api.routing import TracedRoute
+from src.telemetry.profiling import profile_store
+from src.telemetry.tracing import ring_buffer
+
+DEBUG_TOKEN_HEADER = "X-Debug-Token"
+
+
+def is_authorized(token: Optional[str]) -> bool:
+    """디버그 토큰 확인 (서버에 토큰이 설정되지 않았으면 항상 거부)"""
+    expected = os.getenv("DEBUG_TOKEN")
+    if not expected:
+        return False
+    return token is not None and hmac.compare_digest(token, expected)
+
+
+def require_debug_token(x_debug_token: Optional[str] = Header(None)) -> None:
+    if not is_authorized(x_debug_token):
+        raise HTTPException(status_code=403, detail="디버그 토큰이 올바르지 않습니다.")
+
+
+router = APIRouter(prefix="/debug", route_class=TracedRoute, dependencies=[Depends(require_debug_token)])
+
+@router.get("/traces")
+async def list_traces(limit: int = 50):
+    """최근 트레이스 요약 목록"""
+    return {
+        "traces": [
+            {
+                "trace_id": trace["trace_id"],
+                "name": trace["name"],
+                "start": trace["start"],
+                "duration_ms": trace["duration_ms"],
+                "span_count": len(trace["spans"]),
+            }
+            for trace in ring_buffer.traces()[:limit]
+        ]
+    }
+
+@router.get("/traces/{trace_id}")
+async def get_trace(trace_id: str):
+    """트레이스 상세 (전체 스팬)"""
+    trace = ring_buffer.get(trace_id)
+    if trace is None:
+        raise HTTPException(status_code=404, detail="트레이스를 찾을 수 없습니다.")
+    return trace
+
+@router.get("/profiles")
+async def list_profiles(limit: int = 50):
+    """최근 요청 프로파일 목록 (최신순)"""
+    return {"profiles": profile_store.list(limit)}
+
+@router.get("/profiles/{profile_id}", response_class=PlainTextResponse)
+async def get_profile(profile_id: str):
+    """요청 프로파일 (collapsed stack 텍스트, flamegraph.pl 입력 형식)"""
+    collapsed = profile_store.collapsed(profile_id)
+    if collapsed is None:
+        raise HTTPException(status_code=404, detail="프로파일을 찾을 수 없습니다.")
+    return collapsed
@@ -0,0 +1,35 @@
+"""
+내용 해시 기반 ETag 및 조건부 요청(If-None-Match) 처리
+"""
+import hashlib
+import json
+from typing import Any, Optional
+
+from fastapi import Request, Response
+
+
+def compute_etag(body: bytes) -> str:
+    """응답 본문의 강한(strong) ETag"""
+    return f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match 헤더 값이 ETag와 일치하는지 확인 (목록, *, 약한 비교 지원)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip() for tag in if_none_match.split(","))
+    return etag in (tag[2:] if tag.startswith("W/") else tag for tag in candidates)
+
+
+def conditional_json_response(request: Request, payload: Any) -> Response:
+    """ETag를 붙인 JSON 응답. 클라이언트가 같은 ETag를 보내면 본문 없이 304 응답"""
+    body = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode()
+    etag = compute_etag(body)
+    # 매번 재검증하도록 no-cache (저장은 허용)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -0,0 +1,373 @@
+"""
+상품 이미지 썸네일 프록시
+
+쇼핑몰 원본 이미지를 한 번만 받아 작은 썸네일로 재인코딩하고, 내용 해시 기반
+디스크 캐시에 저장합니다. 같은 이미지에 대한 동시 첫 요청은 하나의 다운로드로
+합쳐지며(single-flight), 응답에는 강한 ETag와 장기 캐시 헤더를 붙입니다.
+
+서버가 임의 URL을 대신 요청하므로(SSRF) 요청 전과 리다이렉트마다 호스트를 다시
+확인합니다. 호스트를 조회한 주소 중 하나라도 공인 주소가 아니면(루프백, 사설망,
+링크 로컬 등) 거부하며, IMAGE_PROXY_ALLOWED_HOSTS가 설정되어 있으면 해당 도메인과
+그 하위 도메인만 허용합니다. 연결 시점에 DNS 응답이 바뀌는 경우(DNS rebinding)에
+대비해 응답 본문을 읽기 전에 실제로 연결된 서버 주소도 다시 확인합니다.
+"""
+import asyncio
+import hashlib
+import io
+import ipaddress
+import os
+import socket
+from pathlib import Path
+from typing import TYPE_CHECKING, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import urlparse
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+
+from src.api.etag import etag_matches
+from src.api.routing import TracedRoute
+from src.telemetry.metrics import record_cache
+
+# httpx와 Pillow는 첫 요청(또는 백그라운드 예열) 시점에 임포트해 서버 기동 시간을 줄임
+if TYPE_CHECKING:
+    import httpx
+
+THUMBNAIL_FORMAT = "WEBP"
+THUMBNAIL_MEDIA_TYPE = "image/webp"
+CACHE_CONTROL = "public, max-age=31536000, immutable"
+# 원본 이미지 최대 픽셀 수 (작게 압축된 초대형 이미지가 디코딩 시 메모리를 소모하는 것 방지)
+MAX_SOURCE_PIXELS = 25_000_000
+
+
+class ImageFetchError(Exception):
+    """원본 이미지를 가져오거나 변환하지 못한 경우"""
+
+
+class BlockedImageURLError(ImageFetchError):
+    """허용되지 않은 URL (스킴, 허용 목록 밖의 호스트, 내부 주소)"""
+
+
+# 호스트 이름을 IP 주소 목록으로 변환하는 비동기 함수
+Resolver = Callable[[str], Awaitable[List[str]]]
+
+
+async def resolve_host(host: str) -> List[str]:
+    infos = await asyncio.get_running_loop().getaddrinfo(host, None, type=socket.SOCK_STREAM)
+    return [info[4][0] for info in infos]
+
+
+def is_public_address(address: str) -> bool:
+    """공인 인터넷 주소인지 확인 (IPv4 매핑 IPv6 주소는 IPv4로 판단)"""
+    ip = ipaddress.ip_address(address.split("%", 1)[0])
+    if isinstance(ip, ipaddress.IPv6Address) and ip.ipv4_mapped is not None:
+        ip = ip.ipv4_mapped
+    return ip.is_global and not ip.is_multicast
+
+
+def _is_ip_literal(host: str) -> bool:
+    try:
+        ipaddress.ip_address(host.split("%", 1)[0])
+    except ValueError:
+        return False
+    return True
+
+
+def parse_allowed_hosts(value: Optional[str]) -> Optional[List[str]]:
+    """쉼표로 구분된 허용 도메인 목록 (비어 있으면 None: 공인 주소면 모두 허용)"""
+    hosts = [host.strip().lower().rstrip(".") for host in (value or "").split(",") if host.strip()]
+    return hosts or None
+
+
+class ThumbnailCache:
+    """내용 해시 기반 썸네일 디스크 캐시 (용량 초과 시 오래 안 쓴 순으로 삭제)"""
+
+    def __init__(self, root: str, max_bytes: int):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.objects_dir = self.root / "objects"
+        self.refs_dir = self.root / "refs"
+        self.objects_dir.mkdir(parents=True, exist_ok=True)
+        self.refs_dir.mkdir(parents=True, exist_ok=True)
+        self._total_bytes = sum(p.stat().st_size for p in self.objects_dir.glob("*"))
+
+    def _object_path(self, digest: str) -> Path:
+        return self.objects_dir / digest
+
+    def _ref_path(self, key: str) -> Path:
+        return self.refs_dir / hashlib.sha256(key.encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[Tuple[str, bytes]]:
+        """캐시 키로 (내용 해시, 썸네일 바이트) 조회"""
+        ref = self._ref_path(key)
+        try:
+            digest = ref.read_text()
+            path = self._object_path(digest)
+            data = path.read_bytes()
+        except FileNotFoundError:
+            return None
+        # 최근 사용 시각 갱신 (LRU 삭제 기준)
+        os.utime(path)
+        return digest, data
+
+    def put(self, key: str, data: bytes) -> str:
+        """썸네일 저장 후 내용 해시 반환"""
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._object_path(digest)
+        if not path.exists():
+            tmp = path.with_suffix(".tmp")
+            tmp.write_bytes(data)
+            os.replace(tmp, path)
+            self._total_bytes += len(data)
+
+        ref = self._ref_path(key)
+        tmp_ref = ref.with_suffix(".tmp")
+        tmp_ref.write_text(digest)
+        os.replace(tmp_ref, ref)
+
+        if self._total_bytes > self.max_bytes:
+            self._evict(keep=digest)
+        return digest
+
+    def _evict(self, keep: str) -> None:
+        # 용량의 90%까지 줄여 매 요청마다 삭제가 일어나지 않도록 함
+        target = int(self.max_bytes * 0.9)
+        entries = []
+        for path in self.objects_dir.glob("*"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        for _, size, path in sorted(entries):
+            if self._total_bytes <= target:
+                break
+            if path.name == keep:
+                continue
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                continue
+            # 삭제된 객체를 가리키는 참조는 조회 시 캐시 미스로 처리됨
+            self._total_bytes -= size
+
+
+class _SharedFetch:
+    """같은 썸네일을 기다리는 요청들이 공유하는 다운로드/변환 태스크"""
+
+    def __init__(self):
+        self.task: Optional[asyncio.Task] = None
+        self.waiters = 0
+
+
+class ImageProxy:
+    """이미지 썸네일 프록시"""
+
+    def __init__(
+        self,
+        cache_dir: str,
+        max_cache_bytes: int = 512 * 1024 * 1024,
+        max_source_bytes: int = 10 * 1024 * 1024,
+        max_source_pixels: int = MAX_SOURCE_PIXELS,
+        timeout: float = 10.0,
+        transport: Optional["httpx.AsyncBaseTransport"] = None,
+        allowed_hosts: Optional[Sequence[str]] = None,
+        resolver: Resolver = resolve_host,
+        max_redirects: int = 3,
+    ):
+        self.cache_dir = cache_dir
+        self.max_cache_bytes = max_cache_bytes
+        self._cache: Optional[ThumbnailCache] = None
+        self.max_source_bytes = max_source_bytes
+        self.max_source_pixels = max_source_pixels
+        self.timeout = timeout
+        self.transport = transport
+        self.allowed_hosts = list(allowed_hosts) if allowed_hosts else None
+        self.resolver = resolver
+        self.max_redirects = max_redirects
+        self._client: Optional["httpx.AsyncClient"] = None
+        self._inflight: Dict[str, _SharedFetch] = {}
+        self.fetch_count = 0
+
+    @property
+    def cache(self) -> ThumbnailCache:
+        # 디렉터리 생성은 첫 요청 시점까지 미룸
+        if self._cache is None:
+            self._cache = ThumbnailCache(self.cache_dir, self.max_cache_bytes)
+        return self._cache
+
+    def warmup(self) -> None:
+        """지연 임포트 대상 모듈과 이미지 코덱 미리 로드"""
+        import httpx  # noqa: F401
+        from PIL import Image
+
+        Image.init()
+
+    def _get_client(self) -> "httpx.AsyncClient":
+        if self._client is None:
+            import httpx
+
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                # 리다이렉트 대상도 검사해야 하므로 _fetch에서 직접 따라감
+                follow_redirects=False,
+                # 환경 변수 프록시를 거치면 연결된 서버 주소로 대상을 확인할 수 없음
+                trust_env=False,
+                transport=self.transport,
+            )
+        return self._client
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def get_thumbnail(self, url: str, size: int) -> Tuple[str, bytes]:
+        """썸네일 (내용 해시, 바이트) 반환. 없으면 원본을 받아 생성"""
+        key = f"{size}:{url}"
+        cached = self.cache.get(key)
+        record_cache("thumbnail", cached is not None)
+        if cached is not None:
+            return cached
+
+        # 다운로드/변환은 별도 태스크에서 실행하고 요청들은 이를 함께 기다림
+        # (한 요청이 취소되어도 다른 요청은 계속 기다리며, 모두 취소되면 중단)
+        shared = self._inflight.get(key)
+        if shared is None:
+            shared = self._inflight[key] = _SharedFetch()
+            shared.task = asyncio.create_task(self._make_thumbnail(key, shared, url, size))
+
+        shared.waiters += 1
+        try:
+            return await asyncio.shield(shared.task)
+        finally:
+            shared.waiters -= 1
+            if shared.waiters == 0 and not shared.task.done():
+                self._inflight.pop(key, None)
+                shared.task.cancel()
+
+    async def _make_thumbnail(self, key: str, shared: "_SharedFetch", url: str, size: int) -> Tuple[str, bytes]:
+        try:
+            source = await self._fetch(url)
+            thumbnail = await asyncio.to_thread(make_thumbnail, source, size, self.max_source_pixels)
+            return self.cache.put(key, thumbnail), thumbnail
+        finally:
+            if self._inflight.get(key) is shared:
+                del self._inflight[key]
+
+    async def check_url(self, url: str) -> None:
+        """프록시가 요청해도 되는 URL인지 확인 (아니면 BlockedImageURLError)"""
+        parsed = urlparse(url)
+        if parsed.scheme not in ("http", "https"):
+            raise BlockedImageURLError("http(s) 이미지 URL만 지원합니다.")
+        host = (parsed.hostname or "").rstrip(".")
+        if not host:
+            raise BlockedImageURLError("이미지 URL에 호스트가 없습니다.")
+        if self.allowed_hosts is not None and not any(
+            host == allowed or host.endswith("." + allowed) for allowed in self.allowed_hosts
+        ):
+            raise BlockedImageURLError("허용되지 않은 이미지 호스트입니다.")
+
+        try:
+            addresses = [host] if _is_ip_literal(host) else await self.resolver(host)
+        except (OSError, UnicodeError) as e:
+            raise ImageFetchError(f"이미지 호스트를 찾을 수 없습니다: {host}") from e
+        if not addresses or not all(is_public_address(address) for address in addresses):
+            raise BlockedImageURLError("내부 주소의 이미지는 가져올 수 없습니다.")
+
+    async def _fetch(self, url: str) -> bytes:
+        import httpx
+
+        self.fetch_count += 1
+        try:
+            for _ in range(self.max_redirects + 1):
+                await self.check_url(url)
+                async with self._get_client().stream("GET", url) as response:
+                    self._check_peer(response)
+                    if response.is_redirect:
+                        url = str(response.url.join(response.headers["location"]))
+                        continue
+                    response.raise_for_status()
+                    return await self._read_body(response)
+        except httpx.HTTPError as e:
+            raise ImageFetchError(f"원본 이미지를 가져오지 못했습니다: {e}") from e
+        raise ImageFetchError("리다이렉트가 너무 많습니다.")
+
+    def _check_peer(self, response: "httpx.Response") -> None:
+        """실제로 연결된 서버 주소 확인 (사전 확인 후 DNS 응답이 바뀐 경우 차단)"""
+        stream = response.extensions.get("network_stream")
+        if stream is None:
+            # 주입한 transport(테스트용 MockTransport 등)는 네트워크 연결이 없을 수 있음
+            if self.transport is None:
+                raise BlockedImageURLError("연결된 서버 주소를 확인할 수 없습니다.")
+            return
+        server_addr = stream.get_extra_info("server_addr")
+        if not server_addr or not is_public_address(server_addr[0]):
+            raise BlockedImageURLError("내부 주소의 이미지는 가져올 수 없습니다.")
+
+    async def _read_body(self, response: "httpx.Response") -> bytes:
+        chunks = []
+        total = 0
+        async for chunk in response.aiter_bytes():
+            total += len(chunk)
+            if total > self.max_source_bytes:
+                raise ImageFetchError("원본 이미지가 너무 큽니다.")
+            chunks.append(chunk)
+        return b"".join(chunks)
+
+
+def make_thumbnail(data: bytes, size: int, max_pixels: int = MAX_SOURCE_PIXELS) -> bytes:
+    """원본 이미지를 size×size 이내 썸네일로 재인코딩 (max_pixels 초과 이미지는 디코딩하지 않음)"""
+    from PIL import Image, UnidentifiedImageError
+
+    try:
+        with Image.open(io.BytesIO(data)) as image:
+            # Image.open은 헤더만 읽으므로 여기서 거부하면 픽셀 데이터를 디코딩하지 않음
+            width, height = image.size
+            if width * height > max_pixels:
+                raise ImageFetchError("원본 이미지 해상도가 너무 큽니다.")
+            image.thumbnail((size, size))
+            if image.mode not in ("RGB", "RGBA"):
+                image = image.convert("RGBA" if "transparency" in image.info else "RGB")
+            output = io.BytesIO()
+            image.save(output, format=THUMBNAIL_FORMAT, quality=80, method=4)
+    except Image.DecompressionBombError as e:
+        raise ImageFetchError("원본 이미지 해상도가 너무 큽니다.") from e
+    except (UnidentifiedImageError, OSError) as e:
+        raise ImageFetchError("이미지 형식을 인식할 수 없습니다.") from e
+    return output.getvalue()
+
+
+image_proxy = ImageProxy(
+    cache_dir=os.getenv("IMAGE_CACHE_DIR", ".cache/images"),
+    max_cache_bytes=int(os.getenv("IMAGE_CACHE_MAX_BYTES", str(512 * 1024 * 1024))),
+    allowed_hosts=parse_allowed_hosts(os.getenv("IMAGE_PROXY_ALLOWED_HOSTS")),
+)
+
+def get_image_proxy() -> ImageProxy:
+    return image_proxy
+
+router = APIRouter(route_class=TracedRoute)
+
+@router.get("/images/thumbnail")
+async def get_thumbnail(
+    request: Request,
+    url: str = Query(..., description="원본 이미지 URL"),
+    size: int = Query(100, ge=16, le=512, description="썸네일 최대 변 길이(px)"),
+    proxy: ImageProxy = Depends(get_image_proxy),
+):
+    """상품 이미지 썸네일"""
+    if urlparse(url).scheme not in ("http", "https"):
+        raise HTTPException(status_code=400, detail="http(s) 이미지 URL만 지원합니다.")
+
+    try:
+        digest, data = await proxy.get_thumbnail(url, size)
+    except BlockedImageURLError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except ImageFetchError as e:
+        raise HTTPException(status_code=502, detail=str(e))
+
+    etag = f'"{digest}"'
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=data, media_type=THUMBNAIL_MEDIA_TYPE, headers=headers)
@@ -0,0 +1,253 @@
+"""
+비동기 검색 작업(Job)
+
+오래 걸리는 검색을 이벤트 루프를 막지 않고 실행합니다. 쇼핑몰 조회(I/O)는
+asyncio에서, 중복 제거·랭킹(CPU)은 관리되는 프로세스 풀에서 실행하며,
+클라이언트는 작업 ID로 진행률과 중간 결과를 폴링합니다.
+"""
+import asyncio
+import os
+import time
+import uuid
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, Callable, Dict, List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException
+from pydantic import BaseModel
+
+from src.agent.core import PriceFinderAgent
+from src.api.routing import TracedRoute
+from src.telemetry.tracing import Span, start_span, use_span
+
+
+class JobStatus(str, Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+FINISHED_STATUSES = {JobStatus.COMPLETED, JobStatus.FAILED, JobStatus.CANCELLED}
+
+
+class JobQueueFull(Exception):
+    """대기/실행 중인 작업 수가 한도에 도달한 경우"""
+
+
+@dataclass
+class SearchJob:
+    """검색 작업 상태"""
+    job_id: str
+    query: str
+    session_id: str
+    status: JobStatus = JobStatus.PENDING
+    stage: str = "queued"
+    progress: float = 0.0
+    partial_products: List[Dict[str, Any]] = field(default_factory=list)
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    created_at: float = field(default_factory=time.time)
+    finished_at: Optional[float] = None
+    task: Optional[asyncio.Task] = None
+    span: Optional[Span] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.job_id,
+            "query": self.query,
+            "session_id": self.session_id,
+            "status": self.status.value,
+            "stage": self.stage,
+            "progress": round(self.progress, 3),
+            "partial_products": self.partial_products,
+            "result": self.result,
+            "error": self.error,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+        }
+
+
+def default_executor_factory() -> Executor:
+    """CPU 단계용 프로세스 풀"""
+    workers = int(os.getenv("SEARCH_JOB_WORKERS", str(min(4, os.cpu_count() or 1))))
+    return ProcessPoolExecutor(max_workers=workers)
+
+
+class JobManager:
+    """검색 작업 관리자 (대기열 한도, 동시 실행 수 제한, 취소, 결과 TTL)"""
+
+    def __init__(
+        self,
+        agent: PriceFinderAgent,
+        max_pending: int = 100,
+        max_concurrent: int = 4,
+        result_ttl: float = 600.0,
+        executor_factory: Callable[[], Executor] = default_executor_factory,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.agent = agent
+        self.max_pending = max_pending
+        self.max_concurrent = max_concurrent
+        self.result_ttl = result_ttl
+        self.executor_factory = executor_factory
+        self.clock = clock
+        self.jobs: Dict[str, SearchJob] = {}
+        self._executor: Optional[Executor] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    @property
+    def executor(self) -> Executor:
+        # 프로세스 풀은 첫 작업 시점에 생성
+        if self._executor is None:
+            self._executor = self.executor_factory()
+        return self._executor
+
+    def active_count(self) -> int:
+        return sum(1 for job in self.jobs.values() if job.status not in FINISHED_STATUSES)
+
+    def submit(self, query: str, session_id: str) -> SearchJob:
+        """작업 등록 후 즉시 반환"""
+        self.purge_expired()
+        if self.active_count() >= self.max_pending:
+            raise JobQueueFull()
+
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrent)
+
+        job = SearchJob(job_id=uuid.uuid4().hex, query=query, session_id=session_id, created_at=self.clock())
+        self.jobs[job.job_id] = job
+        # 작업이 끝날 때까지 요청 트레이스가 열려 있도록 스팬을 여기서 시작
+        job.span = start_span("search_job", job_id=job.job_id)
+        job.task = asyncio.create_task(self._run(job), name=f"search_job:{job.job_id}")
+        return job
+
+    def get(self, job_id: str) -> Optional[SearchJob]:
+        self.purge_expired()
+        return self.jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> bool:
+        """작업 취소 (프로세스 풀에서 이미 실행 중인 CPU 단계 결과는 버려짐)"""
+        job = self.jobs.get(job_id)
+        if job is None or job.status in FINISHED_STATUSES:
+            return False
+        if job.task is not None:
+            job.task.cancel()
+        self._finish(job, JobStatus.CANCELLED)
+        return True
+
+    def purge_expired(self) -> None:
+        """결과 보관 시간이 지난 작업 삭제"""
+        deadline = self.clock() - self.result_ttl
+        expired = [
+            job_id for job_id, job in self.jobs.items()
+            if job.finished_at is not None and job.finished_at <= deadline
+        ]
+        for job_id in expired:
+            del self.jobs[job_id]
+
+    async def shutdown(self) -> None:
+        for job in list(self.jobs.values()):
+            if job.status not in FINISHED_STATUSES:
+                self.cancel(job.job_id)
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        self._semaphore = None
+
+    async def _run(self, job: SearchJob) -> None:
+        def on_progress(stage: str, progress: float, partial: List[Dict[str, Any]]) -> None:
+            job.stage = stage
+            job.progress = progress
+            if partial:
+                job.partial_products = partial
+
+        use_span(job.span)
+        try:
+            async with self._semaphore:
+                if job.status is JobStatus.CANCELLED:
+                    return
+                job.status = JobStatus.RUNNING
+                job.stage = "search"
+                result = await self.agent.search_products(
+                    job.query, progress=on_progress, executor=self.executor
+                )
+        except asyncio.CancelledError:
+            self._finish(job, JobStatus.CANCELLED)
+            return
+        except Exception as e:
+            job.error = str(e)
+            self._finish(job, JobStatus.FAILED)
+            return
+
+        job.result = result
+        job.progress = 1.0
+        job.stage = "done"
+        job.partial_products = []
+        self._finish(job, JobStatus.COMPLETED)
+
+    def _finish(self, job: SearchJob, status: JobStatus) -> None:
+        if job.status in FINISHED_STATUSES:
+            return
+        job.status = status
+        job.finished_at = self.clock()
+        job.task = None
+        if job.span is not None:
+            job.span.attributes["status"] = status.value
+            job.span.end()
+
+
+class SearchJobRequest(BaseModel):
+    """검색 작업 등록 요청"""
+    query: str
+    session_id: str = ""
+
+
+job_manager: Optional[JobManager] = None
+
+def init_job_manager(agent: PriceFinderAgent) -> JobManager:
+    """앱에서 사용할 작업 관리자 생성"""
+    global job_manager
+    job_manager = JobManager(
+        agent,
+        max_pending=int(os.getenv("SEARCH_JOB_MAX_PENDING", "100")),
+        max_concurrent=int(os.getenv("SEARCH_JOB_MAX_CONCURRENT", "4")),
+        result_ttl=float(os.getenv("SEARCH_JOB_RESULT_TTL", "600")),
+    )
+    return job_manager
+
+def get_job_manager() -> JobManager:
+    if job_manager is None:
+        raise HTTPException(status_code=503, detail="검색 작업 기능이 초기화되지 않았습니다.")
+    return job_manager
+
+router = APIRouter(route_class=TracedRoute)
+
+@router.post("/search/jobs", status_code=202)
+async def submit_search_job(
+    request: SearchJobRequest,
+    manager: JobManager = Depends(get_job_manager),
+):
+    """검색 작업 등록"""
+    try:
+        job = manager.submit(request.query, request.session_id)
+    except JobQueueFull:
+        raise HTTPException(status_code=429, detail="검색 작업이 너무 많습니다. 잠시 후 다시 시도해주세요.")
+    return {"job_id": job.job_id, "status": job.status.value}
+
+@router.get("/search/jobs/{job_id}")
+async def get_search_job(job_id: str, manager: JobManager = Depends(get_job_manager)):
+    """검색 작업 상태/진행률/결과 조회"""
+    job = manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다.")
+    return job.to_dict()
+
+@router.delete("/search/jobs/{job_id}")
+async def cancel_search_job(job_id: str, manager: JobManager = Depends(get_job_manager)):
+    """검색 작업 취소"""
+    if not manager.cancel(job_id):
+        raise HTTPException(status_code=404, detail="취소할 수 있는 작업이 없습니다.")
+    return {"job_id": job_id, "status": JobStatus.CANCELLED.value}
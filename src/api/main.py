@@ -1,11 +1,96 @@
-from fastapi import FastAPI
+import asyncio
+import os
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
+from src.agent.core import PriceFinderAgent
+from src.agent.llm import default_llm
+from src.agent.query_normalizer import normalize_query
+from src.agent.watchlist import WatchEngine
+from src.api.models import ChatRequest, WatchRequest
+from src.api.etag import conditional_json_response
+from src.api.image_proxy import image_proxy, router as image_router
+from src.api.jobs import init_job_manager, router as jobs_router
+from src.api.debug import is_authorized, router as debug_router
+from src.api.routing import TracedRoute
+from src.telemetry.metrics import (
+    EVENT_LOOP_LAG, REGISTRY, MetricsMiddleware, monitor_event_loop_lag, register_cache_stats
+)
+from src.telemetry.profiling import ProfilingMiddleware, profiling_enabled
+from src.telemetry.recording import TrafficRecorder
+from src.telemetry.tracing import TracingMiddleware
+
+# 이벤트 루프 지연이 이 값을 넘으면 준비되지 않은 것으로 판단
+MAX_READY_EVENT_LOOP_LAG = 1.0
+# 쇼핑몰 연결 상태 확인 주기 (초)
+STORE_PROBE_INTERVAL = float(os.getenv("STORE_PROBE_INTERVAL", "30"))
+# 예열 실패 시 재시도 간격 (초, 마지막 값으로 계속 재시도)
+WARMUP_RETRY_DELAYS = (1.0, 2.0, 5.0, 10.0, 30.0)
+
+agent = PriceFinderAgent(llm=default_llm())
+watch_engine = WatchEngine(agent.fetch_prices)
+job_manager = init_job_manager(agent)
+
+register_cache_stats(
+    "normalizer", lambda: (normalize_query.cache_info().hits, normalize_query.cache_info().misses)
+)
+
+def _warmup_blocking() -> None:
+    agent.warmup_cache()
+    image_proxy.warmup()
+
+async def warmup(app: FastAPI) -> None:
+    """무거운 임포트와 캐시 예열 (서버가 /health에 응답하기 시작한 뒤 스레드에서 실행)
+    
+    필수 예열은 성공할 때까지 간격을 늘려 가며 재시도합니다. LLM 예열 실패는 준비
+    상태를 막지 않고 degraded로 보고하며, 첫 채팅 요청에서 다시 초기화를 시도합니다.
+    """
+    attempt = 0
+    while True:
+        try:
+            await asyncio.to_thread(_warmup_blocking)
+            break
+        except Exception as e:
+            app.state.warmup_error = repr(e)
+        await asyncio.sleep(WARMUP_RETRY_DELAYS[min(attempt, len(WARMUP_RETRY_DELAYS) - 1)])
+        attempt += 1
+    app.state.warmup_error = None
+    app.state.warm = True
+    
+    try:
+        await asyncio.to_thread(agent.warmup_llm)
+    except Exception as e:
+        app.state.llm_error = repr(e)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    app.state.warm = False
+    app.state.warmup_error = None
+    app.state.llm_error = None
+    # 예열이 끝날 때까지 /health는 503이므로 로드 밸런서가 트래픽을 보내지 않음
+    warmup_task = asyncio.create_task(warmup(app))
+    
+    stop = asyncio.Event()
+    # 찜 상품 가격 감시 스케줄러
+    watch_task = asyncio.create_task(watch_engine.run_forever(stop))
+    lag_task = asyncio.create_task(monitor_event_loop_lag(stop))
+    # 쇼핑몰 연결 상태 (준비 상태 확인용, 최근 실제 조회가 없는 쇼핑몰만 확인)
+    stores_task = asyncio.create_task(agent.monitor_stores(stop, STORE_PROBE_INTERVAL))
+    yield
+    stop.set()
+    warmup_task.cancel()
+    await asyncio.gather(watch_task, lag_task, stores_task)
+    await image_proxy.close()
+    await job_manager.shutdown()
 
 app = FastAPI(
     title="PriceFinder Agent API",
     description="최저가 쇼핑 Agent API",
-    version="0.1.0"
+    version="0.1.0",
+    lifespan=lifespan
 )
+app.router.route_class = TracedRoute
 
 app.add_middleware(
     CORSMiddleware,
@@ -15,14 +100,151 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+app.add_middleware(MetricsMiddleware)
+# 프로파일링이 켜져 있을 때만 등록 (꺼져 있으면 요청 경로에 오버헤드 없음)
+if profiling_enabled():
+    app.add_middleware(ProfilingMiddleware, authorize=is_authorized)
+# 트래픽 기록 (재생 기반 성능 회귀 테스트용, TRAFFIC_RECORD_PATH 설정 시에만)
+if os.getenv("TRAFFIC_RECORD_PATH"):
+    app.add_middleware(TrafficRecorder, path=os.environ["TRAFFIC_RECORD_PATH"])
+# 마지막에 추가한 미들웨어가 가장 바깥에서 실행되므로 트레이싱은 맨 마지막에 추가
+app.add_middleware(TracingMiddleware, authorize=is_authorized)
+
+app.include_router(image_router)
+app.include_router(jobs_router)
+app.include_router(debug_router)
+
 @app.get("/")
 async def root():
     return {"message": "PriceFinder Agent API"}
 
+def _writable(path: str) -> bool:
+    """경로(또는 생성될 경로의 가장 가까운 상위 디렉터리)에 쓰기 가능한지 확인"""
+    path = os.path.abspath(path)
+    while not os.path.exists(path):
+        parent = os.path.dirname(path)
+        if parent == path:
+            return False
+        path = parent
+    return os.access(path, os.W_OK)
+
+def _warmup_check() -> dict:
+    check = {"ok": getattr(app.state, "warm", False)}
+    error = getattr(app.state, "warmup_error", None)
+    if error:
+        check["error"] = error
+    return check
+
+def _llm_check() -> dict:
+    # LLM 없이도 검색은 동작하므로 실패해도 준비 상태는 유지 (degraded로만 보고)
+    check = {"ok": True, "configured": agent.llm is not None}
+    error = getattr(app.state, "llm_error", None)
+    if error:
+        check["degraded"] = True
+        check["error"] = error
+    return check
+
+def _stores_check() -> dict:
+    # 쇼핑몰 일부가 실패해도 나머지 결과로 검색할 수 있으므로 모두 실패한 경우만 준비 안 됨
+    # (아직 확인하지 않은 쇼핑몰은 실패로 간주)
+    stores = {
+        store.name: agent.store_status.get(store.name, {"ok": False, "error": "not checked yet"})
+        for store in agent.stores
+    }
+    check = {
+        "ok": not stores or any(status["ok"] for status in stores.values()),
+        "configured": len(stores),
+        "stores": {
+            name: {key: value for key, value in status.items() if key != "checked_at"}
+            for name, status in stores.items()
+        },
+    }
+    if not all(status["ok"] for status in stores.values()):
+        check["degraded"] = True
+    return check
+
+def readiness_checks() -> dict:
+    """의존성별 준비 상태"""
+    lag = EVENT_LOOP_LAG.get()
+    active_jobs = job_manager.active_count()
+    return {
+        "warmup": _warmup_check(),
+        "llm": _llm_check(),
+        "event_loop": {"ok": lag < MAX_READY_EVENT_LOOP_LAG, "lag_seconds": round(lag, 4)},
+        "search_jobs": {"ok": active_jobs < job_manager.max_pending, "active": active_jobs},
+        "image_cache": {"ok": _writable(image_proxy.cache_dir)},
+        "stores": _stores_check(),
+    }
+
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy"}
+    """준비 상태 확인 (하나라도 실패하면 503)"""
+    checks = readiness_checks()
+    ready = all(check["ok"] for check in checks.values())
+    if not ready:
+        status = "unhealthy"
+    elif any(check.get("degraded") for check in checks.values()):
+        status = "degraded"
+    else:
+        status = "healthy"
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={"status": status, "checks": checks}
+    )
+
+@app.get("/metrics")
+async def metrics():
+    """Prometheus 텍스트 형식 메트릭"""
+    return Response(REGISTRY.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+@app.post("/chat")
+async def chat(request: ChatRequest):
+    """Agent와 대화"""
+    return await agent.process_message(request.message, request.session_id)
+
+@app.get("/chat/history/{session_id}")
+async def get_chat_history(request: Request, session_id: str):
+    """세션 대화 기록 조회 (ETag 조건부 요청 지원)"""
+    return conditional_json_response(request, {
+        "session_id": session_id,
+        "messages": agent.get_history(session_id)
+    })
+
+@app.get("/search")
+async def search(request: Request, query: str):
+    """상품 검색 (ETag 조건부 요청 지원)"""
+    return conditional_json_response(request, await agent.search_products(query))
+
+@app.post("/watch")
+async def add_watch(request: WatchRequest):
+    """상품 찜 등록"""
+    item = watch_engine.add_watch(
+        watcher_id=request.session_id,
+        store=request.store,
+        product_id=request.product_id,
+        name=request.name,
+        price=request.price,
+        target_price=request.target_price,
+    )
+    return {"item_id": item.item_id, "next_check_at": item.next_due}
+
+@app.get("/watch/{session_id}")
+async def list_watches(session_id: str):
+    """찜 목록 조회"""
+    return {"items": watch_engine.get_watches(session_id)}
+
+@app.delete("/watch/{session_id}/{item_id}")
+async def remove_watch(session_id: str, item_id: str):
+    """찜 해제"""
+    if not watch_engine.remove_watch(session_id, item_id):
+        raise HTTPException(status_code=404, detail="찜 목록에 없는 상품입니다.")
+    return {"item_id": item_id}
+
+@app.get("/watch/{session_id}/alerts")
+async def get_watch_alerts(session_id: str):
+    """목표가 도달 알림 조회 (조회한 알림은 삭제)"""
+    return {"alerts": [alert.to_dict() for alert in watch_engine.drain_alerts(session_id)]}
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000) 
\ No newline at end of file
+    uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -0,0 +1,16 @@
+from typing import Optional
+from pydantic import BaseModel
+
+class ChatRequest(BaseModel):
+    """채팅 요청"""
+    message: str
+    session_id: str
+
+class WatchRequest(BaseModel):
+    """찜 등록 요청"""
+    session_id: str
+    store: str
+    product_id: str
+    name: str = ""
+    price: Optional[float] = None
+    target_price: Optional[float] = None
@@ -0,0 +1,16 @@
+from fastapi import Request
+from fastapi.routing import APIRoute
+from src.telemetry.tracing import span
+
+class TracedRoute(APIRoute):
+    """라우트 핸들러 실행 구간을 스팬으로 기록하는 APIRoute"""
+    
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+        name = f"handler {self.path}"
+        
+        async def traced_handler(request: Request):
+            with span(name):
+                return await handler(request)
+        
+        return traced_handler
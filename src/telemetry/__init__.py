@@ -0,0 +1 @@
+# 관측(메트릭/트레이싱) 패키지
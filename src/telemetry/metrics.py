@@ -0,0 +1,353 @@
+"""
+저오버헤드 메트릭 수집 및 Prometheus 텍스트 노출
+
+카운터와 히스토그램은 스레드별 샤드에 락 없이 기록하고, 스크레이프 시점에만
+샤드를 합칩니다. 게이지는 값을 직접 설정하거나 스크레이프 시 호출되는 함수로
+정의합니다.
+"""
+import asyncio
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from src.telemetry.tracing import span
+
+LabelValues = Tuple[str, ...]
+
+DEFAULT_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(str(value))}"' for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Sharded:
+    """스레드별 샤드 저장소 (기록은 락 없이, 샤드 등록 시에만 락 사용)"""
+
+    def __init__(self):
+        self._local = threading.local()
+        self._shards: List[dict] = []
+        self._lock = threading.Lock()
+
+    def _shard(self) -> dict:
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = {}
+            self._local.shard = shard
+            with self._lock:
+                self._shards.append(shard)
+        return shard
+
+    def _snapshot(self) -> List[dict]:
+        with self._lock:
+            shards = list(self._shards)
+        snapshot = []
+        for shard in shards:
+            # 다른 스레드가 새 라벨을 추가하는 중이면 다시 복사
+            while True:
+                try:
+                    snapshot.append(dict(shard))
+                    break
+                except RuntimeError:
+                    continue
+        return snapshot
+
+
+class Counter(_Sharded):
+    """단조 증가 카운터"""
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        super().__init__()
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        shard = self._shard()
+        shard[labels] = shard.get(labels, 0.0) + amount
+
+    def values(self) -> Dict[LabelValues, float]:
+        merged: Dict[LabelValues, float] = {}
+        for shard in self._snapshot():
+            for labels, value in shard.items():
+                merged[labels] = merged.get(labels, 0.0) + value
+        return merged
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        for labels, value in sorted(self.values().items()):
+            lines.append(f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}")
+        return lines
+
+
+class Histogram(_Sharded):
+    """누적 버킷 히스토그램"""
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__()
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, *labels: str) -> None:
+        shard = self._shard()
+        state = shard.get(labels)
+        if state is None:
+            # [버킷별 개수..., +Inf 개수, 합계]
+            state = [0] * (len(self.buckets) + 1) + [0.0]
+            shard[labels] = state
+        state[bisect_left(self.buckets, value)] += 1
+        state[-1] += value
+
+    @contextmanager
+    def time(self, *labels: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, *labels)
+
+    def values(self) -> Dict[LabelValues, List[float]]:
+        merged: Dict[LabelValues, List[float]] = {}
+        for shard in self._snapshot():
+            for labels, state in shard.items():
+                current = merged.get(labels)
+                if current is None:
+                    merged[labels] = list(state)
+                else:
+                    for i, value in enumerate(state):
+                        current[i] += value
+        return merged
+
+    def count(self, *labels: str) -> int:
+        state = self.values().get(labels)
+        return int(sum(state[:-1])) if state else 0
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        names = self.labelnames + ("le",)
+        for labels, state in sorted(self.values().items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), state[:-1]):
+                cumulative += count
+                lines.append(
+                    f"{self.name}_bucket{_format_labels(names, labels + (_format_value(bound),))} {cumulative}"
+                )
+            label_text = _format_labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{label_text} {_format_value(state[-1])}")
+            lines.append(f"{self.name}_count{label_text} {cumulative}")
+        return lines
+
+
+class Gauge:
+    """현재 값 게이지 (직접 설정하거나 스크레이프 시 함수로 계산)"""
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        fn: Optional[Callable[[], Dict[LabelValues, float]]] = None,
+    ):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.fn = fn
+        self._values: Dict[LabelValues, float] = {}
+
+    def set(self, value: float, *labels: str) -> None:
+        self._values[labels] = value
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def dec(self, *labels: str, amount: float = 1.0) -> None:
+        self.inc(*labels, amount=-amount)
+
+    def get(self, *labels: str) -> float:
+        return self.values().get(labels, 0.0)
+
+    def values(self) -> Dict[LabelValues, float]:
+        if self.fn is not None:
+            return self.fn()
+        return dict(self._values)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} gauge"]
+        for labels, value in sorted(self.values().items()):
+            lines.append(f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}")
+        return lines
+
+
+class Registry:
+    """메트릭 등록소"""
+
+    def __init__(self):
+        self._metrics: Dict[str, object] = {}
+
+    def register(self, metric):
+        if metric.name in self._metrics:
+            raise ValueError(f"이미 등록된 메트릭입니다: {metric.name}")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, help, labelnames))
+
+    def histogram(
+        self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        return self.register(Histogram(name, help, labelnames, buckets))
+
+    def gauge(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        fn: Optional[Callable[[], Dict[LabelValues, float]]] = None,
+    ) -> Gauge:
+        return self.register(Gauge(name, help, labelnames, fn))
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+REQUEST_DURATION = REGISTRY.histogram(
+    "pricefinder_http_request_duration_seconds",
+    "HTTP 요청 처리 시간",
+    ("method", "route", "status"),
+)
+REQUESTS_IN_FLIGHT = REGISTRY.gauge(
+    "pricefinder_http_requests_in_flight",
+    "처리 중인 HTTP 요청 수",
+)
+STAGE_DURATION = REGISTRY.histogram(
+    "pricefinder_agent_stage_duration_seconds",
+    "Agent 파이프라인 단계별 처리 시간",
+    ("stage", "store"),
+)
+CACHE_REQUESTS = REGISTRY.counter(
+    "pricefinder_cache_requests_total",
+    "캐시 조회 수",
+    ("cache", "result"),
+)
+EVENT_LOOP_LAG = REGISTRY.gauge(
+    "pricefinder_event_loop_lag_seconds",
+    "이벤트 루프 지연 (마지막 측정값)",
+)
+
+
+# 자체 적중/미스 통계를 가진 캐시 (예: functools.lru_cache)
+_CACHE_STATS: Dict[str, Callable[[], Tuple[int, int]]] = {}
+
+
+def register_cache_stats(cache: str, fn: Callable[[], Tuple[int, int]]) -> None:
+    """(적중 수, 미스 수)를 반환하는 함수로 캐시 적중률 노출"""
+    _CACHE_STATS[cache] = fn
+
+
+def _cache_hit_ratio() -> Dict[LabelValues, float]:
+    totals: Dict[str, List[float]] = {}
+    for (cache, result), value in CACHE_REQUESTS.values().items():
+        hits_misses = totals.setdefault(cache, [0.0, 0.0])
+        hits_misses[0 if result == "hit" else 1] += value
+    for cache, fn in _CACHE_STATS.items():
+        totals[cache] = list(fn())
+    return {
+        (cache,): hits / (hits + misses)
+        for cache, (hits, misses) in totals.items()
+        if hits + misses
+    }
+
+
+CACHE_HIT_RATIO = REGISTRY.gauge(
+    "pricefinder_cache_hit_ratio",
+    "캐시 적중률",
+    ("cache",),
+    fn=_cache_hit_ratio,
+)
+
+
+def record_cache(cache: str, hit: bool) -> None:
+    """캐시 적중/미스 기록"""
+    CACHE_REQUESTS.inc(cache, "hit" if hit else "miss")
+
+
+@contextmanager
+def stage(name: str, store: str = "") -> Iterator[None]:
+    """Agent 파이프라인 단계 처리 시간 측정 (추적 중인 요청이면 스팬도 기록)"""
+    attributes = {"store": store} if store else {}
+    with STAGE_DURATION.time(name, store), span(f"agent.{name}", **attributes):
+        yield
+
+
+async def monitor_event_loop_lag(stop: asyncio.Event, interval: float = 0.5) -> None:
+    """주기적으로 sleep 지연을 측정해 이벤트 루프 지연 게이지 갱신"""
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        start = loop.time()
+        try:
+            await asyncio.wait_for(stop.wait(), timeout=interval)
+        except asyncio.TimeoutError:
+            pass
+        EVENT_LOOP_LAG.set(max(loop.time() - start - interval, 0.0))
+
+
+class MetricsMiddleware:
+    """라우트별 요청 처리 시간과 처리 중 요청 수를 기록하는 ASGI 미들웨어"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = ["500"]
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status[0] = str(message["status"])
+            await send(message)
+
+        REQUESTS_IN_FLIGHT.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            REQUESTS_IN_FLIGHT.dec()
+            # 경로 대신 라우트 템플릿을 라벨로 사용해 카디널리티 제한
+            route = getattr(scope.get("route"), "path", None) or "unmatched"
+            REQUEST_DURATION.observe(time.perf_counter() - start, scope["method"], route, status[0])
@@ -0,0 +1,309 @@
+"""
+요청 단위 온디맨드 프로파일링
+
+권한이 있는 X-Profile 헤더가 붙은 요청이나 일정 비율로 샘플링된 요청을, 요청이
+끝날 때까지 샘플링 프로파일러로 기록합니다. 샘플러 스레드가 이벤트 루프 스레드의
+스택을 주기적으로 읽고, 그 순간 실행 중인 asyncio 태스크가 해당 요청(또는 요청 중에
+생성된 자식 태스크)인 경우에만 스택을 집계합니다. 결과는 flamegraph.pl 등에 바로
+넣을 수 있는 collapsed stack 텍스트로 디스크의 크기 제한 링에 저장합니다.
+
+PROFILING_ENABLED=1 이거나 PROFILE_SAMPLE_RATE가 0보다 클 때만 미들웨어를
+등록하므로, 비활성 상태에서는 요청 경로에 아무 코드도 추가되지 않습니다.
+"""
+import asyncio
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+import weakref
+from collections import Counter
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, List, Optional
+
+from src.telemetry.tracing import current_trace_id
+
+PROFILE_HEADER = "x-profile"
+PROFILE_ID_HEADER = "x-profile-id"
+
+_PROFILE_ID_RE = re.compile(r"^[0-9]{13}-[0-9a-f]{8}$")
+
+# 이 프레임 아래(이벤트 루프 내부)는 모든 스택에 공통이므로 잘라냄
+_LOOP_FRAME = ("asyncio.events", "_run")
+
+
+def profiling_enabled() -> bool:
+    return os.getenv("PROFILING_ENABLED") == "1" or float(os.getenv("PROFILE_SAMPLE_RATE", "0")) > 0
+
+
+class ProfileSession:
+    """프로파일링 중인 요청 하나의 샘플 집계"""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, root_task: asyncio.Task):
+        self.loop = loop
+        self.thread_id = threading.get_ident()
+        self.root_task = root_task
+        self.tasks: "weakref.WeakSet[asyncio.Task]" = weakref.WeakSet([root_task])
+        self.task_count = 1
+        self.stacks: Counter = Counter()
+        self.task_samples: Counter = Counter()
+        # running: 이 요청의 태스크 실행 중, other: 다른 태스크가 루프 점유, idle: I/O 대기
+        self.loop_samples = {"running": 0, "other": 0, "idle": 0}
+        self.start = time.time()
+        self._perf_start = time.perf_counter()
+
+    def add_task(self, task: asyncio.Task) -> None:
+        self.tasks.add(task)
+        self.task_count += 1
+
+    def task_label(self, task: asyncio.Task) -> str:
+        if task is self.root_task:
+            return "request"
+        name = task.get_name()
+        if name.startswith("Task-"):
+            # 이름 없는 태스크(예: wait_for 내부 태스크)는 코루틴 이름으로 구분
+            name = getattr(task.get_coro(), "__qualname__", name)
+        return name
+
+    def collapsed(self) -> str:
+        """collapsed stack 형식 ("프레임;프레임;... 샘플수")"""
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self._perf_start
+
+
+def _frame_label(frame) -> str:
+    return f"{frame.f_globals.get('__name__', '?')}:{frame.f_code.co_name}"
+
+
+def collapse_stack(frame) -> List[str]:
+    """프레임 체인을 바깥→안쪽 순서의 라벨 목록으로 변환 (이벤트 루프 내부 프레임 제외)"""
+    labels = []
+    while frame is not None:
+        if (frame.f_globals.get("__name__"), frame.f_code.co_name) == _LOOP_FRAME:
+            break
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    labels.reverse()
+    return labels
+
+
+class Sampler:
+    """활성 세션이 있을 때만 동작하는 샘플링 스레드"""
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self._sessions: List[ProfileSession] = []
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def register(self, session: ProfileSession) -> None:
+        with self._lock:
+            self._sessions.append(session)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="profile-sampler", daemon=True)
+                self._thread.start()
+
+    def unregister(self, session: ProfileSession) -> None:
+        with self._lock:
+            self._sessions.remove(session)
+
+    def _run(self) -> None:
+        while True:
+            with self._lock:
+                sessions = list(self._sessions)
+                if not sessions:
+                    self._thread = None
+                    return
+            self.sample(sessions)
+            time.sleep(self.interval)
+
+    def sample(self, sessions: List[ProfileSession]) -> None:
+        frames = sys._current_frames()
+        for session in sessions:
+            frame = frames.get(session.thread_id)
+            task = asyncio.current_task(session.loop)
+            if task is None or frame is None:
+                session.loop_samples["idle"] += 1
+            elif task in session.tasks:
+                session.loop_samples["running"] += 1
+                label = session.task_label(task)
+                session.task_samples[label] += 1
+                session.stacks[";".join([label] + collapse_stack(frame))] += 1
+            else:
+                session.loop_samples["other"] += 1
+
+
+_active_session: ContextVar[Optional[ProfileSession]] = ContextVar("active_profile", default=None)
+
+
+def _task_factory(loop, coro, context=None, _previous=None):
+    # 프로파일링 중인 요청 컨텍스트에서 생성된 태스크는 해당 세션에 포함
+    if _previous is not None:
+        task = _previous(loop, coro, context=context) if context is not None else _previous(loop, coro)
+    else:
+        task = asyncio.Task(coro, loop=loop, context=context)
+    session = _active_session.get()
+    if session is not None:
+        session.add_task(task)
+    return task
+
+
+def install_task_factory(loop: asyncio.AbstractEventLoop) -> None:
+    """자식 태스크 추적용 태스크 팩토리 설치 (프로파일링 요청이 처음 들어올 때 한 번)"""
+    previous = loop.get_task_factory()
+    if getattr(previous, "_profiling", False):
+        return
+
+    def factory(loop, coro, context=None):
+        return _task_factory(loop, coro, context, previous)
+
+    factory._profiling = True
+    loop.set_task_factory(factory)
+
+
+class ProfileStore:
+    """디스크의 프로파일 링 (최근 max_profiles개만 보관)
+
+    프로파일마다 <id>.folded(collapsed stack)와 <id>.json(메타데이터)을 저장합니다.
+    ID가 생성 시각으로 시작하므로 이름순 정렬이 곧 시간순입니다.
+    """
+
+    def __init__(self, directory: str, max_profiles: int = 50):
+        self.directory = directory
+        self.max_profiles = max_profiles
+        self._lock = threading.Lock()
+
+    def save(self, metadata: Dict[str, Any], collapsed: str) -> None:
+        profile_id = metadata["profile_id"]
+        with self._lock:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(os.path.join(self.directory, f"{profile_id}.folded"), "w", encoding="utf-8") as f:
+                f.write(collapsed)
+            with open(os.path.join(self.directory, f"{profile_id}.json"), "w", encoding="utf-8") as f:
+                json.dump(metadata, f, ensure_ascii=False)
+            for old_id in self._ids()[:-self.max_profiles]:
+                for ext in (".folded", ".json"):
+                    try:
+                        os.remove(os.path.join(self.directory, old_id + ext))
+                    except FileNotFoundError:
+                        pass
+
+    def _ids(self) -> List[str]:
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return []
+        return sorted(name[:-5] for name in names if name.endswith(".json"))
+
+    def list(self, limit: int = 50) -> List[Dict[str, Any]]:
+        """최근 프로파일 메타데이터 (최신순)"""
+        profiles = []
+        for profile_id in reversed(self._ids()[-limit:] if limit else []):
+            metadata = self.metadata(profile_id)
+            if metadata is not None:
+                profiles.append(metadata)
+        return profiles
+
+    def metadata(self, profile_id: str) -> Optional[Dict[str, Any]]:
+        return self._read(profile_id, ".json", json.load)
+
+    def collapsed(self, profile_id: str) -> Optional[str]:
+        return self._read(profile_id, ".folded", lambda f: f.read())
+
+    def _read(self, profile_id: str, ext: str, reader: Callable):
+        if not _PROFILE_ID_RE.match(profile_id):
+            return None
+        try:
+            with open(os.path.join(self.directory, profile_id + ext), encoding="utf-8") as f:
+                return reader(f)
+        except FileNotFoundError:
+            return None
+
+
+def new_profile_id() -> str:
+    return f"{int(time.time() * 1000):013d}-{uuid.uuid4().hex[:8]}"
+
+
+profile_store = ProfileStore(
+    os.getenv("PROFILE_DIR", ".cache/profiles"),
+    max_profiles=int(os.getenv("PROFILE_MAX_COUNT", "50")),
+)
+sampler = Sampler(interval=float(os.getenv("PROFILE_INTERVAL", "0.005")))
+
+
+class ProfilingMiddleware:
+    """X-Profile 헤더(권한 확인) 또는 샘플링으로 선택된 요청을 프로파일링하는 ASGI 미들웨어"""
+
+    def __init__(
+        self,
+        app,
+        authorize: Callable[[Optional[str]], bool],
+        sample_rate: Optional[float] = None,
+        store: ProfileStore = profile_store,
+        sampler: Sampler = sampler,
+    ):
+        self.app = app
+        self.authorize = authorize
+        self.sample_rate = float(os.getenv("PROFILE_SAMPLE_RATE", "0")) if sample_rate is None else sample_rate
+        self.store = store
+        self.sampler = sampler
+
+    def _selected(self, scope) -> bool:
+        requested = False
+        token = None
+        for key, value in scope["headers"]:
+            if key == b"x-profile":
+                requested = value == b"1"
+            elif key == b"x-debug-token":
+                token = value.decode("latin-1")
+        if requested and self.authorize(token):
+            return True
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self._selected(scope):
+            await self.app(scope, receive, send)
+            return
+
+        loop = asyncio.get_running_loop()
+        install_task_factory(loop)
+        session = ProfileSession(loop, asyncio.current_task())
+        profile_id = new_profile_id()
+        status = [500]
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"x-profile-id", profile_id.encode())
+                ]
+            await send(message)
+
+        token = _active_session.set(session)
+        self.sampler.register(session)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            self.sampler.unregister(session)
+            _active_session.reset(token)
+            route = getattr(scope.get("route"), "path", None) or scope["path"]
+            metadata = {
+                "profile_id": profile_id,
+                "method": scope["method"],
+                "route": route,
+                "status": status[0],
+                "trace_id": current_trace_id(),
+                "start": session.start,
+                "duration_ms": round(session.elapsed() * 1000, 3),
+                "interval_ms": self.sampler.interval * 1000,
+                "loop_samples": session.loop_samples,
+                "task_count": session.task_count,
+                "task_samples": dict(session.task_samples),
+            }
+            # 디스크 쓰기가 이벤트 루프를 막지 않도록 스레드에서 저장
+            await loop.run_in_executor(None, self.store.save, metadata, session.collapsed())
@@ -0,0 +1,139 @@
+"""
+트래픽 기록 (성능 회귀 테스트용 재생 로그)
+
+요청의 형태만 익명화해 JSON Lines로 추가 기록합니다. 첫 줄은 헤더
+{"v": 1, "start": 기록 시작 시각(epoch)}이고, 이후 요청마다 한 줄씩:
+
+    t  도착 시각 (기록 시작 기준 초)
+    m  HTTP 메서드
+    r  라우트 템플릿 (예: /chat/history/{session_id})
+    q  정규화된 쿼리 (검색어/채팅 메시지, 전화번호 등 긴 숫자열과 이메일은 마스킹)
+    s  세션 ID 해시 (솔트 포함, 원래 ID는 기록하지 않음)
+    n  세션 내 요청 순번
+    d  서버 처리 시간 (ms)
+    c  응답 상태 코드
+
+TRAFFIC_RECORD_PATH가 설정된 경우에만 미들웨어를 등록합니다.
+경로의 {pid}는 워커 프로세스 ID로 치환되어 워커마다 별도 파일에 기록됩니다.
+"""
+import hashlib
+import json
+import os
+import re
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+from urllib.parse import parse_qs
+
+from src.agent.query_normalizer import normalize_query
+
+# 본문에서 쿼리와 세션 ID를 읽는 경로
+_BODY_PATHS = {"/chat", "/search/jobs"}
+_MAX_SESSIONS = 10000
+
+_EMAIL_RE = re.compile(r"\S+@\S+")
+_LONG_DIGITS_RE = re.compile(r"\d{6,}")
+# 하이픈/공백/점으로 나뉜 전화번호·카드 번호 ("010-1234-5678", "+82 10 1234 5678")
+# 마지막 묶음이 4자리이고 세 묶음 이상일 때만 매칭해 "맥북 프로 14 2023" 같은 표기는 유지
+_GROUPED_DIGITS_RE = re.compile(r"(?<!\d)(?:\+\d{1,3}[-. ]?)?\d{2,4}(?:[-. ]\d{3,4})+[-. ]\d{4}(?!\d)")
+
+
+def anonymize_query(text: str) -> str:
+    """정규화 후 개인정보일 수 있는 긴 숫자열(전화번호 등)과 이메일 마스킹"""
+    text = _EMAIL_RE.sub("<email>", text)
+    text = _GROUPED_DIGITS_RE.sub("<num>", text)
+    text = _LONG_DIGITS_RE.sub("<num>", text)
+    return normalize_query(text).text
+
+
+class TrafficRecorder:
+    """익명화된 요청 형태를 추가 전용 로그에 기록하는 ASGI 미들웨어"""
+
+    def __init__(self, app, path: str, salt: Optional[str] = None):
+        self.app = app
+        self.path = path.format(pid=os.getpid())
+        self.salt = (salt or os.getenv("TRAFFIC_RECORD_SALT") or os.urandom(16).hex()).encode()
+        self._turns: "OrderedDict[str, int]" = OrderedDict()
+        self._start = time.monotonic()
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        # 줄 단위 버퍼링: 프로세스가 죽어도 완료된 요청 기록은 남음
+        self._file = open(self.path, "a", encoding="utf-8", buffering=1)
+        self._write({"v": 1, "start": round(time.time(), 3)})
+
+    def _write(self, record: Dict[str, Any]) -> None:
+        self._file.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n")
+
+    def hash_session(self, session_id: str) -> str:
+        return hashlib.blake2b(session_id.encode(), key=self.salt[:64], digest_size=8).hexdigest()
+
+    def _next_turn(self, session_hash: str) -> int:
+        turn = self._turns.pop(session_hash, 0) + 1
+        self._turns[session_hash] = turn
+        if len(self._turns) > _MAX_SESSIONS:
+            self._turns.popitem(last=False)
+        return turn
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        arrival = time.monotonic()
+        query: Optional[str] = None
+        session_id: Optional[str] = None
+
+        if scope["method"] == "POST" and scope["path"] in _BODY_PATHS:
+            # 본문을 읽어 두었다가 앱에 그대로 다시 전달
+            messages = []
+            while True:
+                message = await receive()
+                messages.append(message)
+                if message["type"] != "http.request" or not message.get("more_body"):
+                    break
+            try:
+                body = json.loads(b"".join(m.get("body", b"") for m in messages) or b"{}")
+            except ValueError:
+                body = {}
+            if isinstance(body, dict):
+                query = body.get("message") or body.get("query")
+                session_id = body.get("session_id")
+            pending = list(messages)
+
+            async def replay_receive():
+                if pending:
+                    return pending.pop(0)
+                return await receive()
+
+            app_receive = replay_receive
+        else:
+            params = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+            query = params.get("query", [None])[0]
+            app_receive = receive
+
+        status = [500]
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, app_receive, send_wrapper)
+        finally:
+            route = getattr(scope.get("route"), "path", None)
+            session_id = session_id or scope.get("path_params", {}).get("session_id")
+            record: Dict[str, Any] = {
+                "t": round(arrival - self._start, 4),
+                "m": scope["method"],
+                "r": route or "unmatched",
+            }
+            if isinstance(query, str) and query:
+                record["q"] = anonymize_query(query)
+            if isinstance(session_id, str) and session_id:
+                session_hash = self.hash_session(session_id)
+                record["s"] = session_hash
+                record["n"] = self._next_turn(session_hash)
+            record["d"] = round((time.monotonic() - arrival) * 1000, 3)
+            record["c"] = status[0]
+            self._write(record)
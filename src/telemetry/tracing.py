@@ -0,0 +1,293 @@
+"""
+경량 분산 트레이싱
+
+클라이언트가 보낸 X-Trace-Id(없으면 서버에서 생성)로 요청을 식별하고, 샘플링된
+요청에 대해서만 미들웨어·라우트 핸들러·Agent 단계·쇼핑몰 호출 스팬을 기록합니다.
+샘플링되지 않은 요청에서 스팬 API는 contextvar 조회 한 번으로 끝납니다.
+완료된 트레이스는 메모리 링 버퍼(디버그 라우트용)나 JSON Lines 파일로 내보냅니다.
+"""
+import json
+import os
+import re
+import threading
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional
+
+TRACE_HEADER = "x-trace-id"
+# 샘플링 비율과 관계없이 이 요청을 기록하도록 요청하는 헤더 ("1", 디버그 토큰 필요)
+TRACE_SAMPLED_HEADER = "x-trace-sampled"
+
+_TRACE_ID_RE = re.compile(r"^[0-9a-f]{16,64}$")
+
+
+def new_trace_id() -> str:
+    return uuid.uuid4().hex
+
+
+class Span:
+    """트레이스를 구성하는 하나의 작업 구간"""
+
+    __slots__ = ("trace", "name", "span_id", "parent_id", "start", "_perf_start", "duration", "attributes", "error")
+
+    def __init__(self, trace: "Trace", name: str, parent_id: Optional[str], attributes: Dict[str, Any]):
+        self.trace = trace
+        self.name = name
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id = parent_id
+        self.start = time.time()
+        self._perf_start = time.perf_counter()
+        self.duration: Optional[float] = None
+        self.attributes = attributes
+        self.error: Optional[str] = None
+        trace._span_started(self)
+
+    def end(self) -> None:
+        if self.duration is not None:
+            return
+        self.duration = time.perf_counter() - self._perf_start
+        self.trace._span_ended()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start": self.start,
+            "duration_ms": round(self.duration * 1000, 3) if self.duration is not None else None,
+            "attributes": self.attributes,
+            "error": self.error,
+        }
+
+
+class Trace:
+    """하나의 요청(및 그 요청이 시작한 백그라운드 작업)의 스팬 모음
+
+    열린 스팬이 모두 닫히면 내보냅니다. 따라서 요청이 끝난 뒤에도 계속되는
+    검색 작업의 스팬까지 같은 트레이스에 포함됩니다.
+    """
+
+    def __init__(self, trace_id: str, tracer: "Tracer"):
+        self.trace_id = trace_id
+        self.tracer = tracer
+        self.spans: List[Span] = []
+        self._open = 0
+
+    def _span_started(self, span: Span) -> None:
+        self.spans.append(span)
+        self._open += 1
+
+    def _span_ended(self) -> None:
+        self._open -= 1
+        if self._open == 0:
+            self.tracer._export(self)
+
+    def to_dict(self) -> Dict[str, Any]:
+        root = self.spans[0]
+        return {
+            "trace_id": self.trace_id,
+            "name": root.name,
+            "start": root.start,
+            "duration_ms": round((max(s.start + (s.duration or 0) for s in self.spans) - root.start) * 1000, 3),
+            "spans": [span.to_dict() for span in self.spans],
+        }
+
+
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+class RingBufferExporter:
+    """최근 트레이스를 메모리에 보관"""
+
+    def __init__(self, maxlen: int = 200):
+        self._traces: Deque[Dict[str, Any]] = deque(maxlen=maxlen)
+
+    def export(self, trace: Dict[str, Any]) -> None:
+        self._traces.append(trace)
+
+    def traces(self) -> List[Dict[str, Any]]:
+        return list(reversed(self._traces))
+
+    def get(self, trace_id: str) -> Optional[Dict[str, Any]]:
+        for trace in reversed(self._traces):
+            if trace["trace_id"] == trace_id:
+                return trace
+        return None
+
+    def clear(self) -> None:
+        self._traces.clear()
+
+
+class JsonLinesExporter:
+    """트레이스를 JSON Lines 파일에 추가"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+    def export(self, trace: Dict[str, Any]) -> None:
+        line = json.dumps(trace, ensure_ascii=False, separators=(",", ":"))
+        with self._lock, open(self.path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+
+
+class Tracer:
+    """샘플링 결정과 스팬 생성을 담당"""
+
+    def __init__(self, sample_rate: float = 0.0, exporters: Optional[list] = None):
+        self.sample_rate = sample_rate
+        self.exporters = list(exporters or [])
+
+    def should_sample(self, trace_id: str, forced: bool = False) -> bool:
+        """트레이스 ID 해시로 결정하므로 같은 ID는 어느 프로세스에서든 같은 결과"""
+        if forced:
+            return True
+        if self.sample_rate <= 0:
+            return False
+        if self.sample_rate >= 1:
+            return True
+        return int(trace_id[:8], 16) / 0xFFFFFFFF < self.sample_rate
+
+    def start_trace(self, trace_id: str, name: str, forced: bool = False, **attributes: Any) -> Optional[Span]:
+        """루트 스팬 시작 (샘플링되지 않으면 None)"""
+        if not self.should_sample(trace_id, forced):
+            return None
+        return Span(Trace(trace_id, self), name, None, attributes)
+
+    def start_span(self, name: str, **attributes: Any) -> Optional[Span]:
+        """현재 스팬의 자식 스팬 시작 (추적 중이 아니면 None). 호출한 쪽에서 end() 필요"""
+        parent = _current_span.get()
+        if parent is None:
+            return None
+        return Span(parent.trace, name, parent.span_id, attributes)
+
+    @contextmanager
+    def span(self, name: str, **attributes: Any) -> Iterator[Optional[Span]]:
+        """현재 스팬의 자식 스팬 구간"""
+        span = self.start_span(name, **attributes)
+        if span is None:
+            yield None
+            return
+
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.error = repr(e)
+            raise
+        finally:
+            _current_span.reset(token)
+            span.end()
+
+    def record_span(self, name: str, duration: float, ended_ago: float = 0.0, **attributes: Any) -> None:
+        """다른 곳(예: 프로세스 풀)에서 측정한 구간을 완료된 스팬으로 추가
+
+        ended_ago는 해당 구간이 지금으로부터 몇 초 전에 끝났는지를 나타냅니다.
+        """
+        span = self.start_span(name, **attributes)
+        if span is None:
+            return
+        span.start -= duration + ended_ago
+        span.duration = duration
+        span.trace._span_ended()
+
+    def _export(self, trace: Trace) -> None:
+        record = trace.to_dict()
+        for exporter in self.exporters:
+            try:
+                exporter.export(record)
+            except Exception:
+                # 트레이스 내보내기 실패가 요청 처리에 영향을 주지 않도록 무시
+                pass
+
+
+def use_span(span: Optional[Span]) -> Token:
+    """현재 컨텍스트의 부모 스팬 지정 (백그라운드 작업에서 사용)"""
+    return _current_span.set(span)
+
+
+def current_trace_id() -> Optional[str]:
+    span = _current_span.get()
+    return span.trace.trace_id if span is not None else None
+
+
+ring_buffer = RingBufferExporter(maxlen=int(os.getenv("TRACE_BUFFER_SIZE", "200")))
+_exporters: list = [ring_buffer]
+if os.getenv("TRACE_EXPORT_PATH"):
+    _exporters.append(JsonLinesExporter(os.environ["TRACE_EXPORT_PATH"]))
+
+tracer = Tracer(sample_rate=float(os.getenv("TRACE_SAMPLE_RATE", "0.0")), exporters=_exporters)
+span = tracer.span
+start_span = tracer.start_span
+record_span = tracer.record_span
+
+
+class TracingMiddleware:
+    """요청 전체를 루트 스팬으로 기록하고 응답에 X-Trace-Id를 붙이는 ASGI 미들웨어
+
+    X-Trace-Sampled 강제 샘플링은 authorize가 X-Debug-Token을 허용한 요청에만 적용합니다.
+    """
+
+    def __init__(
+        self,
+        app,
+        tracer: Tracer = tracer,
+        authorize: Optional[Callable[[Optional[str]], bool]] = None,
+    ):
+        self.app = app
+        self.tracer = tracer
+        self.authorize = authorize
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        trace_id = None
+        forced = False
+        debug_token = None
+        for key, value in scope["headers"]:
+            if key == b"x-trace-id":
+                trace_id = value.decode("latin-1").lower()
+            elif key == b"x-trace-sampled":
+                forced = value == b"1"
+            elif key == b"x-debug-token":
+                debug_token = value.decode("latin-1")
+        forced = forced and self.authorize is not None and self.authorize(debug_token)
+        if trace_id is None or not _TRACE_ID_RE.match(trace_id):
+            trace_id = new_trace_id()
+
+        root = self.tracer.start_trace(
+            trace_id, f"{scope['method']} {scope['path']}", forced=forced, kind="middleware"
+        )
+        header = (b"x-trace-id", trace_id.encode())
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + [header]
+                if root is not None:
+                    root.attributes["status"] = message["status"]
+            await send(message)
+
+        if root is None:
+            await self.app(scope, receive, send_wrapper)
+            return
+
+        token = _current_span.set(root)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except BaseException as e:
+            root.error = repr(e)
+            raise
+        finally:
+            _current_span.reset(token)
+            route = getattr(scope.get("route"), "path", None)
+            if route:
+                root.name = f"{scope['method']} {route}"
+            root.end()
+
@@ -24,4 +24,47 @@ async def test_search_products(agent):
     assert "products" in result
     assert "message" in result
     assert isinstance(result["products"], list)
-    assert "노트북" in result["message"] 
\ No newline at end of file
+    assert "노트북" in result["message"]
+
+@pytest.mark.asyncio
+async def test_process_message_uses_llm_backend():
+    """LLM 백엔드가 있으면 이전 대화와 함께 응답 생성을 위임"""
+    class EchoLLM:
+        async def generate(self, message, history):
+            return f"{message} ({len(history)})"
+    
+    agent = PriceFinderAgent(llm=EchoLLM())
+    await agent.process_message("첫 번째", "s1")
+    result = await agent.process_message("두 번째", "s1")
+    
+    assert result["response"] == "두 번째 (2)"
+
+@pytest.mark.asyncio
+async def test_store_status_from_searches_and_probes():
+    """실제 조회 결과로 쇼핑몰 상태를 갱신하고, 오래된 상태만 다시 확인"""
+    class Store:
+        def __init__(self, name, fail=False):
+            self.name = name
+            self.fail = fail
+            self.calls = 0
+        
+        async def search(self, query):
+            self.calls += 1
+            if self.fail:
+                raise ConnectionError("connection refused")
+            return []
+    
+    up, down = Store("coupang"), Store("11st", fail=True)
+    agent = PriceFinderAgent(stores=[up, down])
+    
+    await agent.search_products("노트북")
+    assert agent.store_status["coupang"]["ok"]
+    assert not agent.store_status["11st"]["ok"]
+    assert "connection refused" in agent.store_status["11st"]["error"]
+    
+    await agent.probe_stores(max_age=60)
+    assert (up.calls, down.calls) == (1, 1)
+    
+    down.fail = False
+    await agent.probe_stores()
+    assert agent.store_status["11st"] == {"ok": True, "checked_at": agent.store_status["11st"]["checked_at"]}
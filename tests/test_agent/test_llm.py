@@ -0,0 +1,46 @@
+import threading
+
+from src.agent import llm
+from src.agent.core import PriceFinderAgent
+from src.agent.llm import GeminiLLM, default_llm, get_agent_graph
+
+def test_agent_graph_built_once_per_process(monkeypatch):
+    """여러 스레드에서 동시에 요청해도 그래프는 모델별로 한 번만 생성"""
+    builds = []
+    
+    def build(model):
+        builds.append(model)
+        return object()
+    
+    monkeypatch.setattr(llm, "_build_agent_graph", build)
+    monkeypatch.setattr(llm, "_graphs", {})
+    graphs = []
+    threads = [threading.Thread(target=lambda: graphs.append(get_agent_graph("test-model"))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    assert builds == ["test-model"]
+    assert all(graph is graphs[0] for graph in graphs)
+
+def test_agent_warmup_prepares_llm_graph(monkeypatch):
+    """Agent 예열 시 LLM 그래프를 미리 생성"""
+    monkeypatch.setattr(llm, "_build_agent_graph", lambda model: f"graph:{model}")
+    monkeypatch.setattr(llm, "_graphs", {})
+    
+    PriceFinderAgent(llm=GeminiLLM(model="warm-model")).warmup()
+    
+    assert llm._graphs == {"warm-model": "graph:warm-model"}
+
+def test_default_llm_requires_api_key_and_packages(monkeypatch):
+    """API 키가 없거나 LLM 패키지가 설치되지 않았으면 LLM 백엔드를 사용하지 않음"""
+    monkeypatch.setattr(llm, "llm_packages_available", lambda: True)
+    monkeypatch.delenv("GOOGLE_API_KEY", raising=False)
+    assert default_llm() is None
+    
+    monkeypatch.setenv("GOOGLE_API_KEY", "test-key")
+    assert isinstance(default_llm(), GeminiLLM)
+    
+    monkeypatch.setattr(llm, "llm_packages_available", lambda: False)
+    assert default_llm() is None
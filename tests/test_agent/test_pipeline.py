@@ -0,0 +1,61 @@
+import asyncio
+
+import pytest
+from src.agent.core import PriceFinderAgent
+from src.agent.pipeline import dedup_offers, rank_offers
+
+def test_dedup_keeps_cheapest_per_store():
+    """같은 쇼핑몰의 같은 상품은 최저가만 유지"""
+    offers = [
+        {"name": "아이폰 15 128GB", "price": 1200000, "store": "coupang"},
+        {"name": "iPhone15 128기가", "price": 1150000, "store": "coupang"},
+        {"name": "아이폰 15 128GB", "price": 1180000, "store": "11st"},
+    ]
+    
+    result = dedup_offers(offers)
+    
+    assert sorted(o["price"] for o in result) == [1150000, 1180000]
+
+def test_rank_cheapest_intent_orders_relevant_by_price():
+    """최저가 의도에서는 관련 상품 중 가격순, 관련 없는 상품은 뒤로"""
+    offers = [
+        {"name": "갤럭시 S24", "price": 1000000},
+        {"name": "아이폰 15 프로", "price": 1500000},
+        {"name": "아이폰15 Pro 256GB", "price": 1400000},
+    ]
+    
+    ranked = rank_offers(offers, "iphone 15 pro", frozenset({"cheapest"}))
+    
+    assert [o["price"] for o in ranked] == [1400000, 1500000, 1000000]
+
+def test_rank_by_relevance_without_intent():
+    """의도가 없으면 관련도 우선"""
+    offers = [
+        {"name": "아이폰 15", "price": 1200000},
+        {"name": "아이폰 15 프로", "price": 1500000},
+    ]
+    
+    ranked = rank_offers(offers, "iphone 15 pro", frozenset())
+    
+    assert [o["price"] for o in ranked] == [1500000, 1200000]
+
+@pytest.mark.asyncio
+async def test_search_results_cached_and_coalesced():
+    """같은 정규화 쿼리는 한 번만 쇼핑몰을 조회"""
+    calls = []
+    
+    class Store:
+        name = "coupang"
+        
+        async def search(self, query):
+            calls.append(query.key)
+            await asyncio.sleep(0.01)
+            return [{"id": "1", "name": "아이폰 15", "price": 1200000, "store": self.name}]
+    
+    agent = PriceFinderAgent(stores=[Store()])
+    results = await asyncio.gather(agent.search_products("아이폰 15"), agent.search_products("iPhone15"))
+    again = await agent.search_products("아이폰15")
+    
+    assert calls == ["iphone 15"]
+    assert results[0]["products"] == results[1]["products"] == again["products"]
+    assert agent.search_cache.hits == 1
@@ -0,0 +1,69 @@
+import pytest
+from src.agent.query_normalizer import is_search_query, normalize_query
+
+@pytest.mark.parametrize("query", [
+    "아이폰 15",
+    "아이폰15",
+    "iPhone 15",
+    "아이폰 15 최저가",
+    "ＩＰＨＯＮＥ　１５",
+])
+def test_equivalent_queries_share_key(query):
+    """표기만 다른 쿼리는 같은 키로 정규화"""
+    assert normalize_query(query).key == "iphone 15"
+
+def test_intent_words_become_flags():
+    """의도 단어는 쿼리에서 제거되고 플래그로 변환"""
+    result = normalize_query("아이폰15프로 최저가 비교")
+    
+    assert result.text == "iphone 15 pro"
+    assert result.intents == {"cheapest", "compare"}
+    assert result.original == "아이폰15프로 최저가 비교"
+
+def test_unit_normalization():
+    """용량/크기 단위 정규화"""
+    assert normalize_query("갤럭시 S24 256기가").text == "galaxy s24 256gb"
+    assert normalize_query("갤럭시 S24 256 GB").text == "galaxy s24 256gb"
+    assert normalize_query("맥북에어 13.0인치").text == "macbook air 13inch"
+
+def test_model_number_normalization():
+    """하이픈으로 구분된 모델 번호 결합"""
+    assert normalize_query("소니 WH-1000XM5").text == "sony wh1000xm5"
+    assert normalize_query("sony wh1000xm5").text == "sony wh1000xm5"
+
+def test_aliases_do_not_split_other_words():
+    """별칭이 다른 단어의 일부를 바꾸지 않음"""
+    assert normalize_query("에어컨 추천").text == "에어컨"
+    assert normalize_query("프로젝터").text == "프로젝터"
+    assert normalize_query("파인애플").text == "파인애플"
+
+def test_intent_only_query_keeps_text():
+    """의도 단어만 있는 쿼리는 원문을 유지"""
+    result = normalize_query("최저가")
+    
+    assert result.text == "최저가"
+    assert result.intents == {"cheapest"}
+
+
+def test_korean_words_need_boundaries():
+    """다른 단어의 일부인 의도 단어/브랜드 표기는 변환하지 않음"""
+    result = normalize_query("비교적 싼 노트북")
+    
+    assert result.text == "비교적 싼 노트북"
+    assert result.intents == set()
+    assert normalize_query("애플망고").text == "애플망고"
+    assert normalize_query("아이폰 추천해줘").intents == {"recommend"}
+
+
+def test_latin_modifier_after_number():
+    """숫자 뒤에 붙은 영문 등급 표기도 한글 표기와 같은 키"""
+    assert normalize_query("iPhone15Pro").key == normalize_query("아이폰15프로").key == "iphone 15 pro"
+    assert normalize_query("iPhone15ProMax").key == normalize_query("아이폰15프로맥스").key
+
+
+def test_search_query_detection():
+    """상품 검색 요청과 일반 대화 구분"""
+    for query in ["아이폰 15", "무선 이어폰 추천해줘", "노트북 가격", "256기가 ssd"]:
+        assert is_search_query(query), query
+    for query in ["안녕하세요", "고마워요", "오늘 날씨 어때"]:
+        assert not is_search_query(query), query
@@ -0,0 +1,213 @@
+import asyncio
+
+import pytest
+from src.agent.watchlist import WatchConfig, WatchEngine
+
+class FakeClock:
+    """테스트용 시계"""
+    
+    def __init__(self):
+        self.now = 1000.0
+    
+    def __call__(self) -> float:
+        return self.now
+
+class FakeStore:
+    """쇼핑몰 가격 조회 스텁"""
+    
+    def __init__(self):
+        self.prices = {}
+        self.calls = []
+    
+    async def fetch(self, store, product_ids):
+        self.calls.append((store, list(product_ids)))
+        return {pid: self.prices[(store, pid)] for pid in product_ids if (store, pid) in self.prices}
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+@pytest.fixture
+def store():
+    return FakeStore()
+
+@pytest.fixture
+def engine(clock, store):
+    config = WatchConfig(MIN_INTERVAL=10, BASE_INTERVAL=100, MAX_INTERVAL=1000)
+    return WatchEngine(store.fetch, config=config, clock=clock)
+
+@pytest.mark.asyncio
+async def test_due_items_batched_per_store(engine, clock, store):
+    """확인 시점이 된 상품은 쇼핑몰별로 한 번에 조회"""
+    for pid in ["a", "b", "c"]:
+        store.prices[("coupang", pid)] = 1000
+        engine.add_watch("s1", "coupang", pid, price=1000)
+    store.prices[("11st", "x")] = 500
+    engine.add_watch("s1", "11st", "x", price=500)
+    
+    clock.now += 100
+    await engine.run_due()
+    
+    assert sorted(store.calls) == [("11st", ["x"]), ("coupang", ["a", "b", "c"])]
+
+@pytest.mark.asyncio
+async def test_concurrent_batches_limited_per_store(clock):
+    """한 쇼핑몰에 대한 동시 조회 수는 STORE_CONCURRENCY 이하"""
+    active = {"coupang": 0, "11st": 0}
+    peak = {"coupang": 0, "11st": 0}
+    
+    async def fetch(store, product_ids):
+        active[store] += 1
+        peak[store] = max(peak[store], active[store])
+        await asyncio.sleep(0.01)
+        active[store] -= 1
+        return {}
+    
+    config = WatchConfig(STORE_BATCH_SIZE=2, STORE_CONCURRENCY=2)
+    engine = WatchEngine(fetch, config=config, clock=clock)
+    for pid in range(20):
+        engine.add_watch("s1", "coupang", str(pid))
+        engine.add_watch("s1", "11st", str(pid))
+    
+    await engine.run_due()
+    
+    assert engine.store_calls == 20
+    assert peak == {"coupang": 2, "11st": 2}
+
+@pytest.mark.asyncio
+async def test_not_due_items_are_skipped(engine, clock, store):
+    """확인 시점 전에는 쇼핑몰을 조회하지 않음"""
+    engine.add_watch("s1", "coupang", "a", price=1000)
+    
+    clock.now += 50
+    await engine.run_due()
+    
+    assert store.calls == []
+
+@pytest.mark.asyncio
+async def test_alert_on_target_crossing(engine, clock, store):
+    """가격이 목표가 이하로 내려가면 알림 발생"""
+    engine.add_watch("s1", "coupang", "a", name="아이폰 15", price=1000, target_price=900)
+    store.prices[("coupang", "a")] = 850
+    
+    clock.now += 100
+    alerts = await engine.run_due()
+    
+    assert len(alerts) == 1
+    assert alerts[0].price == 850
+    assert alerts[0].previous_price == 1000
+    assert [a.item_id for a in engine.drain_alerts("s1")] == ["coupang:a"]
+    assert engine.drain_alerts("s1") == []
+
+@pytest.mark.asyncio
+async def test_no_repeated_alert_below_target(engine, clock, store):
+    """목표가 아래에 머무르는 동안에는 알림을 반복하지 않음"""
+    engine.add_watch("s1", "coupang", "a", price=1000, target_price=900)
+    store.prices[("coupang", "a")] = 850
+    clock.now += 100
+    await engine.run_due()
+    
+    store.prices[("coupang", "a")] = 800
+    clock.now += 1000
+    alerts = await engine.run_due()
+    
+    assert alerts == []
+
+@pytest.mark.asyncio
+async def test_alert_when_target_already_met(engine, clock, store):
+    """등록 시점에 이미 목표가 이하이면 바로 한 번만 알림"""
+    engine.add_watch("s1", "coupang", "a", price=1000)
+    engine.add_watch("s2", "coupang", "a", target_price=1200)
+    engine.add_watch("s3", "coupang", "b", price=800, target_price=900)
+    
+    assert [(a.item_id, a.price) for a in engine.drain_alerts("s2")] == [("coupang:a", 1000)]
+    assert [(a.item_id, a.price) for a in engine.drain_alerts("s3")] == [("coupang:b", 800)]
+    
+    store.prices[("coupang", "a")] = 950
+    store.prices[("coupang", "b")] = 700
+    clock.now += 1000
+    assert await engine.run_due() == []
+
+@pytest.mark.asyncio
+async def test_interval_backs_off_when_price_stable(engine, clock, store):
+    """가격 변동이 없으면 확인 주기가 늘어남"""
+    item = engine.add_watch("s1", "coupang", "a", price=1000)
+    store.prices[("coupang", "a")] = 1000
+    
+    intervals = []
+    for _ in range(3):
+        clock.now = item.next_due
+        await engine.run_due()
+        intervals.append(item.interval)
+    
+    assert intervals[0] < intervals[1] < intervals[2]
+
+@pytest.mark.asyncio
+async def test_volatile_and_popular_items_checked_sooner(engine, clock, store):
+    """변동이 크거나 찜한 사용자가 많은 상품은 더 자주 확인"""
+    volatile = engine.add_watch("s1", "coupang", "v", price=1000)
+    stable = engine.add_watch("s1", "coupang", "s", price=1000)
+    store.prices[("coupang", "v")] = 700
+    store.prices[("coupang", "s")] = 1000
+    
+    clock.now += 100
+    await engine.run_due()
+    assert volatile.interval < stable.interval
+    
+    popular = engine.add_watch("s1", "11st", "p", price=1000)
+    for i in range(2, 10):
+        engine.add_watch(f"s{i}", "11st", "p")
+    assert popular.interval < 100
+
+def test_remove_last_watcher_stops_tracking(engine):
+    """마지막 사용자가 찜을 해제하면 감시 중단"""
+    item = engine.add_watch("s1", "coupang", "a", price=1000)
+    engine.add_watch("s2", "coupang", "a")
+    
+    assert engine.remove_watch("s1", item.item_id)
+    assert item.item_id in engine.items
+    assert engine.remove_watch("s2", item.item_id)
+    assert item.item_id not in engine.items
+    assert engine.next_due() is None
+
+def test_get_watches_per_watcher(engine):
+    """찜 목록은 해당 사용자가 찜한 상품만 반환"""
+    for pid in ["b", "a", "c"]:
+        engine.add_watch("s1", "coupang", pid, price=1000)
+    engine.add_watch("s2", "coupang", "a", target_price=900)
+    engine.add_watch("s2", "11st", "x")
+    
+    assert [w["item_id"] for w in engine.get_watches("s1")] == ["coupang:a", "coupang:b", "coupang:c"]
+    assert [(w["item_id"], w["target_price"]) for w in engine.get_watches("s2")] == [
+        ("11st:x", None), ("coupang:a", 900)
+    ]
+    
+    engine.remove_watch("s2", "coupang:a")
+    engine.remove_watch("s2", "11st:x")
+    assert engine.get_watches("s2") == []
+    assert "s2" not in engine._watcher_items
+    assert len(engine.get_watches("s1")) == 3
+
+def test_run_forever_on_new_event_loop(engine):
+    """다른 이벤트 루프에서 다시 실행해도 다음 확인 시각까지 대기"""
+    calls = []
+    run_due = engine.run_due
+    
+    async def counting_run_due():
+        calls.append(1)
+        return await run_due()
+    
+    engine.run_due = counting_run_due
+    
+    async def run_briefly():
+        stop = asyncio.Event()
+        task = asyncio.create_task(engine.run_forever(stop))
+        await asyncio.sleep(0.1)
+        stop.set()
+        await task
+    
+    for _ in range(2):
+        engine.add_watch("s1", "coupang", "a", price=1000)
+        asyncio.run(run_briefly())
+    
+    assert len(calls) <= 4
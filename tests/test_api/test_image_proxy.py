@@ -0,0 +1,221 @@
+import asyncio
+import io
+import socket
+from functools import lru_cache
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+from PIL import Image
+
+from src.api.image_proxy import BlockedImageURLError, ImageProxy, ThumbnailCache, get_image_proxy
+from src.api.main import app
+
+IMAGE_HOST = "http://img.shop.test"
+
+# 테스트용 DNS (img.shop.test는 공인 주소, intranet.test는 사설망 주소)
+HOSTS = {"img.shop.test": ["93.184.216.34"], "intranet.test": ["10.0.0.5"]}
+
+@lru_cache(maxsize=None)
+def _png_bytes(size=(800, 600), color=(255, 0, 0), mode="RGB") -> bytes:
+    buffer = io.BytesIO()
+    Image.new(mode, size, color if mode == "RGB" else 0).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+async def fake_resolver(host):
+    if host not in HOSTS:
+        raise socket.gaierror(socket.EAI_NONAME, "Name or service not known")
+    return HOSTS[host]
+
+@pytest.fixture
+def image_server():
+    """쇼핑몰 이미지 호스트 대용 MockTransport (요청 경로 기록)"""
+    images = {
+        "/a.png": _png_bytes(),
+        "/b.png": _png_bytes(color=(0, 0, 255)),
+        "/huge.png": _png_bytes(size=(20000, 20000), mode="1"),
+        "/large.png": _png_bytes(size=(6000, 5000), mode="1"),
+    }
+    redirects = {
+        "/moved.png": f"{IMAGE_HOST}/a.png",
+        "/to-internal.png": "http://intranet.test/admin.png",
+        "/to-metadata.png": "http://169.254.169.254/latest/meta-data",
+    }
+    hits = []
+    
+    def handler(request):
+        hits.append(request.url.path)
+        if request.url.path in redirects:
+            return httpx.Response(302, headers={"Location": redirects[request.url.path]})
+        data = images.get(request.url.path)
+        if data is None:
+            return httpx.Response(404)
+        return httpx.Response(200, content=data, headers={"Content-Type": "image/png"})
+    
+    return httpx.MockTransport(handler), hits
+
+@pytest.fixture
+def proxy(tmp_path, image_server):
+    transport, _ = image_server
+    return ImageProxy(cache_dir=str(tmp_path / "images"), transport=transport, resolver=fake_resolver)
+
+@pytest.fixture
+def client(proxy):
+    app.dependency_overrides[get_image_proxy] = lambda: proxy
+    with TestClient(app) as test_client:
+        yield test_client
+    app.dependency_overrides.clear()
+
+def test_thumbnail_resized_and_cached(client, image_server):
+    """썸네일은 축소 후 캐시되어 원본을 한 번만 가져옴"""
+    _, hits = image_server
+    params = {"url": f"{IMAGE_HOST}/a.png", "size": 100}
+    
+    first = client.get("/images/thumbnail", params=params)
+    second = client.get("/images/thumbnail", params=params)
+    
+    assert first.status_code == 200
+    assert first.headers["content-type"] == "image/webp"
+    assert "immutable" in first.headers["cache-control"]
+    assert first.content == second.content
+    assert hits == ["/a.png"]
+    with Image.open(io.BytesIO(first.content)) as image:
+        assert max(image.size) == 100
+
+def test_thumbnail_conditional_request(client, image_server):
+    """If-None-Match가 일치하면 304 응답"""
+    params = {"url": f"{IMAGE_HOST}/a.png"}
+    
+    etag = client.get("/images/thumbnail", params=params).headers["etag"]
+    response = client.get("/images/thumbnail", params=params, headers={"If-None-Match": etag})
+    
+    assert response.status_code == 304
+    assert response.content == b""
+
+def test_thumbnail_errors(client):
+    """잘못된 URL과 원본 오류 처리"""
+    assert client.get("/images/thumbnail", params={"url": "file:///etc/passwd"}).status_code == 400
+    assert client.get("/images/thumbnail", params={"url": f"{IMAGE_HOST}/missing.png"}).status_code == 502
+    assert client.get("/images/thumbnail", params={"url": "http://unknown.test/a.png"}).status_code == 502
+
+def test_oversized_images_rejected_before_decoding(client):
+    """작게 압축된 초대형 이미지는 디코딩하지 않고 502 응답"""
+    for path in ["/huge.png", "/large.png"]:
+        response = client.get("/images/thumbnail", params={"url": f"{IMAGE_HOST}{path}"})
+        assert response.status_code == 502, path
+        assert "해상도" in response.json()["detail"]
+
+def test_internal_addresses_blocked(client, image_server):
+    """내부 주소는 직접 요청하거나 리다이렉트로 우회해도 가져오지 않음"""
+    _, hits = image_server
+    
+    for url in [
+        "http://127.0.0.1/a.png",
+        "http://[::1]/a.png",
+        "http://[::ffff:127.0.0.1]/a.png",
+        "http://169.254.169.254/latest/meta-data",
+        "http://intranet.test/a.png",
+        f"{IMAGE_HOST}/to-internal.png",
+        f"{IMAGE_HOST}/to-metadata.png",
+    ]:
+        assert client.get("/images/thumbnail", params={"url": url}).status_code == 400, url
+    
+    assert hits == ["/to-internal.png", "/to-metadata.png"]
+
+def test_redirect_to_allowed_host_followed(client, image_server):
+    """허용된 호스트로의 리다이렉트는 따라감"""
+    _, hits = image_server
+    
+    response = client.get("/images/thumbnail", params={"url": f"{IMAGE_HOST}/moved.png"})
+    
+    assert response.status_code == 200
+    assert hits == ["/moved.png", "/a.png"]
+
+@pytest.mark.asyncio
+async def test_rebound_connection_blocked(tmp_path):
+    """사전 확인 후 DNS 응답이 내부 주소로 바뀌어도 연결된 서버 주소로 차단"""
+    class Stream:
+        def __init__(self, address):
+            self.address = address
+        
+        def get_extra_info(self, info):
+            return (self.address, 80) if info == "server_addr" else None
+    
+    peers = {"/a.png": "127.0.0.1", "/b.png": "93.184.216.34"}
+    
+    def handler(request):
+        return httpx.Response(
+            200, content=_png_bytes(), extensions={"network_stream": Stream(peers[request.url.path])}
+        )
+    
+    proxy = ImageProxy(cache_dir=str(tmp_path), transport=httpx.MockTransport(handler), resolver=fake_resolver)
+    
+    with pytest.raises(BlockedImageURLError):
+        await proxy.get_thumbnail(f"{IMAGE_HOST}/a.png", 64)
+    assert (await proxy.get_thumbnail(f"{IMAGE_HOST}/b.png", 64))[1]
+    await proxy.close()
+
+@pytest.mark.asyncio
+async def test_allowed_hosts(tmp_path, image_server):
+    """허용 목록이 있으면 해당 도메인과 하위 도메인만 요청"""
+    transport, _ = image_server
+    proxy = ImageProxy(
+        cache_dir=str(tmp_path), transport=transport, resolver=fake_resolver, allowed_hosts=["shop.test"]
+    )
+    
+    await proxy.check_url(f"{IMAGE_HOST}/a.png")
+    with pytest.raises(BlockedImageURLError):
+        await proxy.check_url("http://evilshop.test/a.png")
+
+@pytest.mark.asyncio
+async def test_concurrent_first_requests_single_flight(proxy, image_server):
+    """동시 첫 요청은 원본을 한 번만 가져옴"""
+    _, hits = image_server
+    
+    results = await asyncio.gather(
+        *(proxy.get_thumbnail(f"{IMAGE_HOST}/b.png", 64) for _ in range(10))
+    )
+    await proxy.close()
+    
+    assert hits == ["/b.png"]
+    assert len({digest for digest, _ in results}) == 1
+
+@pytest.mark.asyncio
+async def test_cancelled_leader_does_not_block_waiters(tmp_path):
+    """먼저 요청한 쪽이 취소되어도 같은 이미지를 기다리던 요청은 결과를 받음"""
+    hits = []
+    
+    async def slow_handler(request):
+        hits.append(request.url.path)
+        await asyncio.sleep(0.1)
+        return httpx.Response(200, content=_png_bytes(), headers={"Content-Type": "image/png"})
+    
+    proxy = ImageProxy(
+        cache_dir=str(tmp_path), transport=httpx.MockTransport(slow_handler), resolver=fake_resolver
+    )
+    leader = asyncio.create_task(proxy.get_thumbnail(f"{IMAGE_HOST}/a.png", 64))
+    await asyncio.sleep(0.02)
+    waiter = asyncio.create_task(proxy.get_thumbnail(f"{IMAGE_HOST}/a.png", 64))
+    await asyncio.sleep(0.02)
+    
+    leader.cancel()
+    digest, _ = await asyncio.wait_for(waiter, timeout=2)
+    await proxy.close()
+    
+    assert leader.cancelled()
+    assert hits == ["/a.png"]
+    assert proxy.cache.get(f"64:{IMAGE_HOST}/a.png")[0] == digest
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    """용량 초과 시 오래 사용하지 않은 썸네일부터 삭제"""
+    import os
+    cache = ThumbnailCache(str(tmp_path), max_bytes=250)
+    
+    cache.put("old", b"a" * 100)
+    os.utime(cache._object_path(cache.get("old")[0]), (0, 0))
+    cache.put("recent", b"b" * 100)
+    cache.put("new", b"c" * 100)
+    
+    assert cache.get("old") is None
+    assert cache.get("recent") is not None
+    assert cache.get("new") is not None
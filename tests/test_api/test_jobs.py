@@ -0,0 +1,170 @@
+import asyncio
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.agent.core import PriceFinderAgent
+from src.api.jobs import JobManager, JobQueueFull, JobStatus, get_job_manager
+from src.api.main import app
+
+class FakeStore:
+    """쇼핑몰 검색 스텁"""
+    
+    def __init__(self, name, offers, delay=0.0):
+        self.name = name
+        self.offers = offers
+        self.delay = delay
+    
+    async def search(self, query):
+        await asyncio.sleep(self.delay)
+        return [dict(offer, store=self.name) for offer in self.offers]
+
+def _stores(delay=0.0):
+    return [
+        FakeStore("coupang", [
+            {"id": "c1", "name": "아이폰 15 128GB", "price": 1200000},
+            {"id": "c2", "name": "아이폰15 128기가", "price": 1150000},
+        ], delay),
+        FakeStore("11st", [{"id": "e1", "name": "iPhone 15 128GB", "price": 1180000}], delay),
+    ]
+
+async def _wait_finished(manager, job_id, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = manager.get(job_id)
+        if job.status not in (JobStatus.PENDING, JobStatus.RUNNING):
+            return job
+        await asyncio.sleep(0.01)
+    pytest.fail("작업이 제시간에 끝나지 않음")
+
+@pytest.mark.asyncio
+async def test_job_completes_with_ranked_results():
+    """작업 완료 시 중복 제거/랭킹된 결과 반환"""
+    manager = JobManager(PriceFinderAgent(stores=_stores()), executor_factory=lambda: ThreadPoolExecutor(1))
+    
+    job = manager.submit("아이폰 15 최저가", "session_1")
+    job = await _wait_finished(manager, job.job_id)
+    await manager.shutdown()
+    
+    assert job.status is JobStatus.COMPLETED
+    assert job.progress == 1.0
+    prices = [p["price"] for p in job.result["products"]]
+    assert prices == [1150000, 1180000]
+
+@pytest.mark.asyncio
+async def test_job_reports_partial_results():
+    """쇼핑몰 응답이 도착하는 대로 중간 결과 제공"""
+    stores = _stores()
+    stores.append(FakeStore("slow", [], delay=0.5))
+    manager = JobManager(PriceFinderAgent(stores=stores), executor_factory=lambda: ThreadPoolExecutor(1))
+    
+    job = manager.submit("아이폰 15", "session_1")
+    await asyncio.sleep(0.1)
+    
+    assert job.status is JobStatus.RUNNING
+    assert job.stage == "stores"
+    assert 0 < job.progress < 1
+    assert len(job.partial_products) == 3
+    await manager.shutdown()
+
+@pytest.mark.asyncio
+async def test_job_cancel_and_queue_limit():
+    """작업 취소와 대기열 한도"""
+    manager = JobManager(
+        PriceFinderAgent(stores=_stores(delay=1.0)),
+        max_pending=1,
+        executor_factory=lambda: ThreadPoolExecutor(1),
+    )
+    
+    job = manager.submit("아이폰 15", "session_1")
+    with pytest.raises(JobQueueFull):
+        manager.submit("갤럭시 s24", "session_1")
+    
+    assert manager.cancel(job.job_id)
+    await asyncio.sleep(0)
+    assert job.status is JobStatus.CANCELLED
+    assert not manager.cancel(job.job_id)
+    manager.submit("갤럭시 s24", "session_1")
+    await manager.shutdown()
+
+@pytest.mark.asyncio
+async def test_cancel_one_of_coalesced_jobs():
+    """같은 검색을 기다리는 작업 중 하나를 취소해도 다른 작업은 완료"""
+    agent = PriceFinderAgent(stores=_stores(delay=0.1))
+    manager = JobManager(agent, executor_factory=lambda: ThreadPoolExecutor(1))
+    
+    first = manager.submit("아이폰 15", "session_1")
+    second = manager.submit("iPhone 15", "session_2")
+    await asyncio.sleep(0.05)
+    assert len(agent._inflight) == 1
+    
+    manager.cancel(first.job_id)
+    second = await _wait_finished(manager, second.job_id)
+    await manager.shutdown()
+    
+    assert manager.get(first.job_id).status is JobStatus.CANCELLED
+    assert second.status is JobStatus.COMPLETED
+    assert len(second.result["products"]) == 2
+
+@pytest.mark.asyncio
+async def test_search_stops_when_all_waiters_cancelled():
+    """기다리는 요청이 모두 취소되면 공유 검색도 중단"""
+    agent = PriceFinderAgent(stores=_stores(delay=1.0))
+    
+    requests = [asyncio.create_task(agent.search_products(q)) for q in ("아이폰 15", "iPhone 15")]
+    await asyncio.sleep(0.05)
+    shared_task = next(iter(agent._inflight.values())).task
+    for request in requests:
+        request.cancel()
+    await asyncio.gather(*requests, return_exceptions=True)
+    await asyncio.sleep(0)
+    
+    assert shared_task.cancelled()
+    assert agent._inflight == {}
+
+@pytest.mark.asyncio
+async def test_finished_jobs_expire():
+    """결과 보관 시간이 지나면 작업 삭제"""
+    now = [1000.0]
+    manager = JobManager(
+        PriceFinderAgent(),
+        result_ttl=60,
+        executor_factory=lambda: ThreadPoolExecutor(1),
+        clock=lambda: now[0],
+    )
+    
+    job = manager.submit("노트북", "session_1")
+    job = await _wait_finished(manager, job.job_id)
+    now[0] += 61
+    
+    assert manager.get(job.job_id) is None
+    await manager.shutdown()
+
+def test_job_routes_with_process_pool():
+    """API를 통한 작업 등록/폴링 (CPU 단계는 프로세스 풀에서 실행)"""
+    manager = JobManager(
+        PriceFinderAgent(stores=_stores()),
+        executor_factory=lambda: ProcessPoolExecutor(max_workers=1),
+    )
+    app.dependency_overrides[get_job_manager] = lambda: manager
+    try:
+        with TestClient(app) as client:
+            response = client.post("/search/jobs", json={"query": "아이폰 15", "session_id": "s1"})
+            assert response.status_code == 202
+            job_id = response.json()["job_id"]
+            
+            deadline = time.monotonic() + 10
+            while time.monotonic() < deadline:
+                job = client.get(f"/search/jobs/{job_id}").json()
+                if job["status"] == "completed":
+                    break
+                time.sleep(0.05)
+            
+            assert job["status"] == "completed"
+            assert len(job["result"]["products"]) == 2
+            assert client.delete(f"/search/jobs/{job_id}").status_code == 404
+            assert client.get("/search/jobs/unknown").status_code == 404
+    finally:
+        app.dependency_overrides.clear()
@@ -1,5 +1,11 @@
+import asyncio
+import subprocess
+import sys
+import time
+
 import pytest
 from fastapi.testclient import TestClient
+from src.api import main
 from src.api.main import app
 
 client = TestClient(app)
@@ -12,6 +18,152 @@ def test_root():
 
 def test_health_check():
     """헬스체크 엔드포인트 테스트"""
+    with TestClient(app) as started_client:
+        # 예열은 서버 기동 후 백그라운드에서 진행
+        deadline = time.monotonic() + 5
+        response = started_client.get("/health")
+        while response.status_code == 503 and time.monotonic() < deadline:
+            time.sleep(0.01)
+            response = started_client.get("/health")
+    assert response.status_code == 200
+    assert response.json()["status"] == "healthy"
+    assert set(response.json()["checks"]) == {"warmup", "llm", "event_loop", "search_jobs", "image_cache", "stores"}
+
+def test_health_check_not_ready_before_warmup():
+    """예열 전에는 503 응답"""
+    app.state.warm = False
     response = client.get("/health")
+    assert response.status_code == 503
+    assert response.json()["checks"]["warmup"] == {"ok": False}
+
+@pytest.mark.asyncio
+async def test_warmup_retries_and_llm_failure_is_degraded(monkeypatch):
+    """예열 실패는 재시도하고, LLM 예열 실패는 준비 상태를 막지 않음"""
+    attempts = []
+    
+    def flaky_warmup():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise OSError("cache dir not ready")
+    
+    def broken_llm():
+        raise ImportError("No module named 'langgraph'")
+    
+    monkeypatch.setattr(main, "WARMUP_RETRY_DELAYS", (0.0,))
+    monkeypatch.setattr(main, "_warmup_blocking", flaky_warmup)
+    monkeypatch.setattr(main.agent, "warmup_llm", broken_llm)
+    monkeypatch.setattr(app.state, "warm", False)
+    monkeypatch.setattr(app.state, "llm_error", None)
+    
+    await main.warmup(app)
+    
+    assert len(attempts) == 3
+    assert app.state.warm is True
+    assert app.state.warmup_error is None
+    checks = main.readiness_checks()
+    assert checks["warmup"] == {"ok": True}
+    assert checks["llm"]["ok"] and checks["llm"]["degraded"]
+    assert "langgraph" in checks["llm"]["error"]
+
+def test_health_check_probes_stores(monkeypatch):
+    """쇼핑몰 일부가 실패하면 degraded, 모두 실패하면 503"""
+    class Store:
+        def __init__(self, name, fail):
+            self.name = name
+            self.fail = fail
+        
+        async def ping(self):
+            if self.fail:
+                raise ConnectionError("connection refused")
+    
+    stores = [Store("coupang", False), Store("11st", True)]
+    monkeypatch.setattr(main.agent, "stores", stores)
+    monkeypatch.setattr(main.agent, "store_status", {})
+    monkeypatch.setattr(app.state, "warm", True)
+    
+    # 확인 전에는 실패로 간주
+    assert client.get("/health").json()["checks"]["stores"]["ok"] is False
+    
+    asyncio.run(main.agent.probe_stores())
+    response = client.get("/health")
+    assert response.status_code == 200
+    assert response.json()["status"] == "degraded"
+    stores_check = response.json()["checks"]["stores"]
+    assert stores_check["stores"]["coupang"] == {"ok": True}
+    assert "connection refused" in stores_check["stores"]["11st"]["error"]
+    
+    stores[0].fail = True
+    asyncio.run(main.agent.probe_stores())
+    assert client.get("/health").status_code == 503
+
+def test_metrics():
+    """메트릭 엔드포인트 테스트"""
+    client.get("/search", params={"query": "노트북"})
+    client.get("/search", params={"query": "노트북"})
+    
+    response = client.get("/metrics")
+    body = response.text
+    
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert 'pricefinder_http_request_duration_seconds_count{method="GET",route="/search",status="200"}' in body
+    assert 'pricefinder_agent_stage_duration_seconds_count{stage="normalize",store=""}' in body
+    assert 'pricefinder_cache_hit_ratio{cache="search"}' in body
+    assert "pricefinder_http_requests_in_flight 1" in body
+
+def test_watch_lifecycle():
+    """찜 등록/조회/해제 테스트"""
+    response = client.post("/watch", json={
+        "session_id": "session_123",
+        "store": "coupang",
+        "product_id": "p1",
+        "name": "아이폰 15",
+        "price": 1350000,
+        "target_price": 1200000
+    })
     assert response.status_code == 200
-    assert response.json() == {"status": "healthy"} 
\ No newline at end of file
+    item_id = response.json()["item_id"]
+    
+    items = client.get("/watch/session_123").json()["items"]
+    assert [item["item_id"] for item in items] == [item_id]
+    assert client.get("/watch/session_123/alerts").json() == {"alerts": []}
+    
+    assert client.delete(f"/watch/session_123/{item_id}").status_code == 200
+    assert client.delete(f"/watch/session_123/{item_id}").status_code == 404
+
+def test_search_etag_revalidation():
+    """검색 결과 ETag 재검증 테스트"""
+    response = client.get("/search", params={"query": "아이폰 15 최저가"})
+    assert response.status_code == 200
+    assert response.json()["query"] == "iphone 15"
+    etag = response.headers["etag"]
+    
+    not_modified = client.get(
+        "/search", params={"query": "아이폰 15 최저가"}, headers={"If-None-Match": etag}
+    )
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+    assert not_modified.headers["etag"] == etag
+
+def test_chat_history_etag_changes_with_messages():
+    """대화 기록이 바뀌면 ETag도 변경"""
+    first = client.get("/chat/history/etag_session")
+    assert first.json()["messages"] == []
+    
+    client.post("/chat", json={"message": "안녕하세요", "session_id": "etag_session"})
+    
+    second = client.get(
+        "/chat/history/etag_session", headers={"If-None-Match": first.headers["etag"]}
+    )
+    assert second.status_code == 200
+    assert second.headers["etag"] != first.headers["etag"]
+    assert second.json()["messages"][0] == {"role": "user", "content": "안녕하세요"}
+
+def test_api_import_defers_heavy_modules():
+    """API 모듈 임포트 시 이미지/HTTP 클라이언트/LLM 라이브러리는 로드하지 않음"""
+    code = (
+        "import sys, src.api.main; "
+        "print(','.join(m for m in ('httpx', 'PIL', 'langchain_google_genai', 'langgraph') if m in sys.modules))"
+    )
+    completed = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert completed.stdout.strip() == ""
@@ -0,0 +1,154 @@
+import json
+import time
+
+import pytest
+
+from benchmarks.__main__ import main as run_benchmarks
+from benchmarks.imports import parse_importtime, slowest_packages
+from benchmarks.load import LoadConfig, build_plan, run_load
+from benchmarks.replay import ReplayConfig, build_request, ks_statistic, load_log, run_replay
+from benchmarks.stats import compare, percentile
+from src.api import main
+
+def test_percentile_nearest_rank():
+    """nearest-rank 백분위수"""
+    samples = list(range(1, 101))
+    
+    assert percentile(samples, 50) == 50
+    assert percentile(samples, 99) == 99
+    assert percentile([], 50) == 0.0
+
+def test_compare_flags_regressions_past_tolerance():
+    """지연 시간 증가와 처리량 감소가 허용 범위를 넘으면 회귀로 보고"""
+    baseline = {
+        "search": {"p50_ms": 10.0, "p95_ms": 20.0, "p99_ms": 30.0, "throughput_rps": 100.0},
+        "removed": {"p50_ms": 1.0},
+    }
+    results = {
+        "search": {"p50_ms": 12.0, "p95_ms": 30.0, "p99_ms": 90.0, "throughput_rps": 60.0},
+        "new": {"p50_ms": 100.0},
+    }
+    
+    regressions = compare(results, baseline, tolerance=0.3)
+    
+    assert [line.split(":")[0] for line in regressions] == ["search.p95_ms", "search.throughput_rps"]
+
+def test_load_plan_is_deterministic():
+    """같은 시드는 같은 요청 순서를 생성"""
+    config = LoadConfig(requests=50, seed=7)
+    
+    assert build_plan(config) == build_plan(config)
+    assert {kind for kind, _, _ in build_plan(config)} == {"search", "chat", "history"}
+
+@pytest.mark.asyncio
+async def test_run_load_reports_latency_per_kind():
+    """부하 실행 결과는 종류별 요청 수와 지연 시간을 포함하고 가짜 백엔드는 복원됨"""
+    original_stores, original_llm = main.agent.stores, main.agent.llm
+    
+    results = await run_load(LoadConfig(concurrency=4, requests=40, store_latency=0.0, llm_latency=0.0))
+    
+    assert results["all"]["requests"] == 40
+    assert results["all"]["errors"] == 0
+    assert results["all"]["p50_ms"] <= results["all"]["p99_ms"]
+    assert main.agent.stores is original_stores
+    assert main.agent.llm is original_llm
+
+def test_cli_fails_on_regression(tmp_path, capsys):
+    """기준값보다 크게 느려지면 종료 코드 1"""
+    baseline = str(tmp_path / "micro.json")
+    args = ["micro", "--repeat", "5", "--only", "ttl_cache.get_hit", "--baseline", baseline]
+    
+    assert run_benchmarks(args + ["--update-baseline"]) == 0
+    assert run_benchmarks(args + ["--tolerance", "10"]) == 0
+    
+    with open(baseline, encoding="utf-8") as f:
+        data = json.load(f)
+    data["results"]["ttl_cache.get_hit"]["p50_us"] /= 100
+    with open(baseline, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+    
+    assert run_benchmarks(args) == 1
+    assert "ttl_cache.get_hit.p50_us" in capsys.readouterr().out
+
+def test_parse_importtime_keeps_only_entry_tree():
+    """인터프리터 시작 시 임포트는 제외하고 엔트리 모듈 하위 트리만 파싱"""
+    stderr = "\n".join([
+        "import time: self [us] | cumulative | imported package",
+        "import time:       100 |        100 | site",
+        "import time:        50 |         50 |     fastapi.params",
+        "import time:       200 |        250 |   fastapi",
+        "import time:        30 |        280 | src.api.main",
+    ])
+    
+    modules = parse_importtime(stderr, "src.api.main")
+    
+    assert modules[-1] == ("src.api.main", 30, 280)
+    assert slowest_packages(modules, top=1) == [("fastapi", 0.2)]
+
+def _write_log(path, start, records):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(json.dumps({"v": 1, "start": start}) + "\n")
+        for record in records:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+def test_load_log_merges_worker_files_by_arrival(tmp_path):
+    """워커별 로그는 절대 도착 시각 기준으로 병합"""
+    _write_log(tmp_path / "a.jsonl", 100.0, [{"t": 0.5, "m": "GET", "r": "/"}, {"t": 2.0, "m": "GET", "r": "/"}])
+    _write_log(tmp_path / "b.jsonl", 101.0, [{"t": 0.0, "m": "GET", "r": "/search", "q": "노트북"}])
+    
+    records = load_log([str(tmp_path / "a.jsonl"), str(tmp_path / "b.jsonl")])
+    
+    assert [(record["t"], record["r"]) for record in records] == [(0.0, "/"), (0.5, "/search"), (1.5, "/")]
+
+def test_build_request_from_record():
+    """기록을 요청으로 변환하고 재현할 수 없는 요청은 건너뜀"""
+    assert build_request({"m": "GET", "r": "/search", "q": "노트북"}) == ("GET", "/search", {"params": {"query": "노트북"}})
+    assert build_request({"m": "GET", "r": "/chat/history/{session_id}", "s": "ab"}) == (
+        "GET", "/chat/history/replay-ab", {}
+    )
+    assert build_request({"m": "POST", "r": "/chat", "q": "안녕", "s": "ab"})[2]["json"]["session_id"] == "replay-ab"
+    assert build_request({"m": "GET", "r": "/search/jobs/{job_id}"}) is None
+    assert build_request({"m": "POST", "r": "/watch"}) is None
+
+@pytest.mark.asyncio
+async def test_replay_preserves_compressed_arrival_times():
+    """재생은 도착 간격을 speed 배로 압축해 유지"""
+    records = [
+        {"t": 0.0, "m": "GET", "r": "/search", "q": "노트북"},
+        {"t": 0.5, "m": "POST", "r": "/chat", "q": "노트북 추천", "s": "ab"},
+        {"t": 1.0, "m": "GET", "r": "/chat/history/{session_id}", "s": "ab"},
+        {"t": 1.0, "m": "GET", "r": "/search/jobs/{job_id}"},
+    ]
+    config = ReplayConfig(speed=10.0, store_latency=0.0, llm_latency=0.0)
+    
+    start = time.perf_counter()
+    results, samples = await run_replay(records, config)
+    
+    assert time.perf_counter() - start >= 0.1
+    assert results["all"]["requests"] == 3
+    assert results["all"]["skipped"] == 1
+    assert results["all"]["errors"] == 0
+    assert set(samples) == {"GET /search", "POST /chat", "GET /chat/history/{session_id}", "all"}
+
+def test_ks_statistic():
+    """같은 분포는 0, 겹치지 않는 분포는 1"""
+    assert ks_statistic([1, 2, 3], [1, 2, 3]) == 0.0
+    assert ks_statistic([1, 2, 3], [10, 20, 30]) == 1.0
+    assert 0 < ks_statistic([1, 2, 3, 4], [3, 4, 5, 6]) < 1
+
+def test_compare_runs_reports_distribution_diff(tmp_path, capsys):
+    """재생 결과 비교는 백분위수 변화와 분포 거리를 출력하고 회귀 시 1 반환"""
+    base = {"config": {}, "results": {"all": {"p50_ms": 10.0, "p95_ms": 20.0, "p99_ms": 30.0}},
+            "samples": {"all": [10.0, 20.0, 30.0]}}
+    slow = {"config": {}, "results": {"all": {"p50_ms": 20.0, "p95_ms": 40.0, "p99_ms": 60.0}},
+            "samples": {"all": [20.0, 40.0, 60.0]}}
+    for name, run in (("base", base), ("slow", slow)):
+        with open(tmp_path / f"{name}.json", "w", encoding="utf-8") as f:
+            json.dump(run, f)
+    
+    assert run_benchmarks(["compare", str(tmp_path / "base.json"), str(tmp_path / "base.json")]) == 0
+    assert run_benchmarks(["compare", str(tmp_path / "base.json"), str(tmp_path / "slow.json")]) == 1
+    
+    output = capsys.readouterr().out
+    assert "10.0→20.0 (+100.0%)" in output
+    assert "all.p50_ms" in output
@@ -0,0 +1,44 @@
+import threading
+
+from src.telemetry.metrics import Registry
+
+def test_counter_merges_thread_shards():
+    """스레드별로 기록한 카운터는 스크레이프 시 합산"""
+    registry = Registry()
+    counter = registry.counter("test_total", "테스트", ("route",))
+    
+    def work():
+        for _ in range(1000):
+            counter.inc("/search")
+    
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    assert counter.values() == {("/search",): 4000}
+    assert 'test_total{route="/search"} 4000' in registry.render()
+
+def test_histogram_buckets_are_cumulative():
+    """히스토그램 버킷은 누적 개수로 출력"""
+    registry = Registry()
+    histogram = registry.histogram("test_seconds", "테스트", ("stage",), buckets=(0.1, 1.0))
+    
+    for value in (0.05, 0.5, 0.5, 3.0):
+        histogram.observe(value, "rank")
+    body = registry.render()
+    
+    assert 'test_seconds_bucket{stage="rank",le="0.1"} 1' in body
+    assert 'test_seconds_bucket{stage="rank",le="1"} 3' in body
+    assert 'test_seconds_bucket{stage="rank",le="+Inf"} 4' in body
+    assert 'test_seconds_count{stage="rank"} 4' in body
+    assert 'test_seconds_sum{stage="rank"} 4.05' in body
+    assert histogram.count("rank") == 4
+
+def test_gauge_callback():
+    """콜백 게이지는 스크레이프 시 계산"""
+    registry = Registry()
+    registry.gauge("test_ratio", "테스트", ("cache",), fn=lambda: {("search",): 0.5})
+    
+    assert 'test_ratio{cache="search"} 0.5' in registry.render()
@@ -0,0 +1,86 @@
+import asyncio
+import time
+
+from fastapi.testclient import TestClient
+
+from src.api import main
+from src.api.debug import is_authorized
+from src.telemetry.profiling import ProfileStore, ProfilingMiddleware, Sampler, new_profile_id, profile_store
+
+def _spin(seconds):
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+class SlowStore:
+    name = "coupang"
+    
+    async def search(self, query):
+        _spin(0.05)
+        await asyncio.sleep(0.01)
+        return [{"id": "1", "name": "맥북 에어", "price": 1200000, "store": self.name}]
+
+def _client(monkeypatch, tmp_path, sample_rate=0.0, headers=None):
+    monkeypatch.setattr(profile_store, "directory", str(tmp_path))
+    monkeypatch.setattr(main.agent, "stores", [SlowStore()])
+    main.agent.search_cache.clear()
+    profiled_app = ProfilingMiddleware(
+        main.app, authorize=is_authorized, sample_rate=sample_rate, sampler=Sampler(interval=0.001)
+    )
+    return TestClient(profiled_app, headers=headers)
+
+def test_profile_header_records_request_and_child_tasks(monkeypatch, tmp_path):
+    """X-Profile 요청은 자식 태스크(쇼핑몰 조회)까지 포함한 프로파일을 남김"""
+    monkeypatch.setenv("DEBUG_TOKEN", "secret")
+    client = _client(monkeypatch, tmp_path, headers={"X-Debug-Token": "secret"})
+    
+    response = client.get("/search", params={"query": "맥북 에어"}, headers={"X-Profile": "1"})
+    assert response.status_code == 200
+    profile_id = response.headers["x-profile-id"]
+    
+    profiles = client.get("/debug/profiles").json()["profiles"]
+    assert profiles[0]["profile_id"] == profile_id
+    assert profiles[0]["route"] == "/search"
+    assert profiles[0]["task_count"] >= 2
+    assert profiles[0]["loop_samples"]["running"] > 0
+    
+    collapsed = client.get(f"/debug/profiles/{profile_id}").text
+    assert any(
+        line.startswith("SlowStore.search;") and "test_profiling:_spin" in line for line in collapsed.splitlines()
+    )
+    assert client.get("/debug/profiles/0000000000000-00000000").status_code == 404
+
+def test_unprofiled_requests_leave_no_profile(monkeypatch, tmp_path):
+    """헤더가 없거나 디버그 토큰이 틀리면 프로파일링하지 않음"""
+    monkeypatch.setenv("DEBUG_TOKEN", "secret")
+    client = _client(monkeypatch, tmp_path)
+    
+    plain = client.get("/search", params={"query": "맥북"})
+    wrong_token = client.get(
+        "/search", params={"query": "맥북"}, headers={"X-Profile": "1", "X-Debug-Token": "nope"}
+    )
+    
+    assert "x-profile-id" not in plain.headers
+    assert "x-profile-id" not in wrong_token.headers
+    assert profile_store.list() == []
+
+def test_sampled_traffic_is_profiled(monkeypatch, tmp_path):
+    """샘플링 비율 1이면 모든 요청을 프로파일링"""
+    client = _client(monkeypatch, tmp_path, sample_rate=1.0)
+    
+    response = client.get("/")
+    
+    assert profile_store.metadata(response.headers["x-profile-id"])["status"] == 200
+
+def test_profile_store_keeps_latest_profiles(tmp_path):
+    """프로파일 링은 최근 max_profiles개만 보관"""
+    store = ProfileStore(str(tmp_path), max_profiles=2)
+    ids = []
+    for _ in range(3):
+        ids.append(new_profile_id())
+        store.save({"profile_id": ids[-1]}, "request;main:handler 1\n")
+        time.sleep(0.002)
+    
+    assert [profile["profile_id"] for profile in store.list()] == [ids[2], ids[1]]
+    assert store.collapsed(ids[0]) is None
+    assert store.collapsed("../etc/passwd") is None
@@ -0,0 +1,57 @@
+import json
+
+from fastapi.testclient import TestClient
+
+from src.api.main import app
+from src.telemetry.recording import TrafficRecorder, anonymize_query
+
+def _read(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+def test_recorder_writes_anonymized_request_shapes(tmp_path):
+    """라우트 템플릿, 정규화 쿼리, 세션 해시와 순번, 처리 시간을 기록"""
+    path = tmp_path / "traffic-{pid}.jsonl"
+    recorder = TrafficRecorder(app, path=str(path), salt="test-salt")
+    client = TestClient(recorder)
+    
+    client.get("/search", params={"query": "아이폰15 최저가"})
+    client.post("/chat", json={"message": "에어팟 프로 추천", "session_id": "user-secret-1"})
+    client.get("/chat/history/user-secret-1")
+    
+    header, search, chat, history = _read(recorder.path)
+    assert header["v"] == 1
+    assert search["r"] == "/search"
+    assert search["q"] == anonymize_query("아이폰15 최저가")
+    assert chat["r"] == "/chat"
+    assert chat["m"] == "POST"
+    assert history["r"] == "/chat/history/{session_id}"
+    assert chat["s"] == history["s"] == recorder.hash_session("user-secret-1")
+    assert (chat["n"], history["n"]) == (1, 2)
+    assert search["t"] <= chat["t"] <= history["t"]
+    assert all(record["c"] == 200 for record in (search, chat, history))
+    assert "user-secret-1" not in open(recorder.path, encoding="utf-8").read()
+
+def test_recorder_passes_request_body_through(tmp_path):
+    """본문을 읽은 뒤에도 앱은 같은 본문을 받음"""
+    recorder = TrafficRecorder(app, path=str(tmp_path / "traffic.jsonl"))
+    
+    response = TestClient(recorder).post("/chat", json={"message": "테스트 메시지", "session_id": "s1"})
+    
+    assert "테스트 메시지" in response.json()["response"]
+
+def test_anonymize_query_masks_personal_data():
+    """긴 숫자열과 이메일은 마스킹"""
+    text = anonymize_query("01012345678 연락 foo@example.com 아이폰")
+    
+    assert "01012345678" not in text
+    assert "foo@example.com" not in text
+    assert "iphone" in text
+
+def test_anonymize_query_masks_grouped_phone_numbers():
+    """하이픈이나 공백으로 나뉜 전화번호도 마스킹하고 모델명 숫자는 유지"""
+    for query in ["010-1234-5678 연락", "010 1234 5678로 연락", "+82 10 1234 5678"]:
+        text = anonymize_query(query)
+        assert "1234" not in text and "5678" not in text, text
+    
+    assert anonymize_query("맥북 프로 14 2023") == "macbook pro 14 2023"
@@ -0,0 +1,134 @@
+import asyncio
+import json
+import time
+
+from fastapi.testclient import TestClient
+
+from src.agent.core import PriceFinderAgent
+from src.api.jobs import JobManager, get_job_manager
+from src.api.main import app
+from src.telemetry.tracing import JsonLinesExporter, RingBufferExporter, Tracer, ring_buffer, use_span
+
+def test_sampling_is_deterministic_per_trace_id():
+    """같은 트레이스 ID는 항상 같은 샘플링 결과"""
+    tracer = Tracer(sample_rate=0.5)
+    
+    assert tracer.should_sample("00000000aaaaaaaa") is True
+    assert tracer.should_sample("ffffffffaaaaaaaa") is False
+    assert tracer.should_sample("ffffffffaaaaaaaa", forced=True) is True
+    assert Tracer(sample_rate=0.0).should_sample("00000000aaaaaaaa") is False
+
+def test_unsampled_spans_are_noop():
+    """추적 중이 아니면 스팬은 기록되지 않음"""
+    exporter = RingBufferExporter()
+    tracer = Tracer(sample_rate=0.0, exporters=[exporter])
+    
+    assert tracer.start_trace("00000000aaaaaaaa", "root") is None
+    with tracer.span("child") as span:
+        assert span is None
+    assert exporter.traces() == []
+
+def test_trace_exported_after_background_span_ends(tmp_path):
+    """요청 후에도 열려 있는 백그라운드 스팬이 끝나야 트레이스를 내보냄"""
+    exporter = RingBufferExporter()
+    path = tmp_path / "traces.jsonl"
+    tracer = Tracer(sample_rate=1.0, exporters=[exporter, JsonLinesExporter(str(path))])
+    
+    root = tracer.start_trace("00000000aaaaaaaa", "GET /search")
+    use_span(root)
+    with tracer.span("handler"):
+        background = tracer.start_span("search_job")
+    use_span(None)
+    root.end()
+    assert exporter.traces() == []
+    
+    background.end()
+    
+    trace = exporter.get("00000000aaaaaaaa")
+    assert [span["name"] for span in trace["spans"]] == ["GET /search", "handler", "search_job"]
+    assert trace["spans"][2]["parent_id"] == trace["spans"][1]["span_id"]
+    assert json.loads(path.read_text())["trace_id"] == "00000000aaaaaaaa"
+
+DEBUG_HEADERS = {"X-Debug-Token": "secret"}
+
+def test_request_trace_covers_middleware_handler_and_agent_stages(monkeypatch):
+    """샘플링된 요청은 미들웨어, 핸들러, Agent 단계 스팬을 기록"""
+    monkeypatch.setenv("DEBUG_TOKEN", "secret")
+    trace_id = "1234567890abcdef1234567890abcdef"
+    client = TestClient(app, headers=DEBUG_HEADERS)
+    
+    response = client.get(
+        "/search", params={"query": "노트북"},
+        headers={"X-Trace-Id": trace_id, "X-Trace-Sampled": "1"}
+    )
+    assert response.headers["x-trace-id"] == trace_id
+    
+    trace = client.get(f"/debug/traces/{trace_id}").json()
+    names = [span["name"] for span in trace["spans"]]
+    assert names[0] == "GET /search"
+    assert "handler /search" in names
+    assert {"agent.normalize", "agent.cache"} <= set(names)
+    assert trace["spans"][0]["attributes"]["status"] == 200
+    
+    summaries = client.get("/debug/traces").json()["traces"]
+    assert trace_id in [summary["trace_id"] for summary in summaries]
+
+def test_unsampled_request_still_returns_trace_id(monkeypatch):
+    """샘플링되지 않은 요청도 응답에 추적 ID를 포함"""
+    monkeypatch.setenv("DEBUG_TOKEN", "secret")
+    client = TestClient(app, headers=DEBUG_HEADERS)
+    response = client.get("/")
+    
+    assert len(response.headers["x-trace-id"]) == 32
+    assert client.get(f"/debug/traces/{response.headers['x-trace-id']}").status_code == 404
+
+def test_forced_sampling_and_debug_routes_require_token(monkeypatch):
+    """디버그 토큰 없이는 강제 샘플링과 디버그 라우트를 쓸 수 없음"""
+    trace_id = "feedfacefeedfacefeedfacefeedface"
+    headers = {"X-Trace-Id": trace_id, "X-Trace-Sampled": "1"}
+    client = TestClient(app)
+    
+    monkeypatch.delenv("DEBUG_TOKEN", raising=False)
+    client.get("/", headers=headers)
+    assert client.get("/debug/traces").status_code == 403
+    assert client.get("/debug/profiles", headers=DEBUG_HEADERS).status_code == 403
+    
+    monkeypatch.setenv("DEBUG_TOKEN", "secret")
+    client.get("/", headers={**headers, "X-Debug-Token": "nope"})
+    assert client.get("/debug/traces", headers={"X-Debug-Token": "nope"}).status_code == 403
+    assert ring_buffer.get(trace_id) is None
+
+def test_search_job_trace_includes_store_calls(monkeypatch):
+    """검색 작업 트레이스는 작업이 끝날 때까지의 쇼핑몰 호출을 포함"""
+    monkeypatch.setenv("DEBUG_TOKEN", "secret")
+    from concurrent.futures import ThreadPoolExecutor
+    
+    class Store:
+        name = "coupang"
+        
+        async def search(self, query):
+            await asyncio.sleep(0.05)
+            return [{"id": "1", "name": "갤럭시 탭", "price": 500000, "store": self.name}]
+    
+    manager = JobManager(PriceFinderAgent(stores=[Store()]), executor_factory=lambda: ThreadPoolExecutor(1))
+    app.dependency_overrides[get_job_manager] = lambda: manager
+    trace_id = "abcdefabcdefabcdefabcdefabcdef12"
+    try:
+        with TestClient(app) as client:
+            response = client.post(
+                "/search/jobs", json={"query": "갤럭시 탭"},
+                headers={"X-Trace-Id": trace_id, "X-Trace-Sampled": "1", **DEBUG_HEADERS}
+            )
+            job_id = response.json()["job_id"]
+            deadline = time.monotonic() + 5
+            while client.get(f"/search/jobs/{job_id}").json()["status"] != "completed":
+                assert time.monotonic() < deadline
+                time.sleep(0.02)
+    finally:
+        app.dependency_overrides.clear()
+    
+    trace = ring_buffer.get(trace_id)
+    spans = {span["name"]: span for span in trace["spans"]}
+    assert spans["agent.store"]["attributes"] == {"store": "coupang"}
+    assert spans["search_job"]["attributes"]["status"] == "completed"
+    assert {"agent.dedup", "agent.rank"} <= set(spans)
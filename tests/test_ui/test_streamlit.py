@@ -211,6 +211,59 @@ async def test_api_client_error_handling():
         assert "error" in result
         assert "HTTP 오류" in result["error"]
 
+# 조건부 요청 캐시 테스트
+@pytest.mark.asyncio
+async def test_api_client_conditional_get():
+    """ETag가 있는 응답은 재검증 후 304면 캐시된 데이터 반환"""
+    from frontend.utils import api_client
+    from frontend.utils.api_client import APIClient
+    
+    api_client._response_cache.clear()
+    
+    ok_response = MagicMock()
+    ok_response.status_code = 200
+    ok_response.headers = {"ETag": '"abc"'}
+    ok_response.json.return_value = {"products": [], "query": "iphone 15"}
+    
+    not_modified = MagicMock()
+    not_modified.status_code = 304
+    
+    with patch("httpx.AsyncClient") as mock_client:
+        mock_get = mock_client.return_value.__aenter__.return_value.get
+        mock_get.side_effect = [ok_response, not_modified]
+        
+        client = APIClient()
+        first = await client.search_products("아이폰 15")
+        second = await client.search_products("아이폰 15")
+        
+        assert first == second == {"products": [], "query": "iphone 15"}
+        assert mock_get.call_args_list[0].kwargs["headers"] == {}
+        assert mock_get.call_args_list[1].kwargs["headers"] == {"If-None-Match": '"abc"'}
+        not_modified.json.assert_not_called()
+    
+    api_client._response_cache.clear()
+
+# 검색 작업 폴링 테스트
+@pytest.mark.asyncio
+async def test_api_client_run_search_job():
+    """검색 작업 등록 후 완료될 때까지 폴링하며 진행 상황 전달"""
+    from frontend.utils.api_client import APIClient
+    
+    client = APIClient()
+    client.config.SEARCH_JOB_POLL_INTERVAL = 0
+    
+    result = {"products": [{"id": "p1"}], "message": "1개 상품"}
+    states = [
+        {"status": "running", "progress": 0.4, "partial_products": [{"id": "p1"}]},
+        {"status": "completed", "progress": 1.0, "result": result},
+    ]
+    
+    with patch.object(client, "submit_search_job", return_value={"job_id": "job1"}), \
+         patch.object(client, "get_search_job", side_effect=states):
+        progress = []
+        assert await client.run_search_job("아이폰", "session123", progress.append) == result
+        assert [job["status"] for job in progress] == ["running", "completed"]
+
 # 동기 API 래퍼 함수 테스트
 @patch('frontend.utils.api_client.APIClient.health_check')
 @patch('asyncio.run')
@@ -259,6 +312,27 @@ def test_chat_interface_methods():
     assert hasattr(chat_interface, 'render')
     assert callable(chat_interface.render)
 
+# 일반 대화/상품 검색 라우팅 테스트
+@patch('frontend.components.chat_interface.sync_send_message')
+@patch('frontend.components.chat_interface.sync_run_search_job')
+@patch('frontend.components.chat_interface.st')
+def test_chat_interface_routes_search_and_chat(mock_st, mock_run_job, mock_send_message):
+    """상품 검색만 검색 작업으로, 일반 대화는 채팅 API로 전송"""
+    from frontend.components.chat_interface import ChatInterface
+    
+    mock_st.session_state.session_id = "session123"
+    mock_run_job.return_value = {"products": [], "message": "검색 결과가 없습니다."}
+    mock_send_message.return_value = {"response": "안녕하세요!"}
+    chat_interface = ChatInterface(MagicMock())
+    
+    chat_interface._handle_bot_response("안녕하세요")
+    assert not mock_run_job.called
+    assert mock_send_message.call_args.args[0] == "안녕하세요"
+    
+    chat_interface._handle_bot_response("아이폰 15 최저가")
+    assert mock_run_job.call_args.args[0] == "아이폰 15 최저가"
+    assert mock_send_message.call_count == 1
+
 # ChatPage 메서드 테스트
 def test_chat_page_methods():
     """ChatPage 메서드 테스트 (모킹 없이)"""